@@ -8,17 +8,50 @@ Este módulo contém as classes e funções principais para o sistema.
 __version__ = "1.0.0"
 __author__ = "FIAP Pós-Tech IA para Devs - Fase 2"
 
-from .genetic_algorithm import GeneticAlgorithm, Individual
-from .routing import RouteOptimizer, DeliveryPoint, Vehicle
+from .distances import (
+    haversine_distance_matrix, load_or_compute_distance_matrix, SparseDistanceMatrix
+)
+from .decomposition import SpatialDecomposition
+from .fitness_cache import FitnessCache
+from .genetic_algorithm import (
+    GeneticAlgorithm, Individual, PopulationMatrix, GenerationSnapshot
+)
+from .island_model import IslandModel
+from .local_search import LocalSearch, build_neighbor_lists
+from .nsga2 import NSGA2, ParetoSolution, pick_solution
+from .parallel import ParallelFitnessEvaluator
+from .profiling import PhaseProfiler
+from .routing import (
+    RouteOptimizer, DeliveryPoint, Vehicle, DeliveryPointArrays, load_arrays_from_csv
+)
+from .stopping import StoppingPolicy
 from .visualization import RouteVisualizer
 from .llm_integration import LLMReportGenerator
 
 __all__ = [
+    'haversine_distance_matrix',
+    'load_or_compute_distance_matrix',
+    'SparseDistanceMatrix',
+    'SpatialDecomposition',
+    'FitnessCache',
     'GeneticAlgorithm',
     'Individual',
+    'PopulationMatrix',
+    'GenerationSnapshot',
+    'IslandModel',
+    'LocalSearch',
+    'build_neighbor_lists',
+    'NSGA2',
+    'ParetoSolution',
+    'pick_solution',
+    'ParallelFitnessEvaluator',
+    'PhaseProfiler',
     'RouteOptimizer',
     'DeliveryPoint',
     'Vehicle',
+    'DeliveryPointArrays',
+    'load_arrays_from_csv',
+    'StoppingPolicy',
     'RouteVisualizer',
     'LLMReportGenerator'
 ]
@@ -0,0 +1,380 @@
+"""
+Benchmark do Algoritmo Genetico e do RouteOptimizer
+
+Este modulo implementa:
+- Gerador de instancias sinteticas reprodutiveis (50 a 10.000 pontos),
+  com pontos uniformes ou agrupados em torno do deposito e prioridades
+  mistas
+- Linha de base vizinho mais proximo + 2-opt, para comparar a qualidade
+  das rotas do AG
+- Medicao de geracoes/s, avaliacoes/s e pico de memoria (tracemalloc)
+  do AG vetorizado e da funcao de fitness em lote
+
+Uso:
+    python src/benchmark.py --sizes 50 500 2000 --layouts uniform clustered
+
+Os resultados sao gravados em CSV (uma linha por instancia), para comparar
+execucoes e detectar regressoes de desempenho.
+"""
+
+import argparse
+import csv
+import time
+import tracemalloc
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .genetic_algorithm import GeneticAlgorithm
+    from .local_search import LocalSearch
+    from .routing import RouteOptimizer, DeliveryPoint, Vehicle, Priority
+except ImportError:
+    from genetic_algorithm import GeneticAlgorithm
+    from local_search import LocalSearch
+    from routing import RouteOptimizer, DeliveryPoint, Vehicle, Priority
+
+# Deposito padrao: Hospital Central (Sao Paulo)
+DEFAULT_CENTER = (-23.5505, -46.6333)
+
+# Fracao de pontos em cada prioridade (CRITICAL, HIGH, MEDIUM, LOW)
+DEFAULT_PRIORITY_MIX = (0.1, 0.2, 0.4, 0.3)
+
+LAYOUTS = ('uniform', 'clustered')
+
+KM_PER_DEGREE = 111.32
+
+
+def generate_instance(
+    n_points: int,
+    layout: str = 'uniform',
+    seed: Optional[int] = None,
+    radius_km: float = 25.0,
+    n_clusters: int = 8,
+    cluster_spread_km: float = 2.0,
+    center: Tuple[float, float] = DEFAULT_CENTER,
+    priority_mix: Sequence[float] = DEFAULT_PRIORITY_MIX
+) -> Tuple[List[DeliveryPoint], List[Vehicle]]:
+    """
+    Gera uma instancia sintetica com o deposito no ponto 0
+
+    Args:
+        n_points: Numero de pontos de entrega (sem contar o deposito)
+        layout: 'uniform' (disco em torno do deposito) ou 'clustered'
+            (grupos gaussianos com centros uniformes no disco)
+        seed: Semente; a mesma semente gera sempre a mesma instancia
+        radius_km: Raio da regiao atendida
+        n_clusters: Numero de grupos no layout 'clustered'
+        cluster_spread_km: Desvio padrao de cada grupo
+        center: (lat, lon) do deposito
+        priority_mix: Probabilidade de cada prioridade, na ordem de Priority
+
+    Returns:
+        (delivery_points, vehicles), com um veiculo capaz de levar toda a
+        demanda (as rotas avaliadas sao de um unico veiculo)
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout deve ser um de {LAYOUTS}, recebido: {layout!r}")
+    rng = np.random.default_rng(seed)
+
+    def disc(count: int) -> np.ndarray:
+        radius = radius_km * np.sqrt(rng.random(count))
+        angle = rng.uniform(0, 2 * np.pi, count)
+        return np.column_stack((radius * np.cos(angle), radius * np.sin(angle)))
+
+    if layout == 'uniform':
+        offsets = disc(n_points)
+    else:
+        centers = disc(n_clusters)
+        offsets = centers[rng.integers(0, n_clusters, n_points)]
+        offsets = offsets + rng.normal(0, cluster_spread_km, (n_points, 2))
+
+    lat0, lon0 = center
+    lats = lat0 + offsets[:, 0] / KM_PER_DEGREE
+    lons = lon0 + offsets[:, 1] / (KM_PER_DEGREE * np.cos(np.radians(lat0)))
+
+    priorities = list(Priority)
+    mix = np.asarray(priority_mix, dtype=np.float64)
+    levels = rng.choice(len(priorities), n_points, p=mix / mix.sum())
+    demands = np.round(rng.uniform(1.0, 15.0, n_points), 1)
+
+    delivery_points = [DeliveryPoint(0, "Deposito", lat0, lon0, 0, Priority.CRITICAL, service_time=0)]
+    delivery_points.extend(
+        DeliveryPoint(i + 1, f"Ponto {i + 1}", float(lats[i]), float(lons[i]),
+                      float(demands[i]), priorities[levels[i]])
+        for i in range(n_points)
+    )
+    vehicles = [Vehicle(0, "Van 001", capacity=float(demands.sum()), max_distance=1e6)]
+
+    return delivery_points, vehicles
+
+
+def nearest_neighbor_route(distance_matrix, depot: int = 0) -> List[int]:
+    """
+    Rota gulosa: a partir do deposito, visita sempre o ponto mais proximo
+
+    Args:
+        distance_matrix: Matriz de distancias (densa, mmap ou esparsa)
+        depot: Indice do deposito
+
+    Returns:
+        Rota com o deposito no inicio e no fim
+    """
+    n = distance_matrix.shape[0]
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[depot] = False
+    route = [depot]
+    current = depot
+
+    for _ in range(n - 1):
+        candidates = np.flatnonzero(unvisited)
+        row = np.asarray(distance_matrix[np.full(len(candidates), current), candidates])
+        current = int(candidates[np.argmin(row)])
+        unvisited[current] = False
+        route.append(current)
+
+    route.append(depot)
+    return route
+
+
+def route_distance(route: List[int], distance_matrix) -> float:
+    """Distancia total de uma rota"""
+    route = np.asarray(route)
+    return float(np.sum(distance_matrix[route[:-1], route[1:]]))
+
+
+def two_opt(route: List[int], distance_matrix, neighbors: int = 10) -> Tuple[List[int], float]:
+    """
+    2-opt classico (somente distancia) com listas de vizinhos
+
+    Usa LocalSearch com um avaliador incremental que considera apenas a
+    distancia, sem prioridades nem restricoes.
+
+    Args:
+        route: Rota inicial (deposito no inicio e no fim)
+        distance_matrix: Matriz de distancias
+        neighbors: Vizinhos candidatos por ponto
+
+    Returns:
+        (rota, distancia) apos a busca local
+    """
+    d = distance_matrix
+
+    def distance_delta(route, move, start, end, distance, penalty):
+        a, first = route[start - 1], route[start]
+        last, b = route[end - 1], route[end]
+        new_distance = distance + d[a, last] + d[first, b] - d[a, first] - d[last, b]
+        return new_distance, new_distance, 0.0
+
+    search = LocalSearch(d, distance_delta, neighbors=neighbors, use_or_opt=False)
+    distance = route_distance(route, d)
+    route, _, distance, _ = search.improve(route, distance, distance, 0.0)
+    return route, float(distance)
+
+
+def baseline_solution(optimizer: RouteOptimizer, vehicle_id: int = 0) -> Dict[str, float]:
+    """
+    Linha de base vizinho mais proximo + 2-opt, avaliada pelo fitness completo
+
+    Returns:
+        Dicionario com fitness, distancia e tempo de execucao da linha de base
+    """
+    start = time.perf_counter()
+    route = nearest_neighbor_route(optimizer.distance_matrix, optimizer.depot_id)
+    route, _ = two_opt(route, optimizer.distance_matrix)
+    elapsed = time.perf_counter() - start
+
+    fitness, distance, _ = optimizer.fitness_function(route, vehicle_id)
+    return {
+        'baseline_fitness': float(fitness),
+        'baseline_distance': float(distance),
+        'baseline_time': elapsed
+    }
+
+
+def measure_batch_fitness(
+    optimizer: RouteOptimizer,
+    population_size: int = 100,
+    repeats: int = 5,
+    seed: Optional[int] = None
+) -> float:
+    """
+    Avaliacoes por segundo de RouteOptimizer.fitness_function_batch
+
+    Args:
+        optimizer: Otimizador da instancia
+        population_size: Rotas avaliadas por chamada
+        repeats: Numero de chamadas medidas
+        seed: Semente das rotas aleatorias
+
+    Returns:
+        Rotas avaliadas por segundo
+    """
+    ga = GeneticAlgorithm(population_size=population_size, random_seed=seed)
+    routes = ga.create_population_matrix(optimizer.num_points, optimizer.depot_id).genes
+
+    optimizer.fitness_function_batch(routes)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        optimizer.fitness_function_batch(routes)
+    return population_size * repeats / (time.perf_counter() - start)
+
+
+def benchmark_instance(
+    n_points: int,
+    layout: str = 'uniform',
+    seed: int = 42,
+    population_size: int = 100,
+    generations: int = 50,
+    distance_storage: Optional[str] = None,
+    baseline: bool = True
+) -> Dict[str, float]:
+    """
+    Mede o AG vetorizado e o RouteOptimizer em uma instancia sintetica
+
+    Args:
+        n_points: Numero de pontos de entrega
+        layout: 'uniform' ou 'clustered'
+        seed: Semente da instancia e do AG
+        population_size: Tamanho da populacao do AG
+        generations: Numero de geracoes do AG
+        distance_storage: Armazenamento da matriz de distancias (None usa
+            'dense' ate 5.000 pontos e 'sparse' acima disso)
+        baseline: Se True, calcula a linha de base vizinho mais proximo + 2-opt
+
+    Returns:
+        Linha de resultados (tempos em segundos, memoria em MB)
+    """
+    if distance_storage is None:
+        distance_storage = 'dense' if n_points <= 5000 else 'sparse'
+    delivery_points, vehicles = generate_instance(n_points, layout, seed)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    optimizer = RouteOptimizer(
+        delivery_points, vehicles, depot_id=0,
+        distance_dtype=np.float32, distance_storage=distance_storage
+    )
+    setup_time = time.perf_counter() - start
+
+    evaluations = 0
+
+    def counted_batch_fitness(routes):
+        nonlocal evaluations
+        evaluations += len(routes)
+        return optimizer.fitness_function_batch(routes)
+
+    ga = GeneticAlgorithm(population_size=population_size, generations=generations, random_seed=seed)
+    start = time.perf_counter()
+    best = ga.evolve_vectorized(len(delivery_points), counted_batch_fitness, verbose=False)
+    ga_time = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {
+        'n_points': n_points,
+        'layout': layout,
+        'seed': seed,
+        'distance_storage': distance_storage,
+        'population_size': population_size,
+        'generations': len(ga.best_fitness_history),
+        'setup_time': setup_time,
+        'ga_time': ga_time,
+        'generations_per_second': len(ga.best_fitness_history) / ga_time,
+        'evaluations_per_second': evaluations / ga_time,
+        'batch_evaluations_per_second': measure_batch_fitness(optimizer, population_size, seed=seed),
+        'peak_memory_mb': peak_memory / 2**20,
+        'ga_fitness': best.fitness,
+        'ga_distance': best.distance
+    }
+
+    if baseline:
+        result.update(baseline_solution(optimizer))
+        result['quality_ratio'] = best.fitness / result['baseline_fitness']
+
+    return result
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = (50, 200, 1000),
+    layouts: Sequence[str] = LAYOUTS,
+    verbose: bool = True,
+    **params
+) -> List[Dict[str, float]]:
+    """
+    Executa benchmark_instance para cada combinacao de tamanho e layout
+
+    Args:
+        sizes: Numeros de pontos das instancias
+        layouts: Layouts das instancias
+        verbose: Se True, imprime um resumo de cada instancia
+        **params: Parametros repassados a benchmark_instance
+
+    Returns:
+        Lista de linhas de resultados
+    """
+    results = []
+    for n_points in sizes:
+        for layout in layouts:
+            result = benchmark_instance(n_points, layout, **params)
+            results.append(result)
+            if verbose:
+                quality = result.get('quality_ratio')
+                print(
+                    f"{n_points:>6} {layout:<10} "
+                    f"{result['generations_per_second']:8.1f} ger/s "
+                    f"{result['evaluations_per_second']:10.0f} aval/s "
+                    f"{result['peak_memory_mb']:8.1f} MB"
+                    + (f"  AG/base: {quality:.3f}" if quality is not None else "")
+                )
+    return results
+
+
+def save_results(results: List[Dict[str, float]], path: str):
+    """
+    Grava os resultados em CSV (uma linha por instancia)
+
+    Args:
+        results: Linhas retornadas por run_benchmarks
+        path: Arquivo CSV de saida
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = list(dict.fromkeys(key for result in results for key in result))
+
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    """
+    Executa o benchmark pela linha de comando
+    """
+    parser = argparse.ArgumentParser(description="Benchmark do AG de roteamento")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument('--population', type=int, default=100)
+    parser.add_argument('--generations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-baseline', action='store_true')
+    parser.add_argument(
+        '--output',
+        default=str(Path(__file__).parent.parent / "results" / "benchmarks" / "benchmark.csv")
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.sizes, args.layouts,
+        seed=args.seed,
+        population_size=args.population,
+        generations=args.generations,
+        baseline=not args.no_baseline
+    )
+    save_results(results, args.output)
+    print(f"Resultados salvos em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Checkpoints do Algoritmo Genetico
+
+Este modulo implementa a gravacao e a leitura do estado de uma evolucao
+em um arquivo binario compacto (.npz, sem pickle):
+- Matriz da populacao (genes int32, fitness, distancia, penalidade)
+- Historicos de fitness e melhor individuo
+- Estado do gerador aleatorio do AG (np.random.Generator), para que a
+  evolucao retomada seja identica a uma execucao sem interrupcao
+
+A gravacao e atomica (arquivo temporario + os.replace): uma interrupcao
+durante a escrita preserva o checkpoint anterior.
+"""
+
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Dict
+
+# Incrementar se o formato do arquivo mudar
+CHECKPOINT_VERSION = 1
+
+
+def capture_rng_state(rng: np.random.Generator) -> str:
+    """Estado do gerador de bits de `rng` serializado em JSON"""
+    return json.dumps(rng.bit_generator.state)
+
+
+def restore_rng_state(rng: np.random.Generator, state: str):
+    """Restaura em `rng` o estado gravado por capture_rng_state"""
+    state = json.loads(state)
+    if state['bit_generator'] != type(rng.bit_generator).__name__:
+        raise ValueError(
+            f"Gerador incompativel: {state['bit_generator']} "
+            f"(esperado {type(rng.bit_generator).__name__})"
+        )
+    rng.bit_generator.state = state
+
+
+def save_checkpoint(path: str, **arrays: np.ndarray):
+    """
+    Grava os arrays informados em um arquivo .npz, de forma atomica
+
+    Args:
+        path: Caminho do arquivo de checkpoint
+        arrays: Arrays nomeados a gravar
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    with open(tmp_path, 'wb') as file:
+        np.savez(file, checkpoint_version=CHECKPOINT_VERSION, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, np.ndarray]:
+    """
+    Le um arquivo gravado por save_checkpoint
+
+    Args:
+        path: Caminho do arquivo de checkpoint
+
+    Returns:
+        Dicionario com os arrays gravados
+    """
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+
+    version = int(arrays.pop('checkpoint_version'))
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Versao de checkpoint incompativel: {version} (esperada {CHECKPOINT_VERSION})"
+        )
+    return arrays
@@ -0,0 +1,386 @@
+"""
+Decomposicao Espacial para Instancias Grandes
+
+Este modulo divide um problema com milhares de pontos em varios problemas
+pequenos, resolvidos de forma independente:
+- Agrupamento dos pontos por varredura angular em torno do deposito
+  ('sweep', grupos limitados pela capacidade do veiculo) ou por k-means
+- Um GeneticAlgorithm por grupo, com os grupos otimizados em paralelo
+  (um processo por grupo, ate n_workers ao mesmo tempo)
+- Reparo de fronteira: pontos proximos da fronteira entre grupos vizinhos
+  sao realocados para a rota vizinha quando isso reduz o fitness total
+
+Cada grupo vira uma rota [deposito, ..., deposito] atendida pelo veiculo
+informado. Os subproblemas usam submatrizes da matriz de distancias e sao
+avaliados com evaluate_routes_batch, como no RouteOptimizer.
+"""
+
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+try:
+    from .genetic_algorithm import GeneticAlgorithm
+    from .routing import evaluate_routes_batch
+    from .operators import make_seed_sequence
+except ImportError:
+    from genetic_algorithm import GeneticAlgorithm
+    from routing import evaluate_routes_batch
+    from operators import make_seed_sequence
+
+
+def _planar_coordinates(lats: np.ndarray, lons: np.ndarray, depot: int) -> np.ndarray:
+    """Projecao equirretangular em torno do deposito (graus de latitude)"""
+    scale = np.cos(np.radians(lats[depot]))
+    return np.column_stack(((lons - lons[depot]) * scale, lats - lats[depot]))
+
+
+def sweep_clusters(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    depot: int,
+    demand: np.ndarray,
+    capacity: float,
+    max_cluster_size: Optional[int] = None
+) -> List[np.ndarray]:
+    """
+    Agrupa os pontos por varredura angular em torno do deposito
+
+    A varredura comeca apos o maior intervalo angular entre pontos
+    consecutivos, para nao separar um grupo natural. Um novo grupo e
+    iniciado quando a demanda acumulada excederia a capacidade ou quando o
+    grupo atinge max_cluster_size pontos.
+
+    Args:
+        lats, lons: Coordenadas de todos os pontos (graus)
+        depot: ID do deposito
+        demand: Demanda (kg) de cada ponto
+        capacity: Capacidade do veiculo (kg)
+        max_cluster_size: Numero maximo de pontos por grupo (opcional)
+
+    Returns:
+        Lista de arrays com os IDs de cada grupo, na ordem da varredura
+    """
+    points = np.delete(np.arange(len(lats)), depot)
+    if len(points) == 0:
+        return []
+
+    xy = _planar_coordinates(lats, lons, depot)[points]
+    order = np.argsort(np.arctan2(xy[:, 1], xy[:, 0]), kind='stable')
+    angles = np.arctan2(xy[order, 1], xy[order, 0])
+    gaps = np.diff(np.concatenate((angles, [angles[0] + 2 * np.pi])))
+    points = np.roll(points[order], -int((np.argmax(gaps) + 1) % len(points)))
+
+    clusters, current, load = [], [], 0.0
+    for point in points:
+        full = max_cluster_size is not None and len(current) >= max_cluster_size
+        if current and (load + demand[point] > capacity or full):
+            clusters.append(np.array(current))
+            current, load = [], 0.0
+        current.append(int(point))
+        load += float(demand[point])
+    clusters.append(np.array(current))
+
+    return clusters
+
+
+def kmeans_clusters(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    depot: int,
+    n_clusters: int,
+    iterations: int = 50,
+    random_seed: Optional[int] = None
+) -> List[np.ndarray]:
+    """
+    Agrupa os pontos por k-means (algoritmo de Lloyd) nas coordenadas planas
+
+    Grupos que ficam vazios recebem o ponto mais distante do seu centroide,
+    tirado de um grupo com mais de um membro.
+    Os grupos sao devolvidos ordenados pelo angulo do centroide em torno do
+    deposito, de modo que grupos consecutivos sejam vizinhos.
+
+    Args:
+        lats, lons: Coordenadas de todos os pontos (graus)
+        depot: ID do deposito
+        n_clusters: Numero de grupos
+        iterations: Numero maximo de iteracoes
+        random_seed: Semente dos centroides iniciais
+
+    Returns:
+        Lista de arrays com os IDs de cada grupo
+    """
+    points = np.delete(np.arange(len(lats)), depot)
+    if len(points) == 0:
+        return []
+
+    xy = _planar_coordinates(lats, lons, depot)[points]
+    n_clusters = max(1, min(n_clusters, len(points)))
+    rng = np.random.default_rng(random_seed)
+    centroids = xy[rng.choice(len(points), n_clusters, replace=False)]
+
+    labels = np.full(len(points), -1)
+    for _ in range(iterations):
+        squared = ((xy[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        new_labels = np.argmin(squared, axis=1)
+
+        # Grupos vazios recebem o ponto mais distante do seu centroide entre
+        # os grupos com mais de um membro; contagens refeitas a cada troca
+        counts = np.bincount(new_labels, minlength=n_clusters)
+        own_distance = squared[np.arange(len(points)), new_labels]
+        for empty in np.flatnonzero(counts == 0):
+            donors = counts[new_labels] > 1
+            farthest = int(np.argmax(np.where(donors, own_distance, -np.inf)))
+            counts[new_labels[farthest]] -= 1
+            counts[empty] += 1
+            new_labels[farthest] = empty
+            own_distance[farthest] = -np.inf
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=n_clusters)[:, None]
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, xy)
+        centroids = sums / counts
+
+    angle = np.arctan2(centroids[:, 1], centroids[:, 0])
+    return [points[labels == cluster] for cluster in np.argsort(angle, kind='stable')]
+
+
+def _optimize_cluster(task: Dict) -> List[int]:
+    """Otimiza a rota de um grupo (executado no processo trabalhador)"""
+    ids = task['ids']
+    if len(ids) <= 3:
+        # Poucos pontos: a ordem por varredura ja e suficiente para o reparo
+        return [0] + list(range(1, len(ids))) + [0]
+
+    arrays, params = task['arrays'], task['params']
+    batch_fitness_function = lambda routes: evaluate_routes_batch(routes, **arrays, **params)
+
+    ga = GeneticAlgorithm(random_seed=task['seed'], **task['ga_params'])
+    best = ga.evolve_vectorized(len(ids), batch_fitness_function, depot=0, verbose=False)
+    return [int(gene) for gene in best.genes]
+
+
+class SpatialDecomposition:
+    """
+    Otimizacao por decomposicao espacial (agrupar, otimizar, reparar)
+
+    Parametros principais:
+    - method: 'sweep' (varredura angular limitada pela capacidade) ou
+      'kmeans'
+    - n_clusters: Numero de grupos no k-means (padrao: o necessario para
+      a demanda total caber na capacidade do veiculo)
+    - max_cluster_size: Numero maximo de pontos por grupo na varredura
+    - n_workers: Processos usados para otimizar os grupos (1 = sequencial)
+    - boundary_size: Pontos de cada grupo candidatos a realocacao para o
+      grupo vizinho em cada passada do reparo
+    - repair_passes: Numero maximo de passadas do reparo de fronteira
+    - ga_params: Parametros repassados a cada GeneticAlgorithm
+      (population_size, generations, mutation_rate, ...)
+    """
+
+    METHODS = ('sweep', 'kmeans')
+
+    def __init__(
+        self,
+        optimizer,
+        method: str = 'sweep',
+        n_clusters: Optional[int] = None,
+        max_cluster_size: Optional[int] = 50,
+        n_workers: Optional[int] = None,
+        vehicle_id: int = 0,
+        boundary_size: int = 5,
+        repair_passes: int = 3,
+        random_seed: Optional[int] = None,
+        **ga_params
+    ):
+        """
+        Args:
+            optimizer: RouteOptimizer com os dados do problema
+            vehicle_id: Veiculo usado para limitar e avaliar cada grupo
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method deve ser um de {self.METHODS}, recebido: {method!r}")
+
+        self.optimizer = optimizer
+        self.method = method
+        self.n_clusters = n_clusters
+        self.max_cluster_size = max_cluster_size
+        self.n_workers = n_workers
+        self.vehicle_id = vehicle_id
+        self.boundary_size = boundary_size
+        self.repair_passes = repair_passes
+        self.random_seed = random_seed
+        self.ga_params = ga_params
+
+        self.clusters = []
+        self.routes = []
+        self.fitness_before_repair = None
+        self.fitness = None
+        self.repair_moves = 0
+        self.elapsed_time = 0.0
+
+    def cluster(self) -> List[np.ndarray]:
+        """
+        Agrupa os pontos de entrega pelo metodo configurado
+
+        Returns:
+            Lista de arrays com os IDs de cada grupo; grupos consecutivos
+            (e o ultimo com o primeiro) sao vizinhos
+        """
+        optimizer = self.optimizer
+        lats, lons = optimizer.point_arrays.lat, optimizer.point_arrays.lon
+        demand, _ = optimizer._get_point_arrays()
+        capacity = optimizer.vehicles[self.vehicle_id].capacity
+
+        if self.method == 'sweep':
+            return sweep_clusters(
+                lats, lons, optimizer.depot_id, demand, capacity, self.max_cluster_size
+            )
+
+        n_clusters = self.n_clusters
+        if n_clusters is None:
+            n_clusters = int(np.ceil(demand.sum() / capacity))
+            if self.max_cluster_size:
+                n_clusters = max(
+                    n_clusters, int(np.ceil((len(lats) - 1) / self.max_cluster_size))
+                )
+        return kmeans_clusters(
+            lats, lons, optimizer.depot_id, n_clusters, random_seed=self.random_seed
+        )
+
+    def _cluster_tasks(self, clusters: List[np.ndarray]) -> List[Dict]:
+        """Subproblema de cada grupo, com IDs locais (deposito = 0)"""
+        arrays, params = self.optimizer.get_batch_fitness_inputs(self.vehicle_id)
+        distance_matrix = arrays.pop('distance_matrix')
+
+        # Um fluxo aleatorio independente por grupo, derivado da semente
+        seeds = make_seed_sequence(self.random_seed).spawn(len(clusters))
+        tasks = []
+        for cluster, seed in zip(clusters, seeds):
+            ids = np.concatenate(([self.optimizer.depot_id], cluster))
+            sub_arrays = {name: np.asarray(values)[ids] for name, values in arrays.items()}
+            sub_arrays['distance_matrix'] = np.asarray(
+                distance_matrix[ids[:, None], ids[None, :]], dtype=np.float64
+            )
+            tasks.append({
+                'ids': ids,
+                'arrays': sub_arrays,
+                'params': params,
+                'ga_params': self.ga_params,
+                'seed': seed
+            })
+        return tasks
+
+    def _route_fitness(self, route: List[int]) -> float:
+        return self.optimizer.fitness_function(route, self.vehicle_id)[0]
+
+    def repair_boundaries(self, routes: List[List[int]]) -> List[List[int]]:
+        """
+        Realoca pontos de fronteira entre rotas de grupos vizinhos
+
+        Para cada par de grupos vizinhos, os boundary_size pontos de uma rota
+        mais proximos do centroide da outra sao testados, um a um, na posicao
+        de insercao mais barata da rota vizinha; a realocacao e aceita se a
+        soma dos fitness das duas rotas diminuir.
+
+        Args:
+            routes: Rotas de cada grupo (IDs globais), na ordem dos grupos
+
+        Returns:
+            Rotas apos o reparo
+        """
+        routes = [list(route) for route in routes]
+        n_routes = len(routes)
+        if n_routes < 2:
+            return routes
+
+        lats, lons = self.optimizer.point_arrays.lat, self.optimizer.point_arrays.lon
+        xy = _planar_coordinates(lats, lons, self.optimizer.depot_id)
+        pairs = [(a, (a + 1) % n_routes) for a in range(n_routes if n_routes > 2 else 1)]
+
+        for _ in range(self.repair_passes):
+            moved = 0
+            for a, b in pairs:
+                for source, target in ((a, b), (b, a)):
+                    stops = np.array(routes[source][1:-1])
+                    if len(stops) <= 1 or len(routes[target]) <= 2:
+                        continue
+
+                    centroid = xy[routes[target][1:-1]].mean(axis=0)
+                    closest = np.argsort(((xy[stops] - centroid) ** 2).sum(axis=1))
+                    for point in stops[closest[:self.boundary_size]]:
+                        point = int(point)
+                        if len(routes[source]) <= 3:
+                            break
+                        current = (
+                            self._route_fitness(routes[source])
+                            + self._route_fitness(routes[target])
+                        )
+                        new_source = [p for p in routes[source] if p != point]
+                        new_target = self.optimizer.cheapest_insertion(routes[target], point)
+                        candidate = (
+                            self._route_fitness(new_source) + self._route_fitness(new_target)
+                        )
+                        if candidate < current - 1e-9:
+                            routes[source], routes[target] = new_source, new_target
+                            moved += 1
+
+            self.repair_moves += moved
+            if moved == 0:
+                break
+
+        return routes
+
+    def run(self) -> List[List[int]]:
+        """
+        Agrupa, otimiza cada grupo (em paralelo) e repara as fronteiras
+
+        Returns:
+            Lista de rotas [deposito, ..., deposito] com IDs globais
+        """
+        start = time.time()
+        self.repair_moves = 0
+        self.clusters = self.cluster()
+        tasks = self._cluster_tasks(self.clusters)
+
+        if self.n_workers == 1 or len(tasks) <= 1:
+            local_routes = [_optimize_cluster(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_workers) as executor:
+                local_routes = list(executor.map(_optimize_cluster, tasks))
+
+        routes = [
+            [int(task['ids'][gene]) for gene in route]
+            for task, route in zip(tasks, local_routes)
+        ]
+        self.fitness_before_repair = sum(self._route_fitness(route) for route in routes)
+
+        self.routes = self.repair_boundaries(routes)
+        self.fitness = sum(self._route_fitness(route) for route in self.routes)
+        self.elapsed_time = time.time() - start
+
+        return self.routes
+
+    def get_statistics(self) -> dict:
+        """
+        Retorna estatisticas da execucao
+
+        Returns:
+            Dicionario com grupos, fitness antes/depois do reparo e tempo
+        """
+        return {
+            'method': self.method,
+            'n_clusters': len(self.clusters),
+            'cluster_sizes': [len(cluster) for cluster in self.clusters],
+            'fitness_before_repair': self.fitness_before_repair,
+            'fitness': self.fitness,
+            'repair_moves': self.repair_moves,
+            'total_distance': sum(
+                self.optimizer.calculate_route_distance(route) for route in self.routes
+            ),
+            'elapsed_time': self.elapsed_time
+        }
@@ -0,0 +1,371 @@
+"""
+Calculo de Distancias entre Pontos de Entrega
+
+Este modulo implementa:
+- Matriz de distancias pela formula de haversine, calculada de uma so vez
+  com broadcasting do NumPy (sem lacos Python)
+- Cache em disco (.npy) enderecado pelo conteudo: a chave e um hash das
+  coordenadas e do tipo numerico, de modo que reinicios com o mesmo
+  conjunto de pontos reaproveitam a matriz ja calculada
+- Armazenamentos alternativos para instancias grandes: matriz mapeada em
+  memoria a partir do cache ou apenas os k vizinhos mais proximos de cada
+  ponto, com calculo sob demanda dos demais pares
+"""
+
+import hashlib
+import os
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+
+EARTH_RADIUS_KM = 6371.0
+
+# Incrementar se a forma de calculo mudar, invalidando caches antigos
+CACHE_VERSION = 1
+
+
+def haversine_block(
+    lats_a: np.ndarray,
+    lons_a: np.ndarray,
+    lats_b: np.ndarray,
+    lons_b: np.ndarray,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Calcula as distancias de haversine (km) entre dois conjuntos de pontos
+
+    Args:
+        lats_a, lons_a: Coordenadas das linhas, em graus
+        lats_b, lons_b: Coordenadas das colunas, em graus
+        dtype: Tipo numerico do resultado
+
+    Returns:
+        Matriz (len(a), len(b)) de distancias
+    """
+    lat_a = np.radians(np.asarray(lats_a, dtype=np.float64))
+    lon_a = np.radians(np.asarray(lons_a, dtype=np.float64))
+    lat_b = np.radians(np.asarray(lats_b, dtype=np.float64))
+    lon_b = np.radians(np.asarray(lons_b, dtype=np.float64))
+
+    # sin((x_i - x_j) / 2) expandido em produtos externos, evitando funcoes
+    # trigonometricas sobre a matriz inteira
+    def half_angle_sin(angles_a, angles_b):
+        sin_a = np.sin(angles_a / 2).astype(dtype)
+        cos_a = np.cos(angles_a / 2).astype(dtype)
+        sin_b = np.sin(angles_b / 2).astype(dtype)
+        cos_b = np.cos(angles_b / 2).astype(dtype)
+        result = np.multiply.outer(sin_a, cos_b)
+        result -= np.multiply.outer(cos_a, sin_b)
+        return result
+
+    # a = sin^2(dlat/2) + cos(lat_i) cos(lat_j) sin^2(dlon/2), calculado in-place
+    a = half_angle_sin(lon_a, lon_b)
+    np.square(a, out=a)
+    a *= np.multiply.outer(np.cos(lat_a).astype(dtype), np.cos(lat_b).astype(dtype))
+    sin_dlat = half_angle_sin(lat_a, lat_b)
+    np.square(sin_dlat, out=sin_dlat)
+    a += sin_dlat
+    del sin_dlat
+
+    np.clip(a, 0, 1, out=a)
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS_KM
+
+    return a
+
+
+def haversine_distance_matrix(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Calcula a matriz NxN de distancias de haversine (km)
+
+    Args:
+        lats: Latitudes em graus
+        lons: Longitudes em graus
+        dtype: Tipo numerico da matriz (float32 reduz a memoria pela metade)
+
+    Returns:
+        Matriz NxN simetrica, com diagonal zero
+    """
+    # A expansao e antissimetrica antes do quadrado, portanto a matriz ja sai
+    # exatamente simetrica e com diagonal zero
+    return haversine_block(lats, lons, lats, lons, dtype)
+
+
+def haversine_pairs(
+    lats_a: np.ndarray,
+    lons_a: np.ndarray,
+    lats_b: np.ndarray,
+    lons_b: np.ndarray
+) -> np.ndarray:
+    """
+    Distancias de haversine (km) elemento a elemento entre pares de pontos
+
+    Simetrica por construcao: trocar a e b gera exatamente o mesmo valor.
+
+    Args:
+        lats_a, lons_a: Coordenadas do primeiro ponto de cada par, em radianos
+        lats_b, lons_b: Coordenadas do segundo ponto de cada par, em radianos
+
+    Returns:
+        Array com a distancia de cada par
+    """
+    sin_dlat = np.sin((lats_b - lats_a) / 2)
+    sin_dlon = np.sin((lons_b - lons_a) / 2)
+    a = sin_dlat ** 2 + np.cos(lats_a) * np.cos(lats_b) * sin_dlon ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def distance_cache_key(lats: np.ndarray, lons: np.ndarray, dtype=np.float64) -> str:
+    """
+    Chave de cache derivada do conteudo das coordenadas
+
+    Args:
+        lats: Latitudes em graus
+        lons: Longitudes em graus
+        dtype: Tipo numerico da matriz
+
+    Returns:
+        Hash hexadecimal que identifica o conjunto de coordenadas
+    """
+    digest = hashlib.sha256()
+    digest.update(f"haversine-v{CACHE_VERSION}-{np.dtype(dtype).str}".encode())
+    digest.update(np.ascontiguousarray(lats, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(lons, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def load_or_compute_distance_matrix(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    cache_dir: Optional[str] = None,
+    dtype=np.float64,
+    mmap: bool = False,
+    block_size: int = 1024
+) -> np.ndarray:
+    """
+    Obtem a matriz de distancias do cache em disco ou a calcula
+
+    Com `mmap=True` a matriz e calculada em blocos de linhas diretamente no
+    arquivo de cache e devolvida mapeada em memoria (somente leitura): as
+    paginas sao carregadas sob demanda e compartilhadas pelo sistema
+    operacional entre todos os processos que usam o mesmo arquivo.
+
+    Args:
+        lats: Latitudes em graus
+        lons: Longitudes em graus
+        cache_dir: Diretorio do cache (None desativa o cache)
+        dtype: Tipo numerico da matriz
+        mmap: Se True, devolve um np.memmap do arquivo de cache
+        block_size: Linhas calculadas por bloco no modo mmap
+
+    Returns:
+        Matriz NxN de distancias (km)
+    """
+    if cache_dir is None:
+        if mmap:
+            raise ValueError("mmap=True requer um cache_dir")
+        return haversine_distance_matrix(lats, lons, dtype)
+
+    cache_path = Path(cache_dir) / f"distances_{distance_cache_key(lats, lons, dtype)}.npy"
+    if cache_path.exists():
+        try:
+            return np.load(cache_path, mmap_mode='r' if mmap else None)
+        except (OSError, ValueError):
+            pass  # Arquivo corrompido: recalcular e sobrescrever
+
+    # Escrita atomica: processos concorrentes nunca leem um arquivo parcial
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp.npy")
+
+    if mmap:
+        n = len(lats)
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=(n, n))
+        for start in range(0, n, block_size):
+            rows = slice(start, start + block_size)
+            out[rows] = haversine_block(lats[rows], lons[rows], lats, lons, dtype)
+        out.flush()
+        del out
+        os.replace(tmp_path, cache_path)
+        return np.load(cache_path, mmap_mode='r')
+
+    matrix = haversine_distance_matrix(lats, lons, dtype)
+    np.save(tmp_path, matrix)
+    os.replace(tmp_path, cache_path)
+
+    return matrix
+
+
+class SparseDistanceMatrix:
+    """
+    Distancias armazenadas apenas para os k vizinhos mais proximos de cada ponto
+
+    Usa O(N*k) de memoria em vez de O(N^2). Pares fora da lista de vizinhos
+    sao calculados sob demanda pela formula de haversine. Suporta a mesma
+    indexacao usada com a matriz densa:
+    - d[i, j] com inteiros devolve um escalar
+    - d[rotas[:, :-1], rotas[:, 1:]] com arrays devolve um array
+
+    Os valores armazenados e os calculados sob demanda vem da mesma formula,
+    portanto d[i, j] == d[j, i] sempre.
+    """
+
+    # Pares consultados por bloco na indexacao com arrays
+    QUERY_CHUNK = 65536
+
+    def __init__(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        k: int = 20,
+        dtype=np.float32,
+        block_size: int = 1024
+    ):
+        """
+        Args:
+            lats: Latitudes em graus
+            lons: Longitudes em graus
+            k: Numero de vizinhos armazenados por ponto
+            dtype: Tipo numerico das distancias
+            block_size: Linhas calculadas por bloco na busca dos vizinhos
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        n = len(lats)
+        self.requested_k = k
+        self.k = k = min(k, n - 1)
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        self.shape = (n, n)
+        self.lats, self.lons = lats, lons
+        self._lat = np.radians(lats)
+        self._lon = np.radians(lons)
+
+        # k vizinhos mais proximos, calculados em blocos de linhas para nao
+        # materializar a matriz NxN
+        self.neighbors = np.empty((n, k), dtype=np.int32)
+        for start in range(0, n, block_size):
+            block_rows = slice(start, start + block_size)
+            block = haversine_block(lats[block_rows], lons[block_rows], lats, lons, dtype)
+            rows = np.arange(start, start + len(block))
+            block[rows - start, rows] = np.inf
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1)
+            self.neighbors[rows] = np.take_along_axis(nearest, order, axis=1)
+
+        rows = np.repeat(np.arange(n), k)
+        self.neighbor_distances = self._compute(rows, self.neighbors.ravel()).reshape(n, k)
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Indice ordenado das chaves i * N + j dos pares armazenados
+
+        Permite localizar os pares consultados em lote com searchsorted,
+        sem temporarios de tamanho (consultas x k).
+        """
+        n, k = self.neighbors.shape
+        order = np.argsort(self.neighbors, axis=1, kind='stable')
+        columns = np.take_along_axis(self.neighbors, order, axis=1).astype(np.int64)
+        # Linhas em ordem crescente e colunas ordenadas em cada linha: as
+        # chaves ja saem globalmente ordenadas
+        self._pair_keys = (np.arange(n, dtype=np.int64)[:, None] * self.shape[0] + columns).ravel()
+        self._pair_distances = np.take_along_axis(self.neighbor_distances, order, axis=1).ravel()
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada pelas tabelas de vizinhos e pelo indice de pares"""
+        return (
+            self.neighbors.nbytes + self.neighbor_distances.nbytes
+            + self._pair_keys.nbytes + self._pair_distances.nbytes
+        )
+
+    def add_point(self, lat: float, lon: float):
+        """
+        Acrescenta um ponto ao final, sem recalcular as listas existentes
+
+        O novo ponto recebe seus k vizinhos, e entra nas listas dos pontos
+        existentes para os quais ele passa a estar entre os k mais proximos.
+        """
+        n = self.shape[0]
+        self.lats = np.append(self.lats, lat)
+        self.lons = np.append(self.lons, lon)
+        self._lat = np.radians(self.lats)
+        self._lon = np.radians(self.lons)
+        self.shape = (n + 1, n + 1)
+
+        distances = self._compute(np.full(n, n), np.arange(n))
+        nearest = np.argsort(distances, kind='stable')[:self.k]
+
+        # Inserir o novo ponto, em ordem, nas listas em que ele e mais
+        # proximo que o vizinho mais distante
+        for row in np.flatnonzero(distances < self.neighbor_distances[:, -1]):
+            position = np.searchsorted(self.neighbor_distances[row], distances[row], side='right')
+            self.neighbors[row, position + 1:] = self.neighbors[row, position:-1].copy()
+            self.neighbor_distances[row, position + 1:] = self.neighbor_distances[row, position:-1].copy()
+            self.neighbors[row, position] = n
+            self.neighbor_distances[row, position] = distances[row]
+
+        self.neighbors = np.vstack([self.neighbors, nearest[None].astype(np.int32)])
+        self.neighbor_distances = np.vstack([self.neighbor_distances, distances[nearest][None]])
+        self._build_index()
+
+    def remove_points(self, keep: np.ndarray):
+        """
+        Remove pontos, renumerando os restantes na ordem original
+
+        Args:
+            keep: Mascara booleana dos pontos mantidos
+        """
+        self.__init__(
+            self.lats[keep], self.lons[keep],
+            k=self.requested_k, dtype=self.dtype, block_size=self.block_size
+        )
+
+    def _compute(self, i, j):
+        """Distancia de haversine sob demanda para os pares (i, j)"""
+        return haversine_pairs(
+            self._lat[i], self._lon[i], self._lat[j], self._lon[j]
+        ).astype(self.dtype)
+
+    def __getitem__(self, key):
+        i, j = key
+        if np.isscalar(i) and np.isscalar(j):
+            hits = np.flatnonzero(self.neighbors[i] == j)
+            if len(hits):
+                return self.neighbor_distances[i, hits[0]]
+            return self.dtype.type(0) if i == j else self._compute(i, j)
+
+        i, j = np.broadcast_arrays(np.asarray(i), np.asarray(j))
+        flat_i, flat_j = i.ravel(), j.ravel()
+        result = np.empty(flat_i.size, dtype=self.dtype)
+
+        # Consultas em blocos: os temporarios (chaves, posicoes e haversine
+        # dos pares ausentes) ficam limitados a QUERY_CHUNK elementos
+        for start in range(0, flat_i.size, self.QUERY_CHUNK):
+            block = slice(start, start + self.QUERY_CHUNK)
+            result[block] = self._lookup(flat_i[block], flat_j[block])
+
+        return result.reshape(i.shape)
+
+    def _lookup(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """Distancias de um bloco de pares: indice ordenado ou haversine"""
+        if len(self._pair_keys) == 0:
+            return np.where(i == j, 0, self._compute(i, j)).astype(self.dtype)
+
+        keys = i.astype(np.int64) * self.shape[0] + j
+        position = np.searchsorted(self._pair_keys, keys)
+        np.minimum(position, len(self._pair_keys) - 1, out=position)
+        found = self._pair_keys[position] == keys
+
+        result = self._pair_distances[position]
+        missing = ~found & (i != j)
+        result[missing] = self._compute(i[missing], j[missing])
+        result[~found & (i == j)] = 0
+
+        return result
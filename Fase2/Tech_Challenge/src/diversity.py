@@ -0,0 +1,117 @@
+"""
+Metricas de Diversidade da Populacao
+
+Este modulo implementa medidas vetorizadas da diversidade de uma matriz
+de rotas (uma linha por individuo) e a deteccao de rotas repetidas:
+- Entropia da frequencia de arestas: 0 quando todas as rotas sao iguais,
+  1 quando nenhuma aresta se repete entre rotas
+- Distancia de adjacencia media: fracao de arestas de uma rota ausentes
+  em outra, estimada sobre uma amostra de pares
+- Duplicatas por hash vetorizado das linhas, para substitui-las por
+  imigrantes aleatorios em vez de desperdicar avaliacoes
+
+As arestas sao consideradas sem direcao (a rota e seu reverso tem as
+mesmas adjacencias).
+"""
+
+import numpy as np
+from typing import Optional
+
+
+def _edge_keys(genes: np.ndarray) -> np.ndarray:
+    """Chave int64 de cada aresta sem direcao, matriz (n, tamanho_rota - 1)"""
+    genes = np.asarray(genes, dtype=np.int64)
+    a, b = genes[:, :-1], genes[:, 1:]
+    n_points = int(genes.max()) + 1
+    return np.minimum(a, b) * n_points + np.maximum(a, b)
+
+
+def edge_entropy(genes: np.ndarray) -> float:
+    """
+    Entropia normalizada da frequencia de arestas na populacao
+
+    Args:
+        genes: Matriz (n, tamanho_rota) de rotas
+
+    Returns:
+        Valor entre 0 (todas as rotas iguais) e 1 (arestas todas distintas)
+    """
+    genes = np.asarray(genes)
+    size, edges_per_route = genes.shape[0], genes.shape[1] - 1
+    if size <= 1 or edges_per_route <= 0:
+        return 0.0
+
+    _, counts = np.unique(_edge_keys(genes), return_counts=True)
+    probability = counts / counts.sum()
+    entropy = -np.sum(probability * np.log(probability))
+
+    # Minimo: log(arestas por rota); maximo: log(n x arestas por rota)
+    return float(np.clip((entropy - np.log(edges_per_route)) / np.log(size), 0.0, 1.0))
+
+
+def adjacency_distance(
+    genes: np.ndarray,
+    sample_size: int = 200,
+    rng: Optional[np.random.Generator] = None
+) -> float:
+    """
+    Distancia de adjacencia media entre pares de rotas
+
+    Para cada par (i, j) amostrado, conta as arestas de i que nao existem
+    em j, usando a tabela de sucessores de j (uma consulta por aresta).
+
+    Args:
+        genes: Matriz (n, tamanho_rota) de rotas
+        sample_size: Numero de pares amostrados
+        rng: Gerador de numeros aleatorios (np.random.Generator)
+
+    Returns:
+        Valor entre 0 (rotas iguais) e 1 (nenhuma aresta em comum)
+    """
+    genes = np.asarray(genes, dtype=np.int64)
+    size = len(genes)
+    if size <= 1 or genes.shape[1] <= 1:
+        return 0.0
+    if rng is None:
+        rng = np.random.default_rng()
+
+    first = rng.integers(0, size, sample_size)
+    second = (first + rng.integers(1, size, sample_size)) % size
+
+    # Sucessor de cada ponto em cada rota j amostrada
+    n_points = int(genes.max()) + 1
+    successor = np.full((sample_size, n_points), -1, dtype=np.int64)
+    pairs = np.arange(sample_size)[:, None]
+    successor[pairs, genes[second, :-1]] = genes[second, 1:]
+
+    a, b = genes[first, :-1], genes[first, 1:]
+    shared = (successor[pairs, a] == b) | (successor[pairs, b] == a)
+
+    return float(1.0 - shared.mean())
+
+
+def duplicate_rows(genes: np.ndarray) -> np.ndarray:
+    """
+    Mascara das linhas que repetem uma linha anterior
+
+    Cada linha e reduzida a um hash de 64 bits (produto com pesos
+    aleatorios fixos, modulo 2^64) e as repeticoes sao encontradas com
+    np.unique; a primeira ocorrencia de cada rota e mantida.
+
+    Args:
+        genes: Matriz (n, tamanho_rota) de rotas
+
+    Returns:
+        Array booleano (True = duplicata)
+    """
+    genes = np.asarray(genes)
+    weights = np.random.default_rng(0x5EED).integers(
+        1, np.iinfo(np.int64).max, genes.shape[1], dtype=np.int64
+    ).astype(np.uint64) | np.uint64(1)
+    with np.errstate(over='ignore'):
+        hashes = (genes.astype(np.uint64) * weights).sum(axis=1)
+
+    _, first = np.unique(hashes, return_index=True)
+    duplicate = np.ones(len(genes), dtype=bool)
+    duplicate[first] = False
+    return duplicate
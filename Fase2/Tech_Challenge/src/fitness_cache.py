@@ -0,0 +1,154 @@
+"""
+Cache de Fitness para o Algoritmo Genetico
+
+Este modulo implementa um cache LRU limitado para avaliacoes de rotas:
+- A chave e um hash rapido dos bytes do genoma (int32), o que torna a
+  consulta O(n) sem guardar a rota inteira no cache
+- Rotas repetidas (copias de pais, duplicatas de populacoes convergidas)
+  sao avaliadas uma unica vez
+- Contadores de acertos e falhas permitem medir o ganho
+
+O cache envolve tanto a funcao de fitness individual quanto a vetorizada;
+em lotes, rotas repetidas dentro do proprio lote tambem sao avaliadas uma
+unica vez. As entradas sao separadas por funcao de fitness: o mesmo genoma
+avaliado por funcoes diferentes ocupa chaves diferentes.
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+
+def genome_key(genes) -> int:
+    """Hash dos bytes do genoma, independente de ser lista ou array"""
+    return hash(np.ascontiguousarray(genes, dtype=np.int32).tobytes())
+
+
+class FitnessCache:
+    """
+    Cache LRU de (fitness, distancia, penalidade) indexado pelo genoma
+
+    Parametros principais:
+    - maxsize: Numero maximo de rotas guardadas; ao exceder, a rota usada
+      ha mais tempo e descartada
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._namespaces = {}
+
+    def _namespace(self, fitness_function: Callable) -> int:
+        """Identificador da funcao de fitness usado como prefixo das chaves"""
+        namespace = self._namespaces.get(fitness_function)
+        if namespace is None:
+            namespace = self._namespaces[fitness_function] = len(self._namespaces)
+        return namespace
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Tuple[int, int]):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key: Tuple[int, int], value: Tuple[float, float, float]):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evaluate(self, route, fitness_function: Callable) -> Tuple[float, float, float]:
+        """
+        Avalia uma rota, consultando o cache antes
+
+        Args:
+            route: Rota (lista ou array de IDs)
+            fitness_function: Funcao que retorna (fitness, distancia, penalidade)
+
+        Returns:
+            (fitness, distancia, penalidade)
+        """
+        key = (self._namespace(fitness_function), genome_key(route))
+        value = self._get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = tuple(fitness_function(route))
+        self._put(key, value)
+        return value
+
+    def evaluate_batch(
+        self,
+        routes: np.ndarray,
+        batch_fitness_function: Callable
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Avalia uma matriz de rotas, enviando a funcao apenas as rotas ineditas
+
+        Args:
+            routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+            batch_fitness_function: Funcao vetorizada de fitness
+
+        Returns:
+            (fitness, distancias, penalidades) como arrays de tamanho num_rotas
+        """
+        routes = np.asarray(routes)
+        results = np.empty((3, len(routes)))
+
+        # Rotas ausentes do cache, agrupadas pela chave (duplicatas no lote)
+        pending = {}
+        namespace = self._namespace(batch_fitness_function)
+        for index, row in enumerate(routes):
+            key = (namespace, genome_key(row))
+            value = self._get(key)
+            if value is not None:
+                self.hits += 1
+                results[:, index] = value
+            elif key in pending:
+                self.hits += 1
+                pending[key].append(index)
+            else:
+                pending[key] = [index]
+
+        if pending:
+            self.misses += len(pending)
+            first = [indices[0] for indices in pending.values()]
+            fitness, distance, penalty = batch_fitness_function(routes[first])
+            for (key, indices), value in zip(pending.items(), zip(fitness, distance, penalty)):
+                value = tuple(float(v) for v in value)
+                self._put(key, value)
+                results[:, indices] = np.array(value)[:, None]
+
+        return results[0], results[1], results[2]
+
+    def wrap(self, fitness_function: Callable) -> Callable:
+        """Funcao de fitness individual com consulta ao cache"""
+        return lambda route: self.evaluate(route, fitness_function)
+
+    def wrap_batch(self, batch_fitness_function: Callable) -> Callable:
+        """Funcao de fitness vetorizada com consulta ao cache"""
+        return lambda routes: self.evaluate_batch(routes, batch_fitness_function)
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores"""
+        self._entries.clear()
+        self._namespaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_statistics(self) -> dict:
+        """Acertos, falhas, taxa de acerto e ocupacao do cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries)
+        }
@@ -17,12 +17,39 @@ Este modulo implementa um Algoritmo Genetico completo com:
 - Funcao fitness considerando multiplas restricoes
 """
 
+import time
 import numpy as np
-import random
-from typing import List, Tuple, Callable
+from typing import List, Tuple, Callable, Optional, Iterator
 from dataclasses import dataclass
 from tqdm import tqdm
 
+try:
+    from .operators import (
+        order_crossover, pmx_crossover, edge_recombination_crossover,
+        mutation_swap_batch, mutation_inversion_batch, random_positions,
+        random_subsets, make_seed_sequence
+    )
+    from .fitness_cache import FitnessCache
+    from .stopping import StoppingPolicy
+    from .diversity import edge_entropy, adjacency_distance, duplicate_rows
+    from .profiling import PhaseProfiler, timed
+    from .checkpoint import (
+        capture_rng_state, restore_rng_state, save_checkpoint, load_checkpoint
+    )
+except ImportError:
+    from operators import (
+        order_crossover, pmx_crossover, edge_recombination_crossover,
+        mutation_swap_batch, mutation_inversion_batch, random_positions,
+        random_subsets, make_seed_sequence
+    )
+    from fitness_cache import FitnessCache
+    from stopping import StoppingPolicy
+    from diversity import edge_entropy, adjacency_distance, duplicate_rows
+    from profiling import PhaseProfiler, timed
+    from checkpoint import (
+        capture_rng_state, restore_rng_state, save_checkpoint, load_checkpoint
+    )
+
 
 @dataclass
 class Individual:
@@ -54,6 +81,137 @@ class Individual:
         )
 
 
+@dataclass
+class GenerationSnapshot:
+    """
+    Resumo de uma geração, produzido por GeneticAlgorithm.evolve_iter
+    
+    Attributes:
+        generation: Índice da geração (contado desde o início da evolução)
+        best_fitness: Melhor fitness da geração
+        avg_fitness: Fitness médio da geração
+        best_genes: Melhor rota, como view da matriz da população (válida
+            até o próximo passo do iterador; use .copy() para guardá-la)
+        elapsed_time: Segundos desde o início da iteração
+    """
+    generation: int
+    best_fitness: float
+    avg_fitness: float
+    best_genes: np.ndarray
+    elapsed_time: float
+
+
+class PopulationMatrix:
+    """
+    População armazenada em matrizes NumPy pré-alocadas
+    
+    Todos os genomas ficam em uma única matriz int32 (tamanho_populacao x
+    tamanho_rota), com arrays paralelos de fitness, distância e penalidade.
+    Um segundo conjunto de buffers recebe a próxima geração e os dois são
+    trocados ao final de cada geração (buffer duplo), de modo que a evolução
+    não aloca nada por indivíduo.
+    
+    Attributes:
+        genes: Matriz (size, genome_length) com as rotas
+        fitness: Fitness de cada rota (inf = ainda não avaliada)
+        distance: Distância total de cada rota
+        penalty: Penalidade de cada rota
+    """
+    
+    def __init__(self, size: int, genome_length: int):
+        self.size = size
+        self.genome_length = genome_length
+        
+        self.genes = np.empty((size, genome_length), dtype=np.int32)
+        self.fitness = np.full(size, np.inf)
+        self.distance = np.zeros(size)
+        self.penalty = np.zeros(size)
+        
+        # Buffers da próxima geração
+        self.next_genes = np.empty_like(self.genes)
+        self.next_fitness = np.full(size, np.inf)
+        self.next_distance = np.zeros(size)
+        self.next_penalty = np.zeros(size)
+        
+        # Linha auxiliar para o filho descartado quando o tamanho é ímpar
+        self.spare = np.empty(genome_length, dtype=np.int32)
+    
+    def swap(self):
+        """Troca os buffers atual e da próxima geração"""
+        self.genes, self.next_genes = self.next_genes, self.genes
+        self.fitness, self.next_fitness = self.next_fitness, self.fitness
+        self.distance, self.next_distance = self.next_distance, self.distance
+        self.penalty, self.next_penalty = self.next_penalty, self.penalty
+    
+    def evaluate(self, batch_fitness_function: Callable) -> int:
+        """
+        Avalia as rotas ainda não avaliadas (fitness == inf)
+        
+        Args:
+            batch_fitness_function: Função que recebe uma matriz de rotas e
+                retorna arrays (fitness, distancia, penalidade)
+            
+        Returns:
+            Número de rotas avaliadas
+        """
+        pending = np.flatnonzero(np.isinf(self.fitness))
+        if len(pending) > 0:
+            fitness, distance, penalty = batch_fitness_function(self.genes[pending])
+            self.fitness[pending] = fitness
+            self.distance[pending] = distance
+            self.penalty[pending] = penalty
+        return len(pending)
+    
+    def best_rows(self, count: int) -> np.ndarray:
+        """Índices das `count` melhores rotas, da melhor para a pior"""
+        count = min(count, self.size)
+        best = np.argpartition(self.fitness, count - 1)[:count]
+        return best[np.argsort(self.fitness[best], kind='stable')]
+    
+    def replace_worst(
+        self,
+        genes: np.ndarray,
+        fitness: np.ndarray,
+        distance: np.ndarray,
+        penalty: np.ndarray
+    ):
+        """
+        Substitui as piores rotas pelas rotas fornecidas (ex.: migrantes)
+        
+        Args:
+            genes: Matriz (k, genome_length) de rotas
+            fitness, distance, penalty: Avaliação de cada rota (inf = não avaliada)
+        """
+        count = min(len(genes), self.size)
+        if count == 0:
+            return
+        worst = np.argpartition(self.fitness, self.size - count)[self.size - count:]
+        self.genes[worst] = genes[:count]
+        self.fitness[worst] = fitness[:count]
+        self.distance[worst] = distance[:count]
+        self.penalty[worst] = penalty[:count]
+    
+    def to_individual(self, index: int) -> Individual:
+        """Converte uma linha da matriz em Individual"""
+        return Individual(
+            genes=self.genes[index].tolist(),
+            fitness=float(self.fitness[index]),
+            distance=float(self.distance[index]),
+            penalty=float(self.penalty[index])
+        )
+    
+    @classmethod
+    def from_individuals(cls, individuals: List[Individual]) -> 'PopulationMatrix':
+        """Cria a matriz a partir de uma lista de indivíduos"""
+        population = cls(len(individuals), len(individuals[0].genes))
+        for i, individual in enumerate(individuals):
+            population.genes[i] = individual.genes
+            population.fitness[i] = individual.fitness
+            population.distance[i] = individual.distance
+            population.penalty[i] = individual.penalty
+        return population
+
+
 class GeneticAlgorithm:
     """
     Implementação do Algoritmo Genético para otimização de rotas
@@ -65,8 +223,38 @@ class GeneticAlgorithm:
     - crossover_rate: Taxa de cruzamento (0 a 1)
     - elite_size: Número de melhores indivíduos preservados (elitismo)
     - tournament_size: Tamanho do torneio para seleção
+    - crossover_method: Operador de cruzamento ('order', 'pmx' ou 'edge')
+    - local_search: Busca local opcional (LocalSearch) para o modo memético
+    - local_search_target: Aplicar a busca local na elite ('elite') ou nos
+      descendentes de cada geração ('offspring')
+    - local_search_rate: Fração dos descendentes submetidos à busca local
+    - evaluator: Backend de avaliação em lote (ex.: ParallelFitnessEvaluator);
+      quando definido, substitui a batch_fitness_function passada a evolve
+    - fitness_cache_size: Número de rotas guardadas no cache LRU de fitness
+      (0 desativa); rotas repetidas não são reavaliadas
+    - stopping: Política de parada antecipada (StoppingPolicy) por tempo,
+      estagnação, fitness alvo ou colapso de diversidade
+    - checkpoint_path: Arquivo onde o estado da evolução é gravado a cada
+      `checkpoint_interval` gerações (ver resume)
+    - random_seed: Semente (int), np.random.SeedSequence ou
+      np.random.Generator do gerador próprio da instância (self.rng); ver
+      spawn_seeds
+    - track_diversity: Registrar, a cada geração, a entropia de arestas e a
+      distância de adjacência média da população (entropy_history e
+      adjacency_distance_history)
+    - eliminate_duplicates: Substituir rotas repetidas de cada nova geração
+      por imigrantes aleatórios antes da avaliação
+    - profile: Medir o tempo de cada fase da geração (self.profiler, ver
+      profiling.PhaseProfiler); o resumo aparece em get_statistics(). Se as
+      funções de avaliação são métodos de um objeto com atributo
+      `profiler` vazio (ex.: optimizer.fitness_function_batch), o profiler
+      é ligado a esse objeto e suas fases (fitness individual, em lote e
+      evaluate_move) entram no mesmo resumo
     """
     
+    CROSSOVER_METHODS = ('order', 'pmx', 'edge')
+    LOCAL_SEARCH_TARGETS = ('elite', 'offspring')
+    
     def __init__(
         self,
         population_size: int = 100,
@@ -75,24 +263,81 @@ class GeneticAlgorithm:
         crossover_rate: float = 0.8,
         elite_size: int = 5,
         tournament_size: int = 5,
-        random_seed: int = None
+        random_seed: int = None,
+        crossover_method: str = 'order',
+        local_search=None,
+        local_search_target: str = 'elite',
+        local_search_rate: float = 1.0,
+        evaluator: Optional[Callable] = None,
+        fitness_cache_size: int = 0,
+        stopping: Optional[StoppingPolicy] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 50,
+        track_diversity: bool = False,
+        diversity_sample_size: int = 200,
+        eliminate_duplicates: bool = False,
+        profile: bool = False
     ):
+        if crossover_method not in self.CROSSOVER_METHODS:
+            raise ValueError(
+                f"crossover_method deve ser um de {self.CROSSOVER_METHODS}, "
+                f"recebido: {crossover_method!r}"
+            )
+        if local_search_target not in self.LOCAL_SEARCH_TARGETS:
+            raise ValueError(
+                f"local_search_target deve ser um de {self.LOCAL_SEARCH_TARGETS}, "
+                f"recebido: {local_search_target!r}"
+            )
+        
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elite_size = elite_size
         self.tournament_size = tournament_size
+        self.crossover_method = crossover_method
+        self.local_search = local_search
+        self.local_search_target = local_search_target
+        self.local_search_rate = local_search_rate
+        self.evaluator = evaluator
+        self.fitness_cache = FitnessCache(fitness_cache_size) if fitness_cache_size > 0 else None
+        self.stopping = stopping
+        self.stop_reason = None
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.track_diversity = track_diversity
+        self.diversity_sample_size = diversity_sample_size
+        self.eliminate_duplicates = eliminate_duplicates
+        self.immigrants_injected = 0
+        self.profiler = PhaseProfiler() if profile else None
         
         # Histórico da evolução
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        self.entropy_history = []
+        self.adjacency_distance_history = []
         self.best_individual = None
         
-        # Configurar seed para reprodutibilidade
-        if random_seed is not None:
-            random.seed(random_seed)
-            np.random.seed(random_seed)
+        # Gerador próprio da instância (nada de estado global): a mesma
+        # semente reproduz a evolução mesmo com outras instâncias em paralelo
+        self.seed_sequence = make_seed_sequence(random_seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+    
+    def spawn_seeds(self, count: int) -> List[np.random.SeedSequence]:
+        """
+        Sementes independentes derivadas da semente desta instância
+        
+        Cada semente gera um fluxo aleatório sem sobreposição com os demais,
+        para processos paralelos (ilhas, grupos, avaliadores) que devem ser
+        reprodutíveis sem compartilhar estado.
+        
+        Args:
+            count: Número de sementes
+            
+        Returns:
+            Lista de SeedSequence (aceitas como random_seed)
+        """
+        return self.seed_sequence.spawn(count)
     
     def create_individual(self, num_points: int, depot: int = 0) -> Individual:
         """
@@ -108,32 +353,92 @@ class GeneticAlgorithm:
         # Criar lista de pontos excluindo o depósito
         points = [i for i in range(num_points) if i != depot]
         # Embaralhar aleatoriamente
-        random.shuffle(points)
+        self.rng.shuffle(points)
         # Adicionar depósito no início e fim
         genes = [depot] + points + [depot]
         
         return Individual(genes=genes)
     
-    def create_population(self, num_points: int, depot: int = 0) -> List[Individual]:
+    def create_population(
+        self,
+        num_points: int,
+        depot: int = 0,
+        initial_routes: Optional[List[List[int]]] = None
+    ) -> List[Individual]:
         """
         Cria a população inicial
         
         Args:
             num_points: Número total de pontos
             depot: Índice do depósito
+            initial_routes: Rotas conhecidas para semear a população
+                (ver create_population_matrix)
             
         Returns:
             Lista de indivíduos
         """
+        if initial_routes:
+            population = self.create_population_matrix(num_points, depot, initial_routes)
+            return [Individual(genes=row.tolist()) for row in population.genes]
+        
         return [
             self.create_individual(num_points, depot)
             for _ in range(self.population_size)
         ]
     
+    def create_population_matrix(
+        self,
+        num_points: int,
+        depot: int = 0,
+        initial_routes: Optional[List[List[int]]] = None
+    ) -> PopulationMatrix:
+        """
+        Cria a população inicial diretamente em uma PopulationMatrix
+        
+        Com `initial_routes` (partida a quente, ex.: melhores rotas de uma
+        otimização anterior ajustadas por RouteOptimizer.repair_route), as
+        rotas informadas entram intactas, metade da população recebe cópias
+        delas com uma inversão aleatória e o restante continua aleatório,
+        para manter a diversidade.
+        
+        Args:
+            num_points: Número total de pontos
+            depot: Índice do depósito
+            initial_routes: Rotas conhecidas para semear a população (opcional)
+            
+        Returns:
+            PopulationMatrix com rotas aleatórias
+        """
+        points = np.array([i for i in range(num_points) if i != depot], dtype=np.int32)
+        population = PopulationMatrix(self.population_size, len(points) + 2)
+        
+        # Uma permutação aleatória por linha
+        order = np.argsort(self.rng.random((self.population_size, len(points))), axis=1)
+        population.genes[:, 0] = depot
+        population.genes[:, 1:-1] = points[order]
+        population.genes[:, -1] = depot
+        
+        if initial_routes:
+            seeds = np.asarray(initial_routes, dtype=np.int32)[:self.population_size]
+            if seeds.ndim != 2 or seeds.shape[1] != population.genome_length:
+                raise ValueError(
+                    f"initial_routes devem ter {population.genome_length} posições "
+                    f"(todos os pontos, com o depósito no início e no fim)"
+                )
+            n_seeds = len(seeds)
+            population.genes[:n_seeds] = seeds
+            
+            variants = np.arange(n_seeds, max(self.population_size // 2, n_seeds))
+            population.genes[variants] = seeds[(variants - n_seeds) % n_seeds]
+            mutation_inversion_batch(population.genes, variants, self.rng)
+        
+        return population
+    
     def evaluate_population(
         self,
         population: List[Individual],
-        fitness_function: Callable
+        fitness_function: Callable,
+        batch_fitness_function: Optional[Callable] = None
     ) -> List[Individual]:
         """
         Avalia todos os indivíduos da população
@@ -141,10 +446,25 @@ class GeneticAlgorithm:
         Args:
             population: Lista de indivíduos
             fitness_function: Função que calcula o fitness
+            batch_fitness_function: Função vetorizada opcional que recebe uma
+                matriz (n, tamanho_rota) e retorna arrays (fitness, distancia,
+                penalidade). Quando fornecida, todos os indivíduos pendentes
+                são avaliados em uma única chamada
             
         Returns:
             População avaliada
         """
+        if batch_fitness_function is not None:
+            pending = [ind for ind in population if ind.fitness == float('inf')]
+            if pending:
+                routes = np.array([ind.genes for ind in pending], dtype=np.int64)
+                fitness, distance, penalty = batch_fitness_function(routes)
+                for i, individual in enumerate(pending):
+                    individual.fitness = float(fitness[i])
+                    individual.distance = float(distance[i])
+                    individual.penalty = float(penalty[i])
+            return population
+        
         for individual in population:
             if individual.fitness == float('inf'):
                 individual.fitness, individual.distance, individual.penalty = \
@@ -171,8 +491,8 @@ class GeneticAlgorithm:
         if k is None:
             k = self.tournament_size
         
-        tournament = random.sample(population, k)
-        return min(tournament, key=lambda ind: ind.fitness)
+        tournament = self.rng.choice(len(population), k, replace=False)
+        return min((population[i] for i in tournament), key=lambda ind: ind.fitness)
     
     def crossover_order(
         self,
@@ -201,7 +521,7 @@ class GeneticAlgorithm:
         genes2 = parent2.genes[1:-1]
         
         # Selecionar dois pontos de corte aleatórios
-        point1, point2 = sorted(random.sample(range(len(genes1)), 2))
+        point1, point2 = sorted(self.rng.choice(len(genes1), 2, replace=False).tolist())
         
         # Criar filhos
         child1_genes = [None] * len(genes1)
@@ -211,17 +531,24 @@ class GeneticAlgorithm:
         child1_genes[point1:point2] = genes1[point1:point2]
         child2_genes[point1:point2] = genes2[point1:point2]
         
-        # Preencher as lacunas com genes do outro pai (mantendo a ordem)
-        def fill_genes(child, parent):
-            pos = point2
+        # Preencher as lacunas com genes do outro pai (mantendo a ordem).
+        # Uma máscara booleana indexada pelo gene evita a busca linear
+        # `gene in child`, tornando o preenchimento O(n)
+        mask_size = max(max(genes1), max(genes2)) + 1
+        
+        free_positions = list(range(point2, len(genes1))) + list(range(point1))
+        
+        def fill_genes(child, parent, segment):
+            placed = [False] * mask_size
+            for gene in segment:
+                placed[gene] = True
+            free = iter(free_positions)
             for gene in parent[point2:] + parent[:point2]:
-                if gene not in child:
-                    while child[pos % len(child)] is not None:
-                        pos += 1
-                    child[pos % len(child)] = gene
+                if not placed[gene]:
+                    child[next(free)] = gene
         
-        fill_genes(child1_genes, genes2)
-        fill_genes(child2_genes, genes1)
+        fill_genes(child1_genes, genes2, genes1[point1:point2])
+        fill_genes(child2_genes, genes1, genes2[point1:point2])
         
         # Adicionar depósito no início e fim
         depot = parent1.genes[0]
@@ -230,59 +557,192 @@ class GeneticAlgorithm:
         
         return child1, child2
     
-    def mutation_swap(self, individual: Individual) -> Individual:
+    def crossover_pmx(
+        self,
+        parent1: Individual,
+        parent2: Individual
+    ) -> Tuple[Individual, Individual]:
+        """
+        Crossover Parcialmente Mapeado (PMX)
+        
+        Args:
+            parent1: Primeiro pai
+            parent2: Segundo pai
+            
+        Returns:
+            Tupla com dois filhos
+        """
+        genes1 = np.asarray(parent1.genes)
+        genes2 = np.asarray(parent2.genes)
+        point1, point2 = sorted(self.rng.choice(len(genes1) - 2, 2, replace=False).tolist())
+        
+        child1 = pmx_crossover(genes1, genes2, point1, point2)
+        child2 = pmx_crossover(genes2, genes1, point1, point2)
+        
+        return Individual(genes=child1.tolist()), Individual(genes=child2.tolist())
+    
+    def crossover_edge(
+        self,
+        parent1: Individual,
+        parent2: Individual
+    ) -> Tuple[Individual, Individual]:
+        """
+        Crossover por Recombinação de Arestas (ERX)
+        Preserva as adjacências (arestas) presentes nos pais
+        
+        Args:
+            parent1: Primeiro pai
+            parent2: Segundo pai
+            
+        Returns:
+            Tupla com dois filhos
+        """
+        genes1 = np.asarray(parent1.genes)
+        genes2 = np.asarray(parent2.genes)
+        
+        child1 = edge_recombination_crossover(genes1, genes2, self.rng)
+        child2 = edge_recombination_crossover(genes2, genes1, self.rng)
+        
+        return Individual(genes=child1.tolist()), Individual(genes=child2.tolist())
+    
+    def crossover(
+        self,
+        parent1: Individual,
+        parent2: Individual
+    ) -> Tuple[Individual, Individual]:
+        """Aplica o operador de cruzamento configurado em crossover_method"""
+        if self.crossover_method == 'pmx':
+            return self.crossover_pmx(parent1, parent2)
+        if self.crossover_method == 'edge':
+            return self.crossover_edge(parent1, parent2)
+        return self.crossover_order(parent1, parent2)
+    
+    def mutation_swap(
+        self,
+        individual: Individual,
+        inplace: bool = False,
+        delta_evaluator: Optional[Callable] = None
+    ) -> Individual:
         """
         Mutação por troca (swap)
         Troca a posição de dois genes aleatórios
         
         Args:
             individual: Indivíduo a ser mutado
+            inplace: Se True, altera o próprio indivíduo em vez de uma cópia
+            delta_evaluator: Avaliador incremental opcional (ver evolve). Se o
+                indivíduo já estiver avaliado, o fitness do mutante é obtido
+                em O(1) em vez de ser resetado
             
         Returns:
             Indivíduo mutado
         """
-        mutated = individual.copy()
+        mutated = individual if inplace else individual.copy()
         
         # Não mutar os depósitos (primeiro e último)
         # Mutar apenas a parte intermediária
         if len(mutated.genes) > 3:
-            idx1, idx2 = random.sample(range(1, len(mutated.genes) - 1), 2)
+            idx1, idx2 = (self.rng.choice(len(mutated.genes) - 2, 2, replace=False) + 1).tolist()
+            self._apply_delta(mutated, delta_evaluator, 'swap', idx1, idx2)
             mutated.genes[idx1], mutated.genes[idx2] = \
                 mutated.genes[idx2], mutated.genes[idx1]
-        
-        # Resetar fitness para forçar reavaliação
-        mutated.fitness = float('inf')
+        else:
+            # Resetar fitness para forçar reavaliação
+            mutated.fitness = float('inf')
         
         return mutated
     
-    def mutation_inversion(self, individual: Individual) -> Individual:
+    def mutation_inversion(
+        self,
+        individual: Individual,
+        inplace: bool = False,
+        delta_evaluator: Optional[Callable] = None
+    ) -> Individual:
         """
         Mutação por inversão
         Inverte a ordem de um segmento da rota
         
         Args:
             individual: Indivíduo a ser mutado
+            inplace: Se True, altera o próprio indivíduo em vez de uma cópia
+            delta_evaluator: Avaliador incremental opcional (ver mutation_swap)
             
         Returns:
             Indivíduo mutado
         """
-        mutated = individual.copy()
+        mutated = individual if inplace else individual.copy()
         
         # Não mutar os depósitos
         if len(mutated.genes) > 3:
-            idx1, idx2 = sorted(random.sample(range(1, len(mutated.genes) - 1), 2))
+            idx1, idx2 = sorted((self.rng.choice(len(mutated.genes) - 2, 2, replace=False) + 1).tolist())
+            self._apply_delta(mutated, delta_evaluator, 'inversion', idx1, idx2)
             mutated.genes[idx1:idx2] = reversed(mutated.genes[idx1:idx2])
-        
-        mutated.fitness = float('inf')
+        else:
+            mutated.fitness = float('inf')
         
         return mutated
     
+    @staticmethod
+    def _apply_delta(
+        individual: Individual,
+        delta_evaluator: Optional[Callable],
+        move: str,
+        idx1: int,
+        idx2: int
+    ):
+        """
+        Atualiza o fitness de um indivíduo para o movimento que será aplicado
+        
+        Deve ser chamado antes de alterar os genes. Sem avaliador incremental,
+        ou se o indivíduo ainda não foi avaliado, o fitness é resetado para
+        forçar a reavaliação completa.
+        """
+        if delta_evaluator is None or individual.fitness == float('inf'):
+            individual.fitness = float('inf')
+            return
+        individual.fitness, individual.distance, individual.penalty = delta_evaluator(
+            individual.genes, move, idx1, idx2, individual.distance, individual.penalty
+        )
+    
+    def improve_individuals(self, individuals: List[Individual]) -> List[Individual]:
+        """
+        Aplica a busca local (modo memético) a indivíduos já avaliados, in-place
+        
+        Args:
+            individuals: Indivíduos a melhorar
+            
+        Returns:
+            Os mesmos indivíduos, com rotas e fitness atualizados
+        """
+        if self.local_search is None:
+            return individuals
+        
+        for individual in individuals:
+            if individual.fitness == float('inf'):
+                continue
+            (individual.genes, individual.fitness,
+             individual.distance, individual.penalty) = self.local_search.improve(
+                individual.genes, individual.fitness, individual.distance, individual.penalty
+            )
+        
+        return individuals
+    
+    def _local_search_offspring(self, offspring: list) -> list:
+        """Sorteia, conforme local_search_rate, os descendentes que passam pela busca local"""
+        if self.local_search is None or self.local_search_target != 'offspring':
+            return []
+        selected = self.rng.random(len(offspring)) < self.local_search_rate
+        return [item for item, keep in zip(offspring, selected) if keep]
+    
     def evolve(
         self,
         num_points: int,
         fitness_function: Callable,
         depot: int = 0,
-        verbose: bool = True
+        verbose: bool = True,
+        batch_fitness_function: Optional[Callable] = None,
+        delta_evaluator: Optional[Callable] = None,
+        initial_routes: Optional[List[List[int]]] = None
     ) -> Individual:
         """
         Executa o algoritmo genético completo
@@ -292,31 +752,77 @@ class GeneticAlgorithm:
             fitness_function: Função de avaliação
             depot: Índice do depósito
             verbose: Se True, mostra barra de progresso
+            batch_fitness_function: Função de avaliação vetorizada opcional
+                (ver evaluate_population)
+            delta_evaluator: Avaliador incremental opcional com assinatura
+                (rota, movimento, i, j, distancia, penalidade) -> (fitness,
+                distancia, penalidade), ex.: RouteOptimizer.evaluate_move.
+                Filhos que diferem do pai apenas por uma mutação são
+                avaliados por ele em tempo constante
+            initial_routes: Rotas para partida a quente (ver
+                create_population_matrix)
             
         Returns:
             Melhor indivíduo encontrado
         """
+        if self.evaluator is not None:
+            batch_fitness_function = self.evaluator
+        self._attach_profiler(fitness_function, batch_fitness_function, delta_evaluator)
+        if self.fitness_cache is not None:
+            fitness_function = self.fitness_cache.wrap(fitness_function)
+            batch_fitness_function = self._cached(batch_fitness_function)
+        
+        self._start_run()
+        
         # Criar população inicial
-        population = self.create_population(num_points, depot)
-        population = self.evaluate_population(population, fitness_function)
+        population = self.create_population(num_points, depot, initial_routes)
+        population = self.evaluate_population(
+            population, fitness_function, batch_fitness_function
+        )
         
+        return self._evolve_individuals(
+            population, 0, fitness_function, batch_fitness_function,
+            delta_evaluator, verbose
+        )
+    
+    def _evolve_individuals(
+        self,
+        population: List[Individual],
+        start_generation: int,
+        fitness_function: Callable,
+        batch_fitness_function: Optional[Callable],
+        delta_evaluator: Optional[Callable],
+        verbose: bool
+    ) -> Individual:
+        """Laço de gerações de evolve, a partir de uma população avaliada"""
+        self._attach_profiler(fitness_function, batch_fitness_function, delta_evaluator)
         # Configurar barra de progresso
-        pbar = tqdm(range(self.generations), disable=not verbose, 
+        pbar = tqdm(range(start_generation, self.generations), disable=not verbose,
                     desc="Evolução do AG")
         
         for generation in pbar:
             # Ordenar população por fitness
-            population.sort()
-            
-            # Guardar estatísticas
-            best_fitness = population[0].fitness
-            avg_fitness = np.mean([ind.fitness for ind in population])
+            with self._phase('sort'):
+                population.sort()
             
-            self.best_fitness_history.append(best_fitness)
-            self.avg_fitness_history.append(avg_fitness)
+            # Modo memético: refinar a elite com busca local
+            if self.local_search is not None and self.local_search_target == 'elite':
+                with self._phase('local_search'):
+                    self.improve_individuals(population[:self.elite_size])
+                    population.sort()
             
-            # Atualizar melhor indivíduo
-            self.best_individual = population[0].copy()
+            # Guardar estatísticas
+            with self._phase('statistics'):
+                best_fitness = population[0].fitness
+                avg_fitness = np.mean([ind.fitness for ind in population])
+                
+                self.best_fitness_history.append(best_fitness)
+                self.avg_fitness_history.append(avg_fitness)
+                if self.track_diversity:
+                    self._record_diversity(np.array([ind.genes for ind in population]))
+                
+                # Atualizar melhor indivíduo
+                self.best_individual = population[0].copy()
             
             # Atualizar barra de progresso
             pbar.set_postfix({
@@ -324,45 +830,79 @@ class GeneticAlgorithm:
                 'Média': f'{avg_fitness:.2f}'
             })
             
+            # Parada antecipada
+            if self._should_stop(lambda: [ind.genes for ind in population]):
+                self._end_generation(generation)
+                break
+            
             # Criar nova população
             new_population = []
             
             # Elitismo: preservar os melhores indivíduos
             new_population.extend([ind.copy() for ind in population[:self.elite_size]])
             
-            # Gerar o restante da população
-            while len(new_population) < self.population_size:
-                # Seleção
-                parent1 = self.selection_tournament(population)
-                parent2 = self.selection_tournament(population)
+            # Gerar o restante da população: torneios, decisões de crossover
+            # e de mutação sorteados de uma vez para todos os pares
+            with self._phase('selection'):
+                n_pairs = (self.population_size - len(new_population) + 1) // 2
+                fitness = np.array([ind.fitness for ind in population])
+                parents = self._tournament_winners(fitness, 2 * n_pairs).reshape(n_pairs, 2)
+                crossed = self.rng.random(n_pairs) < self.crossover_rate
+                mutated = self.rng.random((n_pairs, 2)) < self.mutation_rate
+                use_swap = self.rng.random((n_pairs, 2)) < 0.5
+            
+            for pair in range(n_pairs):
+                parent1, parent2 = population[parents[pair, 0]], population[parents[pair, 1]]
                 
                 # Crossover
-                if random.random() < self.crossover_rate:
-                    child1, child2 = self.crossover_order(parent1, parent2)
-                else:
-                    child1, child2 = parent1.copy(), parent2.copy()
-                
-                # Mutação
-                if random.random() < self.mutation_rate:
-                    # Alternar entre swap e inversion
-                    if random.random() < 0.5:
-                        child1 = self.mutation_swap(child1)
+                with self._phase('crossover'):
+                    if crossed[pair]:
+                        child1, child2 = self.crossover(parent1, parent2)
                     else:
-                        child1 = self.mutation_inversion(child1)
+                        child1, child2 = parent1.copy(), parent2.copy()
                 
-                if random.random() < self.mutation_rate:
-                    if random.random() < 0.5:
-                        child2 = self.mutation_swap(child2)
-                    else:
-                        child2 = self.mutation_inversion(child2)
+                # Mutação (os filhos já são cópias, então muta-se in-place),
+                # alternando entre swap e inversion
+                with self._phase('mutation'):
+                    for child, mutate, swap in zip((child1, child2), mutated[pair], use_swap[pair]):
+                        if not mutate:
+                            continue
+                        if swap:
+                            self.mutation_swap(child, True, delta_evaluator)
+                        else:
+                            self.mutation_inversion(child, True, delta_evaluator)
                 
                 new_population.extend([child1, child2])
             
             # Limitar ao tamanho da população
             population = new_population[:self.population_size]
             
+            # Rotas repetidas viram imigrantes aleatórios (elite mantida)
+            if self.eliminate_duplicates:
+                with self._phase('duplicates'):
+                    genes = np.array([ind.genes for ind in population])
+                    duplicates = np.flatnonzero(duplicate_rows(genes))
+                    for i, route in zip(duplicates, self._immigrants(genes[0], len(duplicates))):
+                        population[i] = Individual(genes=route.tolist())
+                    self.immigrants_injected += len(duplicates)
+            
             # Avaliar novos indivíduos
-            population = self.evaluate_population(population, fitness_function)
+            with self._phase('evaluation'):
+                population = self.evaluate_population(
+                    population, fitness_function, batch_fitness_function
+                )
+            
+            # Modo memético: refinar os descendentes (após a elite)
+            with self._phase('local_search'):
+                self.improve_individuals(
+                    self._local_search_offspring(population[self.elite_size:])
+                )
+            
+            with self._phase('checkpoint'):
+                self._maybe_checkpoint(population, 'individuals')
+            self._end_generation(generation)
+        
+        self._finish_run()
         
         # Retornar o melhor indivíduo final
         population.sort()
@@ -370,6 +910,595 @@ class GeneticAlgorithm:
         
         return self.best_individual
     
+    def _phase(self, name: str):
+        """Contexto de medição de uma fase da geração (nulo sem profile)"""
+        return timed(self.profiler, name)
+    
+    def _attach_profiler(self, *functions: Optional[Callable]):
+        """
+        Liga o profiler ao dono das funções de avaliação (métodos ligados,
+        ex.: RouteOptimizer.fitness_function_batch) que ainda não tem um,
+        para que as fases do otimizador entrem no mesmo resumo
+        """
+        if self.profiler is None:
+            return
+        if self.local_search is not None:
+            functions += (self.local_search.delta_evaluator,)
+        for function in functions:
+            owner = getattr(function, '__self__', None)
+            if owner is not None and getattr(owner, 'profiler', False) is None:
+                owner.profiler = self.profiler
+    
+    def _end_generation(self, generation: int):
+        """Fecha a linha da geração no rastro do profiler"""
+        if self.profiler is not None:
+            self.profiler.end_generation(generation)
+    
+    def _record_diversity(self, genes: np.ndarray):
+        """Registra a entropia de arestas e a distância de adjacência da população"""
+        self.entropy_history.append(edge_entropy(genes))
+        self.adjacency_distance_history.append(
+            adjacency_distance(genes, self.diversity_sample_size, self.rng)
+        )
+    
+    def _immigrants(self, template: np.ndarray, count: int) -> np.ndarray:
+        """Rotas aleatórias com os mesmos pontos e depósito da rota `template`"""
+        points = np.sort(np.asarray(template)[1:-1])
+        routes = np.empty((count, len(template)), dtype=np.int32)
+        routes[:, 0] = routes[:, -1] = template[0]
+        routes[:, 1:-1] = points[np.argsort(self.rng.random((count, len(points))), axis=1)]
+        return routes
+    
+    def _replace_duplicate_rows(self, population: PopulationMatrix):
+        """Substitui linhas repetidas por imigrantes aleatórios (a primeira ocorrência fica)"""
+        duplicates = np.flatnonzero(duplicate_rows(population.genes))
+        if len(duplicates) == 0:
+            return
+        population.genes[duplicates] = self._immigrants(population.genes[0], len(duplicates))
+        population.fitness[duplicates] = np.inf
+        self.immigrants_injected += len(duplicates)
+    
+    def _start_run(self):
+        """
+        Prepara uma nova execução: reinicia o motivo de parada, o relógio da
+        política de parada e o cache de fitness (entre execuções o problema
+        pode mudar: pontos, pesos ou a própria função de fitness)
+        """
+        self.stop_reason = 'generations'
+        if self.stopping is not None:
+            self.stopping.start()
+        if self.fitness_cache is not None:
+            self.fitness_cache.clear()
+    
+    def _finish_run(self):
+        """Congela o tempo de execução reportado em get_statistics()"""
+        if self.stopping is not None:
+            self.stopping.stop()
+    
+    def _should_stop(self, population_genes: Callable) -> bool:
+        """Consulta a política de parada e registra o motivo"""
+        if self.stopping is None:
+            return False
+        reason = self.stopping.check(self.best_fitness_history, population_genes)
+        if reason is not None:
+            self.stop_reason = reason
+            return True
+        return False
+    
+    def _cached(self, batch_fitness_function: Optional[Callable]) -> Optional[Callable]:
+        """Envolve a função vetorizada com o cache de fitness, se habilitado"""
+        if self.fitness_cache is None or batch_fitness_function is None:
+            return batch_fitness_function
+        return self.fitness_cache.wrap_batch(batch_fitness_function)
+    
+    def _tournament_winners(self, fitness: np.ndarray, count: int) -> np.ndarray:
+        """
+        Seleção por torneio vetorizada sobre o vetor de fitness
+        
+        Sorteia todos os competidores como uma matriz (count, tournament_size),
+        sem repetição dentro de cada torneio (como tournament_selection), e
+        resolve os vencedores com argmin em cada linha.
+        
+        Returns:
+            Índices dos `count` vencedores
+        """
+        candidates = random_subsets(self.rng, count, len(fitness), self.tournament_size)
+        return candidates[np.arange(count), np.argmin(fitness[candidates], axis=1)]
+    
+    def _crossover_rows(
+        self,
+        parent1: np.ndarray,
+        parent2: np.ndarray,
+        child1: np.ndarray,
+        child2: np.ndarray,
+        points: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Aplica o crossover configurado entre duas linhas, escrevendo nos filhos
+        
+        `points` são os cortes (início, fim) na parte intermediária da rota,
+        quando já sorteados em lote; sem eles, os cortes são sorteados aqui.
+        """
+        if self.crossover_method == 'edge':
+            edge_recombination_crossover(parent1, parent2, self.rng, out=child1)
+            edge_recombination_crossover(parent2, parent1, self.rng, out=child2)
+            return
+        
+        operator = pmx_crossover if self.crossover_method == 'pmx' else order_crossover
+        if points is None:
+            points = np.sort(self.rng.choice(len(parent1) - 2, 2, replace=False))
+        point1, point2 = points
+        operator(parent1, parent2, point1, point2, out=child1)
+        operator(parent2, parent1, point1, point2, out=child2)
+    
+    def _improve_rows(self, population: PopulationMatrix, rows):
+        """Aplica a busca local às linhas indicadas da população, in-place"""
+        for row in rows:
+            if np.isinf(population.fitness[row]):
+                continue
+            route, fitness, distance, penalty = self.local_search.improve(
+                population.genes[row], population.fitness[row],
+                population.distance[row], population.penalty[row]
+            )
+            population.genes[row] = route
+            population.fitness[row] = fitness
+            population.distance[row] = distance
+            population.penalty[row] = penalty
+    
+    def _mutate_rows(
+        self,
+        population: PopulationMatrix,
+        rows: np.ndarray,
+        delta_evaluator: Optional[Callable] = None
+    ):
+        """
+        Aplica mutação (troca ou inversão, 50% cada) nas linhas indicadas
+        do próximo buffer, de uma só vez
+        
+        Linhas copiadas de um pai já avaliado (sem crossover) têm o fitness
+        atualizado pelo delta_evaluator, quando fornecido; as demais ficam
+        com fitness inf para serem reavaliadas.
+        """
+        if len(rows) == 0:
+            return
+        genes = population.next_genes
+        use_swap = self.rng.random(len(rows)) < 0.5
+        
+        for move, selected, mutation in (
+            ('swap', rows[use_swap], mutation_swap_batch),
+            ('inversion', rows[~use_swap], mutation_inversion_batch)
+        ):
+            if len(selected) == 0:
+                continue
+            idx1, idx2 = random_positions(self.rng, len(selected), population.genome_length)
+            if move == 'inversion':
+                idx1, idx2 = np.minimum(idx1, idx2), np.maximum(idx1, idx2)
+            
+            # Delta calculado sobre a rota antes do movimento
+            evaluated = ~np.isinf(population.next_fitness[selected])
+            if delta_evaluator is not None and evaluated.any():
+                for k in np.flatnonzero(evaluated):
+                    row = selected[k]
+                    (population.next_fitness[row],
+                     population.next_distance[row],
+                     population.next_penalty[row]) = delta_evaluator(
+                        genes[row], move, int(idx1[k]), int(idx2[k]),
+                        population.next_distance[row], population.next_penalty[row]
+                    )
+                population.next_fitness[selected[~evaluated]] = np.inf
+            else:
+                population.next_fitness[selected] = np.inf
+            
+            mutation(genes, selected, positions=(idx1, idx2))
+    
+    def _next_generation(
+        self,
+        population: PopulationMatrix,
+        order: np.ndarray,
+        delta_evaluator: Optional[Callable] = None
+    ):
+        """
+        Gera a próxima geração nos buffers de `population` e troca os buffers
+        
+        Args:
+            population: População atual (avaliada)
+            order: Índices da população ordenados por fitness
+            delta_evaluator: Avaliador incremental opcional (ver evolve)
+        """
+        genes, fitness = population.genes, population.fitness
+        next_genes = population.next_genes
+        inner_size = population.genome_length - 2
+        
+        # Elitismo: copiar os melhores para o início do próximo buffer
+        elite = order[:self.elite_size]
+        n_elite = len(elite)
+        np.take(genes, elite, axis=0, out=next_genes[:n_elite])
+        population.next_fitness[:n_elite] = fitness[elite]
+        population.next_distance[:n_elite] = population.distance[elite]
+        population.next_penalty[:n_elite] = population.penalty[elite]
+        
+        # Seleção: todos os torneios de uma vez, um par de pais por par de filhos
+        with self._phase('selection'):
+            n_pairs = (population.size - n_elite + 1) // 2
+            parents = self._tournament_winners(fitness, 2 * n_pairs).reshape(n_pairs, 2)
+            slots = n_elite + 2 * np.arange(n_pairs)
+            crossed = self.rng.random(n_pairs) < self.crossover_rate
+            if inner_size <= 1:
+                crossed[:] = False
+        
+        with self._phase('crossover'):
+            # Pares sem crossover: cópias dos pais (com a avaliação) em lote
+            copy_slots = np.concatenate((slots[~crossed], slots[~crossed] + 1))
+            copy_parents = np.concatenate((parents[~crossed, 0], parents[~crossed, 1]))
+            inside = copy_slots < population.size
+            copy_slots, copy_parents = copy_slots[inside], copy_parents[inside]
+            next_genes[copy_slots] = genes[copy_parents]
+            population.next_fitness[copy_slots] = fitness[copy_parents]
+            population.next_distance[copy_slots] = population.distance[copy_parents]
+            population.next_penalty[copy_slots] = population.penalty[copy_parents]
+            
+            # Pares com crossover, com os cortes sorteados em lote
+            crossed_pairs = np.flatnonzero(crossed)
+            idx1, idx2 = random_positions(self.rng, len(crossed_pairs), population.genome_length)
+            cuts = np.column_stack((np.minimum(idx1, idx2), np.maximum(idx1, idx2))) - 1
+            for pair, points in zip(crossed_pairs, cuts):
+                i = slots[pair]
+                child2 = next_genes[i + 1] if i + 1 < population.size else population.spare
+                self._crossover_rows(
+                    genes[parents[pair, 0]], genes[parents[pair, 1]], next_genes[i], child2, points
+                )
+            crossed_slots = np.concatenate((slots[crossed], slots[crossed] + 1))
+            population.next_fitness[crossed_slots[crossed_slots < population.size]] = np.inf
+        
+        # Mutação de todos os descendentes de uma vez (elite preservada)
+        if inner_size > 1:
+            with self._phase('mutation'):
+                offspring = np.arange(n_elite, population.size)
+                mutated = offspring[self.rng.random(len(offspring)) < self.mutation_rate]
+                self._mutate_rows(population, mutated, delta_evaluator)
+        
+        population.swap()
+    
+    def evolve_vectorized(
+        self,
+        num_points: int,
+        batch_fitness_function: Optional[Callable],
+        depot: int = 0,
+        verbose: bool = True,
+        delta_evaluator: Optional[Callable] = None,
+        initial_routes: Optional[List[List[int]]] = None
+    ) -> Individual:
+        """
+        Executa o algoritmo genético sobre uma PopulationMatrix
+        
+        Equivalente a evolve, mas com a população em matrizes NumPy
+        pré-alocadas e avaliação vetorizada. Indicado para populações
+        grandes (milhares de rotas).
+        
+        Args:
+            num_points: Número de pontos de entrega
+            batch_fitness_function: Função de avaliação vetorizada
+                (ex.: RouteOptimizer.fitness_function_batch). Pode ser None
+                quando um evaluator foi definido no construtor
+            depot: Índice do depósito
+            verbose: Se True, mostra barra de progresso
+            delta_evaluator: Avaliador incremental opcional (ver evolve)
+            initial_routes: Rotas para partida a quente (ver
+                create_population_matrix)
+            
+        Returns:
+            Melhor indivíduo encontrado
+        """
+        if self.evaluator is not None:
+            batch_fitness_function = self.evaluator
+        if batch_fitness_function is None:
+            raise ValueError("Informe batch_fitness_function ou um evaluator no construtor")
+        self._attach_profiler(batch_fitness_function, delta_evaluator)
+        
+        self._start_run()
+        population = self.create_population_matrix(num_points, depot, initial_routes)
+        population.evaluate(self._cached(batch_fitness_function))
+        
+        return self.run_generations(
+            population, self.generations, batch_fitness_function,
+            delta_evaluator=delta_evaluator, verbose=verbose
+        )
+    
+    def run_generations(
+        self,
+        population: PopulationMatrix,
+        generations: int,
+        batch_fitness_function: Callable,
+        delta_evaluator: Optional[Callable] = None,
+        verbose: bool = False
+    ) -> Individual:
+        """
+        Evolui uma PopulationMatrix já avaliada por um número de gerações
+        
+        A população é alterada in-place, o que permite continuar a evolução
+        em etapas (ex.: entre migrações do modelo de ilhas).
+        
+        Args:
+            population: População avaliada
+            generations: Número de gerações a executar
+            batch_fitness_function: Função de avaliação vetorizada
+            delta_evaluator: Avaliador incremental opcional (ver evolve)
+            verbose: Se True, mostra barra de progresso
+            
+        Returns:
+            Melhor indivíduo da população ao final
+        """
+        pbar = tqdm(total=generations, disable=not verbose,
+                    desc="Evolução do AG")
+        
+        for snapshot in self._generation_steps(
+            population, generations, batch_fitness_function, delta_evaluator
+        ):
+            pbar.update()
+            pbar.set_postfix({
+                'Melhor': f'{snapshot.best_fitness:.2f}',
+                'Média': f'{snapshot.avg_fitness:.2f}'
+            })
+        pbar.close()
+        
+        best = int(np.argmin(population.fitness))
+        self.best_individual = population.to_individual(best)
+        
+        return self.best_individual
+    
+    def evolve_iter(
+        self,
+        num_points: int,
+        batch_fitness_function: Optional[Callable],
+        depot: int = 0,
+        delta_evaluator: Optional[Callable] = None,
+        initial_routes: Optional[List[List[int]]] = None
+    ) -> Iterator[GenerationSnapshot]:
+        """
+        Versão iterável de evolve_vectorized: produz um resumo por geração
+        
+        Permite acompanhar a evolução ao vivo (ex.: enviar melhorias para
+        o painel de despacho), interromper a qualquer momento (basta parar
+        de iterar) ou despachar uma rota boa o suficiente enquanto a
+        otimização continua. Ao final, ou após uma interrupção,
+        best_individual contém a melhor rota encontrada.
+        
+        Uso:
+            for snapshot in ga.evolve_iter(n, optimizer.fitness_function_batch):
+                if snapshot.best_fitness < limite:
+                    break
+        
+        Args:
+            num_points: Número de pontos de entrega
+            batch_fitness_function: Função de avaliação vetorizada (ou None
+                com um evaluator no construtor)
+            depot: Índice do depósito
+            delta_evaluator: Avaliador incremental opcional (ver evolve)
+            initial_routes: Rotas para partida a quente (ver
+                create_population_matrix)
+            
+        Yields:
+            GenerationSnapshot de cada geração
+        """
+        if self.evaluator is not None:
+            batch_fitness_function = self.evaluator
+        if batch_fitness_function is None:
+            raise ValueError("Informe batch_fitness_function ou um evaluator no construtor")
+        self._attach_profiler(batch_fitness_function, delta_evaluator)
+        
+        self._start_run()
+        population = self.create_population_matrix(num_points, depot, initial_routes)
+        population.evaluate(self._cached(batch_fitness_function))
+        
+        yield from self._generation_steps(
+            population, self.generations, batch_fitness_function, delta_evaluator
+        )
+        
+        best = int(np.argmin(population.fitness))
+        self.best_individual = population.to_individual(best)
+    
+    def _generation_steps(
+        self,
+        population: PopulationMatrix,
+        generations: int,
+        batch_fitness_function: Callable,
+        delta_evaluator: Optional[Callable] = None
+    ) -> Iterator[GenerationSnapshot]:
+        """Laço de gerações de run_generations e evolve_iter, um resumo por geração"""
+        self._attach_profiler(batch_fitness_function, delta_evaluator)
+        batch_fitness_function = self._cached(batch_fitness_function)
+        if self.stopping is not None:
+            if self.stopping.start_time is None:
+                self.stopping.start()
+            else:
+                self.stopping.resume()
+        self.stop_reason = 'generations'
+        start_time = time.time()
+        
+        try:
+            for generation in range(generations):
+                with self._phase('sort'):
+                    order = np.argsort(population.fitness, kind='stable')
+                
+                # Modo memético: refinar a elite com busca local
+                if self.local_search is not None and self.local_search_target == 'elite':
+                    with self._phase('local_search'):
+                        self._improve_rows(population, order[:self.elite_size])
+                        order = np.argsort(population.fitness, kind='stable')
+                
+                with self._phase('statistics'):
+                    best_fitness = float(population.fitness[order[0]])
+                    avg_fitness = float(np.mean(population.fitness))
+                    
+                    self.best_fitness_history.append(best_fitness)
+                    self.avg_fitness_history.append(avg_fitness)
+                    if self.track_diversity:
+                        self._record_diversity(population.genes)
+                    self.best_individual = population.to_individual(order[0])
+                
+                try:
+                    yield GenerationSnapshot(
+                        generation=len(self.best_fitness_history) - 1,
+                        best_fitness=best_fitness,
+                        avg_fitness=avg_fitness,
+                        best_genes=population.genes[order[0]],
+                        elapsed_time=time.time() - start_time
+                    )
+                except GeneratorExit:
+                    # O chamador parou de iterar: fechar a linha desta geração
+                    self._end_generation(generation)
+                    raise
+                
+                if self._should_stop(lambda: population.genes):
+                    self._end_generation(generation)
+                    break
+                
+                self._next_generation(population, order, delta_evaluator)
+                if self.eliminate_duplicates:
+                    with self._phase('duplicates'):
+                        self._replace_duplicate_rows(population)
+                with self._phase('evaluation'):
+                    population.evaluate(batch_fitness_function)
+                
+                # Modo memético: refinar os descendentes (após a elite)
+                with self._phase('local_search'):
+                    self._improve_rows(
+                        population,
+                        self._local_search_offspring(range(min(self.elite_size, population.size), population.size))
+                    )
+                
+                with self._phase('checkpoint'):
+                    self._maybe_checkpoint(population, 'matrix')
+                self._end_generation(generation)
+        finally:
+            self._finish_run()
+    
+    def _maybe_checkpoint(self, population, mode: str):
+        """Grava um checkpoint se checkpoint_interval gerações foram concluídas"""
+        completed = len(self.best_fitness_history)
+        if self.checkpoint_path and completed % self.checkpoint_interval == 0:
+            self.save_checkpoint(self.checkpoint_path, population, mode)
+    
+    def save_checkpoint(self, path: str, population, mode: str = 'matrix'):
+        """
+        Grava o estado da evolução ao final de uma geração
+        
+        Args:
+            path: Arquivo de checkpoint (.npz)
+            population: PopulationMatrix ou lista de indivíduos avaliados
+            mode: 'matrix' (evolve_vectorized) ou 'individuals' (evolve)
+        """
+        if not isinstance(population, PopulationMatrix):
+            population = PopulationMatrix.from_individuals(population)
+        
+        best = {}
+        if self.best_individual is not None:
+            best = {
+                'best_genes': np.asarray(self.best_individual.genes, dtype=np.int32),
+                'best_values': np.array([
+                    self.best_individual.fitness,
+                    self.best_individual.distance,
+                    self.best_individual.penalty
+                ])
+            }
+        
+        save_checkpoint(
+            path,
+            mode=np.array(mode),
+            genes=population.genes,
+            fitness=population.fitness,
+            distance=population.distance,
+            penalty=population.penalty,
+            best_fitness_history=np.array(self.best_fitness_history, dtype=np.float64),
+            avg_fitness_history=np.array(self.avg_fitness_history, dtype=np.float64),
+            entropy_history=np.array(self.entropy_history, dtype=np.float64),
+            adjacency_distance_history=np.array(self.adjacency_distance_history, dtype=np.float64),
+            rng_state=np.array(capture_rng_state(self.rng)),
+            immigrants_injected=np.array(self.immigrants_injected),
+            **best
+        )
+    
+    def resume(
+        self,
+        path: str,
+        fitness_function: Optional[Callable] = None,
+        batch_fitness_function: Optional[Callable] = None,
+        delta_evaluator: Optional[Callable] = None,
+        verbose: bool = True
+    ) -> Individual:
+        """
+        Retoma uma evolução a partir de um checkpoint
+        
+        O algoritmo deve ter sido criado com os mesmos parâmetros da execução
+        original; a evolução continua exatamente de onde parou, até
+        completar `generations` gerações.
+        
+        Args:
+            path: Arquivo gravado por save_checkpoint
+            fitness_function: Função de avaliação (checkpoints de evolve)
+            batch_fitness_function: Função de avaliação vetorizada
+            delta_evaluator: Avaliador incremental opcional (ver evolve)
+            verbose: Se True, mostra barra de progresso
+            
+        Returns:
+            Melhor indivíduo encontrado
+        """
+        state = load_checkpoint(path)
+        
+        population = PopulationMatrix(*state['genes'].shape)
+        population.genes[:] = state['genes']
+        population.fitness[:] = state['fitness']
+        population.distance[:] = state['distance']
+        population.penalty[:] = state['penalty']
+        
+        self.best_fitness_history = state['best_fitness_history'].tolist()
+        self.avg_fitness_history = state['avg_fitness_history'].tolist()
+        self.entropy_history = state['entropy_history'].tolist()
+        self.adjacency_distance_history = state['adjacency_distance_history'].tolist()
+        self.immigrants_injected = int(state['immigrants_injected'])
+        self.best_individual = None
+        if 'best_genes' in state:
+            fitness, distance, penalty = state['best_values'].tolist()
+            self.best_individual = Individual(
+                genes=state['best_genes'].tolist(),
+                fitness=fitness, distance=distance, penalty=penalty
+            )
+        restore_rng_state(self.rng, str(state['rng_state']))
+        
+        completed = len(self.best_fitness_history)
+        if self.evaluator is not None:
+            batch_fitness_function = self.evaluator
+        self._start_run()
+        
+        if str(state['mode']) == 'individuals':
+            if fitness_function is None and batch_fitness_function is None:
+                raise ValueError("Informe fitness_function ou batch_fitness_function")
+            if self.fitness_cache is not None and fitness_function is not None:
+                fitness_function = self.fitness_cache.wrap(fitness_function)
+            individuals = [population.to_individual(i) for i in range(population.size)]
+            return self._evolve_individuals(
+                individuals, completed, fitness_function,
+                self._cached(batch_fitness_function), delta_evaluator, verbose
+            )
+        
+        if batch_fitness_function is None:
+            raise ValueError("Informe batch_fitness_function ou um evaluator no construtor")
+        return self.run_generations(
+            population, max(self.generations - completed, 0), batch_fitness_function,
+            delta_evaluator=delta_evaluator, verbose=verbose
+        )
+    
+    def save_profile(self, path: str):
+        """
+        Grava o rastro de tempo por geração e fase em CSV
+        
+        Args:
+            path: Arquivo CSV de saída
+        """
+        if self.profiler is None:
+            raise ValueError("Profiling desativado: crie o algoritmo com profile=True")
+        self.profiler.to_csv(path)
+    
     def get_statistics(self) -> dict:
         """
         Retorna estatísticas da evolução
@@ -384,5 +1513,15 @@ class GeneticAlgorithm:
             'improvement_percentage': ((self.best_fitness_history[0] - self.best_fitness_history[-1]) / 
                                       self.best_fitness_history[0] * 100) if self.best_fitness_history else 0,
             'generations': len(self.best_fitness_history),
-            'best_individual': self.best_individual
+            'best_individual': self.best_individual,
+            'fitness_cache_hits': self.fitness_cache.hits if self.fitness_cache else 0,
+            'fitness_cache_misses': self.fitness_cache.misses if self.fitness_cache else 0,
+            'stop_reason': self.stop_reason,
+            'elapsed_time': self.stopping.elapsed() if self.stopping else None,
+            'edge_entropy_final': self.entropy_history[-1] if self.entropy_history else None,
+            'adjacency_distance_final': (
+                self.adjacency_distance_history[-1] if self.adjacency_distance_history else None
+            ),
+            'immigrants_injected': self.immigrants_injected,
+            'profile': self.profiler.summary() if self.profiler else None
         }
@@ -0,0 +1,245 @@
+"""
+Modelo de Ilhas para o Algoritmo Genetico
+
+Este modulo implementa um AG distribuido:
+- N subpopulacoes (ilhas) evoluem de forma independente, cada uma em seu
+  proprio processo
+- A cada `migration_interval` geracoes, cada ilha envia copias dos seus
+  melhores individuos para outra ilha (topologia em anel ou aleatoria)
+- Os migrantes recebidos substituem os piores individuos da ilha destino
+- Um limite de tempo opcional encerra todas as ilhas ao final da epoca
+  em andamento
+
+A migracao e assincrona: cada ilha consome os migrantes que ja chegaram,
+sem esperar pelas demais, o que evita bloqueios entre processos.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+from typing import Dict, List, Optional
+
+try:
+    from .genetic_algorithm import GeneticAlgorithm, Individual
+    from .local_search import LocalSearch
+    from .operators import make_seed_sequence
+except ImportError:
+    from genetic_algorithm import GeneticAlgorithm, Individual
+    from local_search import LocalSearch
+    from operators import make_seed_sequence
+
+
+def _island_worker(
+    island_id: int,
+    optimizer,
+    settings: Dict,
+    ga_params: Dict,
+    seed: np.random.SeedSequence,
+    inboxes: List,
+    results
+):
+    """Evolui uma ilha, trocando migrantes com as vizinhas a cada epoca"""
+    vehicle_id = settings['vehicle_id']
+    batch_fitness_function = lambda routes: optimizer.fitness_function_batch(routes, vehicle_id)
+    delta_evaluator = lambda *move: optimizer.evaluate_move(*move, vehicle_id=vehicle_id)
+
+    local_search = None
+    if settings['local_search_neighbors']:
+        local_search = LocalSearch(
+            optimizer.distance_matrix, delta_evaluator,
+            neighbors=settings['local_search_neighbors'], optimizer=optimizer
+        )
+
+    ga = GeneticAlgorithm(random_seed=seed, local_search=local_search, **ga_params)
+    population = ga.create_population_matrix(optimizer.num_points, optimizer.depot_id)
+    population.evaluate(batch_fitness_function)
+
+    n_islands = settings['n_islands']
+    generations_done, migrants_received = 0, 0
+
+    while generations_done < settings['generations']:
+        if settings['deadline'] is not None and time.time() >= settings['deadline']:
+            break
+
+        epoch = min(settings['migration_interval'], settings['generations'] - generations_done)
+        history_length = len(ga.best_fitness_history)
+        ga.run_generations(population, epoch, batch_fitness_function, delta_evaluator)
+        generations_done += len(ga.best_fitness_history) - history_length
+
+        # Parada antecipada da ilha (ga_params['stopping'])
+        if ga.stop_reason != 'generations':
+            break
+
+        if n_islands > 1:
+            # Enviar copias dos melhores individuos
+            if settings['topology'] == 'ring':
+                target = (island_id + 1) % n_islands
+            else:
+                target = (island_id + 1 + ga.rng.integers(n_islands - 1)) % n_islands
+            best = population.best_rows(settings['migration_size'])
+            inboxes[target].put((
+                population.genes[best].copy(), population.fitness[best].copy(),
+                population.distance[best].copy(), population.penalty[best].copy()
+            ))
+
+            # Receber os migrantes que ja chegaram
+            while True:
+                try:
+                    migrants = inboxes[island_id].get_nowait()
+                except queue.Empty:
+                    break
+                population.replace_worst(*migrants)
+                migrants_received += len(migrants[0])
+
+    # Migrantes ainda nao consumidos podem ser descartados: o processo nao
+    # deve esperar que as outras ilhas leiam suas filas para encerrar
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+
+    best = int(np.argmin(population.fitness))
+    results.put({
+        'island': island_id,
+        'genes': population.genes[best].tolist(),
+        'fitness': float(population.fitness[best]),
+        'distance': float(population.distance[best]),
+        'penalty': float(population.penalty[best]),
+        'generations': generations_done,
+        'migrants_received': migrants_received,
+        'stop_reason': ga.stop_reason,
+        'best_fitness_history': ga.best_fitness_history
+    })
+
+
+class IslandModel:
+    """
+    AG em modelo de ilhas com migracao entre processos
+
+    Parametros principais:
+    - n_islands: Numero de ilhas (processos)
+    - topology: 'ring' (cada ilha envia para a seguinte) ou 'random'
+    - migration_interval: Geracoes entre migracoes
+    - migration_size: Individuos enviados em cada migracao
+    - generations: Geracoes por ilha
+    - time_limit: Tempo maximo de execucao em segundos (opcional)
+    - ga_params: Parametros repassados a cada GeneticAlgorithm
+      (population_size, mutation_rate, crossover_method, ...)
+    """
+
+    TOPOLOGIES = ('ring', 'random')
+
+    def __init__(
+        self,
+        optimizer,
+        n_islands: int = 4,
+        topology: str = 'ring',
+        migration_interval: int = 20,
+        migration_size: int = 2,
+        generations: int = 300,
+        time_limit: Optional[float] = None,
+        vehicle_id: int = 0,
+        random_seed: Optional[int] = None,
+        local_search_neighbors: Optional[int] = None,
+        **ga_params
+    ):
+        """
+        Args:
+            optimizer: RouteOptimizer com os dados do problema
+            local_search_neighbors: Se informado, cada ilha usa busca local
+                (modo memetico) com esse numero de vizinhos candidatos
+        """
+        if topology not in self.TOPOLOGIES:
+            raise ValueError(
+                f"topology deve ser um de {self.TOPOLOGIES}, recebido: {topology!r}"
+            )
+
+        self.optimizer = optimizer
+        self.n_islands = n_islands
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.generations = generations
+        self.time_limit = time_limit
+        self.vehicle_id = vehicle_id
+        self.random_seed = random_seed
+        self.local_search_neighbors = local_search_neighbors
+        self.ga_params = ga_params
+
+        self.island_results = []
+        self.best_individual = None
+        self.elapsed_time = 0.0
+
+    def run(self) -> Individual:
+        """
+        Executa todas as ilhas em paralelo
+
+        Returns:
+            Melhor individuo encontrado entre todas as ilhas
+        """
+        start = time.time()
+        settings = {
+            'vehicle_id': self.vehicle_id,
+            'n_islands': self.n_islands,
+            'topology': self.topology,
+            'migration_interval': self.migration_interval,
+            'migration_size': self.migration_size,
+            'generations': self.generations,
+            'deadline': start + self.time_limit if self.time_limit else None,
+            'local_search_neighbors': self.local_search_neighbors
+        }
+
+        inboxes = [mp.Queue() for _ in range(self.n_islands)]
+        results = mp.Queue()
+        processes = []
+        # Um fluxo aleatorio independente por ilha, derivado da semente
+        seeds = make_seed_sequence(self.random_seed).spawn(self.n_islands)
+        for island_id, seed in enumerate(seeds):
+            process = mp.Process(
+                target=_island_worker,
+                args=(island_id, self.optimizer, settings, self.ga_params,
+                      seed, inboxes, results)
+            )
+            process.start()
+            processes.append(process)
+
+        # Coletar os resultados antes do join (evita bloqueio da fila)
+        self.island_results = sorted(
+            (results.get() for _ in processes),
+            key=lambda result: result['island']
+        )
+        for process in processes:
+            process.join()
+
+        best = min(self.island_results, key=lambda result: result['fitness'])
+        self.best_individual = Individual(
+            genes=best['genes'],
+            fitness=best['fitness'],
+            distance=best['distance'],
+            penalty=best['penalty']
+        )
+        self.elapsed_time = time.time() - start
+
+        return self.best_individual
+
+    def get_statistics(self) -> dict:
+        """
+        Retorna estatisticas da execucao
+
+        Returns:
+            Dicionario com estatisticas gerais e por ilha
+        """
+        return {
+            'best_fitness_final': self.best_individual.fitness if self.best_individual else None,
+            'best_individual': self.best_individual,
+            'elapsed_time': self.elapsed_time,
+            'islands': [
+                {
+                    'island': result['island'],
+                    'best_fitness': result['fitness'],
+                    'generations': result['generations'],
+                    'migrants_received': result['migrants_received'],
+                    'stop_reason': result['stop_reason']
+                }
+                for result in self.island_results
+            ]
+        }
@@ -0,0 +1,287 @@
+"""
+Busca Local para o Algoritmo Genetico (modo memetico)
+
+Este modulo implementa:
+- Listas de vizinhos candidatos (k vizinhos mais proximos) a partir da
+  matriz de distancias
+- Busca local 2-opt e Or-opt com "don't-look bits"
+
+Os movimentos candidatos sao filtrados pelo ganho de distancia (barato) e
+aceitos apenas se o fitness completo da rota melhorar. O fitness e obtido
+incrementalmente com um avaliador de movimentos (ex.:
+RouteOptimizer.evaluate_move), de modo que prioridades e restricoes tambem
+sejam respeitadas.
+"""
+
+import numpy as np
+from collections import deque
+from typing import Callable, List, Tuple
+
+
+def build_neighbor_lists(distance_matrix: np.ndarray, k: int = 10) -> np.ndarray:
+    """
+    Calcula os k vizinhos mais proximos de cada ponto
+
+    Args:
+        distance_matrix: Matriz NxN de distancias
+        k: Numero de vizinhos por ponto
+
+    Returns:
+        Matriz (N, k) com os IDs dos vizinhos, do mais proximo ao mais distante
+    """
+    # Armazenamento esparso (SparseDistanceMatrix): vizinhos ja calculados,
+    # limitados aos k armazenados
+    if hasattr(distance_matrix, 'neighbors'):
+        return np.asarray(distance_matrix.neighbors[:, :k], dtype=np.int64)
+
+    distances = np.array(distance_matrix, dtype=np.float64, copy=True)
+    n = len(distances)
+    k = min(k, n - 1)
+    np.fill_diagonal(distances, np.inf)
+
+    nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1)
+
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+class LocalSearch:
+    """
+    Busca local 2-opt / Or-opt com listas de vizinhos e don't-look bits
+
+    Parametros principais:
+    - distance_matrix: Matriz de distancias usada para gerar candidatos
+    - delta_evaluator: Avaliador incremental (rota, movimento, i, j,
+      distancia, penalidade) -> (fitness, distancia, penalidade)
+    - neighbors: Numero de vizinhos candidatos por ponto
+    - max_segment: Tamanho maximo do segmento movido pelo Or-opt
+    - cache_size: Quantidade de otimos locais lembrados; rotas ja conhecidas
+      como otimos locais (ex.: a elite repetida a cada geracao) sao
+      devolvidas sem nova busca
+    - optimizer: RouteOptimizer cujos dados a busca acompanha (padrao: o
+      dono de delta_evaluator, se for um metodo como
+      optimizer.evaluate_move). Quando optimizer.data_version muda
+      (pontos, distancias ou pesos), o cache de otimos locais e
+      descartado e a matriz e as listas de vizinhos sao refeitas
+    """
+
+    def __init__(
+        self,
+        distance_matrix: np.ndarray,
+        delta_evaluator: Callable,
+        neighbors: int = 10,
+        use_2opt: bool = True,
+        use_or_opt: bool = True,
+        max_segment: int = 3,
+        tolerance: float = 1e-9,
+        cache_size: int = 1024,
+        optimizer=None
+    ):
+        self.distance_matrix = distance_matrix
+        self.delta_evaluator = delta_evaluator
+        self.neighbors = neighbors
+        self.neighbor_lists = build_neighbor_lists(distance_matrix, neighbors).tolist()
+        self.use_2opt = use_2opt
+        self.use_or_opt = use_or_opt
+        self.max_segment = max_segment
+        self.tolerance = tolerance
+        self.cache_size = cache_size
+        self._local_optima = set()
+
+        if optimizer is None:
+            optimizer = getattr(delta_evaluator, '__self__', None)
+        self._optimizer = optimizer
+        self._data_version = getattr(self._optimizer, 'data_version', None)
+
+    def _sync_with_optimizer(self):
+        """Descarta o cache e refaz os vizinhos se os dados do otimizador mudaram"""
+        version = getattr(self._optimizer, 'data_version', None)
+        if version == self._data_version:
+            return
+        self._data_version = version
+        self._local_optima.clear()
+        if self._optimizer.distance_matrix is not self.distance_matrix:
+            self.distance_matrix = self._optimizer.distance_matrix
+            self.neighbor_lists = build_neighbor_lists(self.distance_matrix, self.neighbors).tolist()
+
+    def improve(
+        self,
+        route: List[int],
+        fitness: float,
+        distance: float,
+        penalty: float
+    ) -> Tuple[List[int], float, float, float]:
+        """
+        Aplica 2-opt e Or-opt ate nao haver movimento que melhore o fitness
+
+        Args:
+            route: Rota avaliada (deposito no inicio e no fim)
+            fitness: Fitness atual da rota
+            distance: Distancia atual da rota
+            penalty: Penalidade atual da rota
+
+        Returns:
+            (rota, fitness, distancia, penalidade) apos a busca local
+        """
+        self._sync_with_optimizer()
+        self._route = [int(g) for g in route]
+        if tuple(self._route) in self._local_optima:
+            return self._route, fitness, distance, penalty
+
+        self._state = (fitness, distance, penalty)
+        self._depot = self._route[0]
+        self._position = {city: i for i, city in enumerate(self._route[:-1])}
+
+        # Don't-look bits: apenas cidades na fila sao examinadas
+        queue = deque(self._route[:-1])
+        active = set(queue)
+
+        while queue:
+            city = queue.popleft()
+            active.discard(city)
+
+            changed = None
+            if self.use_2opt:
+                changed = self._try_2opt(city)
+            if changed is None and self.use_or_opt:
+                changed = self._try_or_opt(city)
+
+            if changed is not None:
+                # Reativar as cidades nas extremidades do trecho alterado
+                start, end = changed
+                for index in (start - 1, start, end - 1, end):
+                    neighbor = self._route[index % (len(self._route) - 1)]
+                    if neighbor not in active:
+                        active.add(neighbor)
+                        queue.append(neighbor)
+                if city not in active:
+                    active.add(city)
+                    queue.append(city)
+
+        if len(self._local_optima) >= self.cache_size:
+            self._local_optima.clear()
+        self._local_optima.add(tuple(self._route))
+
+        fitness, distance, penalty = self._state
+        return self._route, fitness, distance, penalty
+
+    # ------------------------------------------------------------------
+    # Movimentos
+    # ------------------------------------------------------------------
+
+    def _try_2opt(self, city: int):
+        """Procura um 2-opt envolvendo uma aresta de `city`; retorna o trecho alterado"""
+        route, d = self._route, self.distance_matrix
+        last = len(route) - 1
+        i = self._position[city]
+
+        for neighbor in self.neighbor_lists[city]:
+            j = self._position.get(neighbor)
+            # Ignorar o deposito e pontos que nao fazem parte desta rota
+            if neighbor == self._depot or j is None:
+                continue
+
+            # Arestas de saida: (city, sucessor) e (vizinho, sucessor)
+            if i < last and j < last and i != j:
+                a, b = route[i], route[i + 1]
+                c, e = route[j], route[j + 1]
+                gain = d[a, b] + d[c, e] - d[a, c] - d[b, e]
+                if gain > self.tolerance:
+                    start, end = (i + 1, j + 1) if i < j else (j + 1, i + 1)
+                    if self._accept_inversion(start, end):
+                        return start, end
+
+            # Arestas de entrada: (antecessor, city) e (antecessor, vizinho)
+            i_in = last if city == self._depot else i
+            if i_in > 0 and j > 0 and i_in != j:
+                a, b = route[i_in], route[i_in - 1]
+                c, e = route[j], route[j - 1]
+                gain = d[b, a] + d[e, c] - d[a, c] - d[b, e]
+                if gain > self.tolerance:
+                    start, end = (i_in, j) if i_in < j else (j, i_in)
+                    if self._accept_inversion(start, end):
+                        return start, end
+
+        return None
+
+    def _try_or_opt(self, city: int):
+        """Move um segmento iniciado em `city` para depois de um vizinho"""
+        if city == self._depot:
+            return None
+
+        route, d = self._route, self.distance_matrix
+        last = len(route) - 1
+        i = self._position[city]
+
+        for length in range(1, self.max_segment + 1):
+            if i + length > last:
+                break
+            first, tail = route[i], route[i + length - 1]
+            before, after = route[i - 1], route[i + length]
+            removal_gain = d[before, first] + d[tail, after] - d[before, after]
+
+            for neighbor in self.neighbor_lists[city]:
+                j = self._position.get(neighbor)
+                if j is None or i - 1 <= j < i + length:
+                    continue
+                target_next = route[j + 1]
+                insertion_cost = d[neighbor, first] + d[tail, target_next] - d[neighbor, target_next]
+                if removal_gain - insertion_cost <= self.tolerance:
+                    continue
+
+                # Segmento [i, i+length) passa para logo depois da posicao j
+                if j < i:
+                    blocks = (j + 1, i, i + length)
+                else:
+                    blocks = (i, i + length, j + 1)
+                if self._accept_exchange(*blocks):
+                    return blocks[0], blocks[2]
+
+        return None
+
+    # ------------------------------------------------------------------
+    # Avaliacao e aplicacao
+    # ------------------------------------------------------------------
+
+    def _invert(self, start: int, end: int):
+        """Inverte route[start:end] e atualiza as posicoes"""
+        route = self._route
+        route[start:end] = route[start:end][::-1]
+        for index in range(start, end):
+            self._position[route[index]] = index
+
+    def _evaluate_inversion(self, start: int, end: int, state):
+        """Fitness apos inverter route[start:end], a partir do estado informado"""
+        fitness, distance, penalty = state
+        return self.delta_evaluator(self._route, 'inversion', start, end, distance, penalty)
+
+    def _accept_inversion(self, start: int, end: int) -> bool:
+        """Aplica a inversao se ela melhorar o fitness"""
+        candidate = self._evaluate_inversion(start, end, self._state)
+        if candidate[0] < self._state[0] - self.tolerance:
+            self._invert(start, end)
+            self._state = candidate
+            return True
+        return False
+
+    def _accept_exchange(self, start: int, middle: int, end: int) -> bool:
+        """
+        Troca os blocos [start, middle) e [middle, end) se isso melhorar o fitness
+
+        A troca de blocos equivale a tres inversoes (dos dois blocos e do
+        trecho inteiro), o que permite reutilizar o avaliador incremental.
+        """
+        state = self._state
+        steps = ((start, middle), (middle, end), (start, end))
+        for step_start, step_end in steps:
+            state = self._evaluate_inversion(step_start, step_end, state)
+            self._invert(step_start, step_end)
+
+        if state[0] < self._state[0] - self.tolerance:
+            self._state = state
+            return True
+
+        # Desfazer (cada inversao e sua propria inversa)
+        for step_start, step_end in reversed(steps):
+            self._invert(step_start, step_end)
+        return False
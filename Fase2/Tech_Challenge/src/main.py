@@ -12,7 +12,9 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from genetic_algorithm import GeneticAlgorithm
+from local_search import LocalSearch
 from routing import RouteOptimizer, create_sample_data
+from stopping import StoppingPolicy
 from visualization import RouteVisualizer
 from llm_integration import LLMReportGenerator
 
@@ -36,12 +38,18 @@ def main():
     
     # 2. Inicializar otimizador
     print("Inicializando otimizador de rotas...")
-    optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+    optimizer = RouteOptimizer(
+        delivery_points, vehicles, depot_id=0,
+        distance_cache_dir=str(Path(__file__).parent.parent / "results" / "cache")
+    )
     print("   - Matriz de distancias calculada")
     print()
     
-    # 3. Configurar Algoritmo Genetico
+    # 3. Configurar Algoritmo Genetico (modo memetico: busca local na elite)
     print("Configurando Algoritmo Genetico...")
+    delta_evaluator = lambda *move: optimizer.evaluate_move(*move, vehicle_id=0)
+    local_search = LocalSearch(optimizer.distance_matrix, delta_evaluator, neighbors=10,
+                               optimizer=optimizer)
     ga = GeneticAlgorithm(
         population_size=100,
         generations=300,
@@ -49,7 +57,13 @@ def main():
         crossover_rate=0.8,
         elite_size=5,
         tournament_size=5,
-        random_seed=42
+        random_seed=42,
+        local_search=local_search,
+        local_search_target='elite',
+        fitness_cache_size=5000,
+        stopping=StoppingPolicy(time_limit=60, stagnation_generations=100),
+        track_diversity=True,
+        eliminate_duplicates=True
     )
     print("   - Parametros configurados")
     print()
@@ -59,15 +73,18 @@ def main():
     print("   Aguarde enquanto o algoritmo genetico evolui...")
     print()
     
-    # Criar funcao fitness parcial
+    # Criar funcao fitness parcial (individual e vetorizada)
     fitness_func = lambda route: optimizer.fitness_function(route, vehicle_id=0)
+    batch_fitness_func = lambda routes: optimizer.fitness_function_batch(routes, vehicle_id=0)
     
     # Evoluir
     best_solution = ga.evolve(
         num_points=len(delivery_points),
         fitness_function=fitness_func,
         depot=0,
-        verbose=True
+        verbose=True,
+        batch_fitness_function=batch_fitness_func,
+        delta_evaluator=delta_evaluator
     )
     
     print()
@@ -93,6 +110,11 @@ def main():
     print(f"  - Melhoria: {stats['improvement_percentage']:.1f}%")
     print(f"  - Fitness inicial: {stats['best_fitness_initial']:.2f}")
     print(f"  - Fitness final: {stats['best_fitness_final']:.2f}")
+    print(f"  - Geracoes: {stats['generations']} (parada: {stats['stop_reason']})")
+    print(f"  - Cache de fitness: {stats['fitness_cache_hits']} acertos, "
+          f"{stats['fitness_cache_misses']} avaliacoes")
+    print(f"  - Diversidade final: entropia de arestas {stats['edge_entropy_final']:.2f}, "
+          f"{stats['immigrants_injected']} imigrantes")
     print()
     
     # 6. Dividir em multiplas rotas se necessario
@@ -100,13 +122,14 @@ def main():
     
     if route_info['capacity_usage_percent'] > 100 or route_info['autonomy_usage_percent'] > 100:
         print("   ! Rota unica excede limites. Dividindo em multiplas rotas...")
-        sub_routes = optimizer.split_route_for_multiple_vehicles(best_solution.genes)
+        trips, _, _ = optimizer.split_giant_tour(best_solution.genes)
+        sub_routes = [route for _, route in trips]
         print(f"   - Dividido em {len(sub_routes)} rotas")
         
-        # Obter informacoes de cada sub-rota
+        # Obter informacoes de cada sub-rota (com o veiculo escolhido pelo split)
         route_infos = [
-            optimizer.get_route_info(route, vehicle_id=i % len(vehicles))
-            for i, route in enumerate(sub_routes)
+            optimizer.get_route_info(route, vehicle_id=vehicle_id)
+            for vehicle_id, route in trips
         ]
         routes_to_visualize = sub_routes
     else:
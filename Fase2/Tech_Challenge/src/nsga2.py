@@ -0,0 +1,375 @@
+"""
+Otimizacao Multiobjetivo (NSGA-II)
+
+Este modulo implementa o NSGA-II para rotas, sem agregar os criterios
+em um unico fitness ponderado:
+- Cada rota e avaliada por um vetor de objetivos (distancia, score de
+  prioridade e, com janelas de tempo, atraso) e por uma violacao de
+  restricoes (ver RouteOptimizer.objectives_batch)
+- Ordenacao por nao-dominancia com a matriz de dominancia calculada de
+  uma so vez por broadcasting; restricoes tratadas pela dominancia
+  restrita (rotas viaveis dominam as inviaveis)
+- Distancia de aglomeracao (crowding distance) vetorizada por frente
+- Selecao por torneio com comparacao (rank, -aglomeracao)
+
+Uma execucao devolve a frente de Pareto inteira; a escolha de um
+compromisso (ex.: pesos definidos pelo despacho) e feita depois, com
+pick_solution, sem reotimizar.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from tqdm import tqdm
+from typing import Callable, List, Optional, Sequence, Tuple
+
+try:
+    from .operators import (
+        order_crossover, pmx_crossover, edge_recombination_crossover,
+        mutation_swap_batch, mutation_inversion_batch, random_positions,
+        random_subsets, make_seed_sequence
+    )
+except ImportError:
+    from operators import (
+        order_crossover, pmx_crossover, edge_recombination_crossover,
+        mutation_swap_batch, mutation_inversion_batch, random_positions,
+        random_subsets, make_seed_sequence
+    )
+
+
+@dataclass
+class ParetoSolution:
+    """
+    Rota nao dominada da frente de Pareto
+
+    Attributes:
+        genes: Rota (deposito no inicio e no fim)
+        objectives: Valor de cada objetivo (menor e melhor)
+        violation: Violacao de restricoes (0 = viavel)
+    """
+    genes: List[int]
+    objectives: np.ndarray
+    violation: float = 0.0
+
+
+def dominance_matrix(objectives: np.ndarray, violation: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Matriz booleana D com D[i, j] = True se a rota i domina a rota j
+
+    Com `violation`, usa a dominancia restrita: domina a rota de menor
+    violacao (uma rota viavel domina qualquer inviavel) e, com violacoes
+    iguais (ex.: ambas viaveis), vale a dominancia de Pareto.
+
+    Args:
+        objectives: Matriz (n, m) de objetivos (menor e melhor)
+        violation: Violacao de restricoes de cada rota (opcional)
+
+    Returns:
+        Matriz (n, n) de dominancia
+    """
+    left = objectives[:, None, :]
+    right = objectives[None, :, :]
+    dominates = (left <= right).all(axis=2) & (left < right).any(axis=2)
+
+    if violation is None:
+        return dominates
+
+    same_violation = np.isclose(violation[:, None], violation[None, :], rtol=1e-9, atol=1e-12)
+    less_violation = violation[:, None] < violation[None, :]
+    return np.where(same_violation, dominates, less_violation)
+
+
+def non_dominated_sort(objectives: np.ndarray, violation: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rank de nao-dominancia de cada rota (0 = frente de Pareto)
+
+    A cada passo, as rotas sem dominadores restantes formam a proxima
+    frente; a contagem de dominadores e atualizada somando as linhas da
+    matriz de dominancia da frente retirada.
+
+    Args:
+        objectives: Matriz (n, m) de objetivos
+        violation: Violacao de restricoes de cada rota (opcional)
+
+    Returns:
+        Array de ranks (int)
+    """
+    dominates = dominance_matrix(objectives, violation)
+    dominated_by = dominates.sum(axis=0)
+    ranks = np.full(len(objectives), -1)
+
+    rank = 0
+    remaining = np.ones(len(objectives), dtype=bool)
+    while remaining.any():
+        front = remaining & (dominated_by == 0)
+        ranks[front] = rank
+        remaining &= ~front
+        dominated_by -= dominates[front].sum(axis=0)
+        rank += 1
+
+    return ranks
+
+
+def crowding_distance(objectives: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    Distancia de aglomeracao de cada rota dentro da sua frente
+
+    Para cada objetivo, soma a diferenca normalizada entre os vizinhos
+    imediatos na ordenacao da frente; os extremos recebem infinito.
+
+    Args:
+        objectives: Matriz (n, m) de objetivos
+        ranks: Rank de nao-dominancia de cada rota
+
+    Returns:
+        Array de distancias (maior = regiao menos povoada)
+    """
+    crowding = np.zeros(len(objectives))
+
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        values = objectives[members]
+        if len(members) <= 2:
+            crowding[members] = np.inf
+            continue
+
+        order = np.argsort(values, axis=0, kind='stable')
+        sorted_values = np.take_along_axis(values, order, axis=0)
+        span = sorted_values[-1] - sorted_values[0]
+        span[span == 0] = 1.0
+
+        gaps = np.zeros_like(values)
+        gaps[1:-1] = (sorted_values[2:] - sorted_values[:-2]) / span
+        gaps[[0, -1]] = np.inf
+
+        # Devolver cada coluna a ordem original da frente e somar
+        contribution = np.empty_like(gaps)
+        np.put_along_axis(contribution, order, gaps, axis=0)
+        crowding[members] = contribution.sum(axis=1)
+
+    return crowding
+
+
+def pick_solution(
+    front: List[ParetoSolution],
+    preference: Sequence[float]
+) -> ParetoSolution:
+    """
+    Escolhe um compromisso da frente de Pareto
+
+    Os objetivos sao normalizados para [0, 1] na propria frente e
+    combinados com os pesos de `preference`; rotas viaveis tem prioridade.
+
+    Args:
+        front: Frente retornada por NSGA2.evolve
+        preference: Peso de cada objetivo (ex.: [1, 0] = so distancia)
+
+    Returns:
+        Solucao com a menor soma ponderada
+    """
+    objectives = np.array([solution.objectives for solution in front])
+    violation = np.array([solution.violation for solution in front])
+    low, high = objectives.min(axis=0), objectives.max(axis=0)
+    normalized = (objectives - low) / np.where(high > low, high - low, 1.0)
+
+    score = normalized @ np.asarray(preference, dtype=np.float64)
+    return front[int(np.lexsort((score, violation))[0])]
+
+
+class NSGA2:
+    """
+    Algoritmo genetico multiobjetivo NSGA-II para rotas
+
+    Parametros principais:
+    - population_size: Tamanho da populacao
+    - generations: Numero de geracoes
+    - mutation_rate: Taxa de mutacao (0 a 1)
+    - crossover_rate: Taxa de cruzamento (0 a 1)
+    - tournament_size: Tamanho do torneio (comparacao por rank e aglomeracao)
+    - crossover_method: Operador de cruzamento ('order', 'pmx' ou 'edge')
+    - random_seed: Semente (int), np.random.SeedSequence ou
+      np.random.Generator, como em GeneticAlgorithm
+    """
+
+    CROSSOVER_METHODS = ('order', 'pmx', 'edge')
+
+    def __init__(
+        self,
+        population_size: int = 100,
+        generations: int = 300,
+        mutation_rate: float = 0.2,
+        crossover_rate: float = 0.9,
+        tournament_size: int = 2,
+        random_seed: int = None,
+        crossover_method: str = 'order'
+    ):
+        if crossover_method not in self.CROSSOVER_METHODS:
+            raise ValueError(
+                f"crossover_method deve ser um de {self.CROSSOVER_METHODS}, "
+                f"recebido: {crossover_method!r}"
+            )
+
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.tournament_size = tournament_size
+        self.crossover_method = crossover_method
+        self.seed_sequence = make_seed_sequence(random_seed)
+        self.rng = np.random.default_rng(self.seed_sequence)
+
+        # Historico: tamanho da frente e melhor valor de cada objetivo
+        self.front_size_history = []
+        self.ideal_point_history = []
+        self.front = []
+
+    def _initial_population(self, num_points: int, depot: int) -> np.ndarray:
+        """Matriz de rotas aleatorias (deposito no inicio e no fim)"""
+        points = np.array([i for i in range(num_points) if i != depot], dtype=np.int32)
+        order = np.argsort(self.rng.random((self.population_size, len(points))), axis=1)
+        genes = np.empty((self.population_size, len(points) + 2), dtype=np.int32)
+        genes[:, 0] = depot
+        genes[:, 1:-1] = points[order]
+        genes[:, -1] = depot
+        return genes
+
+    def _offspring(self, genes: np.ndarray, selection_key: np.ndarray) -> np.ndarray:
+        """
+        Gera uma populacao de descendentes
+
+        Args:
+            genes: Populacao atual
+            selection_key: Posicao de cada rota na ordem (rank, -aglomeracao);
+                menor e melhor
+
+        Returns:
+            Matriz de descendentes com o mesmo formato de `genes`
+        """
+        size, genome_length = genes.shape
+
+        # Torneios: uma linha de candidatos distintos por descendente
+        candidates = random_subsets(self.rng, size, size, self.tournament_size)
+        winners = candidates[np.arange(size), np.argmin(selection_key[candidates], axis=1)]
+        parents = genes[winners]
+        children = parents.copy()
+
+        inner_size = genome_length - 2
+        if inner_size <= 1:
+            return children
+
+        # Crossover entre pares consecutivos de pais
+        n_pairs = size // 2
+        crossed = np.flatnonzero(self.rng.random(n_pairs) < self.crossover_rate)
+        if self.crossover_method == 'edge':
+            for pair in crossed:
+                first, second = parents[2 * pair], parents[2 * pair + 1]
+                edge_recombination_crossover(first, second, self.rng, out=children[2 * pair])
+                edge_recombination_crossover(second, first, self.rng, out=children[2 * pair + 1])
+        else:
+            operator = pmx_crossover if self.crossover_method == 'pmx' else order_crossover
+            idx1, idx2 = random_positions(self.rng, len(crossed), genome_length)
+            points1, points2 = np.minimum(idx1, idx2) - 1, np.maximum(idx1, idx2) - 1
+            for pair, point1, point2 in zip(crossed, points1, points2):
+                first, second = parents[2 * pair], parents[2 * pair + 1]
+                operator(first, second, point1, point2, out=children[2 * pair])
+                operator(second, first, point1, point2, out=children[2 * pair + 1])
+
+        # Mutacao (troca ou inversao, 50% cada)
+        mutated = np.flatnonzero(self.rng.random(size) < self.mutation_rate)
+        use_swap = self.rng.random(len(mutated)) < 0.5
+        mutation_swap_batch(children, mutated[use_swap], self.rng)
+        mutation_inversion_batch(children, mutated[~use_swap], self.rng)
+
+        return children
+
+    @staticmethod
+    def _survivors(
+        objectives: np.ndarray,
+        violation: np.ndarray,
+        count: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Indices das `count` melhores rotas por (rank, -aglomeracao)"""
+        ranks = non_dominated_sort(objectives, violation)
+        crowding = crowding_distance(objectives, ranks)
+        order = np.lexsort((-crowding, ranks))[:count]
+        return order, ranks[order], crowding[order]
+
+    def evolve(
+        self,
+        num_points: int,
+        objectives_function: Callable,
+        depot: int = 0,
+        verbose: bool = True
+    ) -> List[ParetoSolution]:
+        """
+        Executa o NSGA-II
+
+        Args:
+            num_points: Numero total de pontos
+            objectives_function: Funcao que recebe uma matriz de rotas e
+                retorna (objetivos, violacao), ex.: RouteOptimizer.objectives_batch
+            depot: Indice do deposito
+            verbose: Se True, mostra barra de progresso
+
+        Returns:
+            Frente de Pareto (rotas distintas de rank 0), ordenada pelo
+            primeiro objetivo
+        """
+        genes = self._initial_population(num_points, depot)
+        objectives, violation = objectives_function(genes)
+        objectives = np.asarray(objectives, dtype=np.float64)
+        violation = np.asarray(violation, dtype=np.float64)
+
+        survivors, ranks, crowding = self._survivors(objectives, violation, len(genes))
+        genes, objectives, violation = genes[survivors], objectives[survivors], violation[survivors]
+
+        pbar = tqdm(range(self.generations), disable=not verbose, desc="Evolução NSGA-II")
+        for generation in pbar:
+            # A populacao esta ordenada por (rank, -aglomeracao): a posicao e a chave
+            children = self._offspring(genes, np.arange(len(genes)))
+            child_objectives, child_violation = objectives_function(children)
+
+            # Selecao ambiental sobre pais + filhos
+            combined_genes = np.concatenate((genes, children))
+            combined_objectives = np.concatenate((objectives, child_objectives))
+            combined_violation = np.concatenate((violation, child_violation))
+            survivors, ranks, crowding = self._survivors(
+                combined_objectives, combined_violation, self.population_size
+            )
+            genes = combined_genes[survivors]
+            objectives = combined_objectives[survivors]
+            violation = combined_violation[survivors]
+
+            front_size = int((ranks == 0).sum())
+            self.front_size_history.append(front_size)
+            self.ideal_point_history.append(objectives.min(axis=0))
+            pbar.set_postfix({'Frente': front_size})
+
+        # Frente final sem rotas repetidas
+        first = np.flatnonzero(ranks == 0)
+        _, unique = np.unique(genes[first], axis=0, return_index=True)
+        first = first[np.sort(unique)]
+        first = first[np.argsort(objectives[first, 0], kind='stable')]
+
+        self.front = [
+            ParetoSolution(
+                genes=genes[i].tolist(),
+                objectives=objectives[i].copy(),
+                violation=float(violation[i])
+            )
+            for i in first
+        ]
+        return self.front
+
+    def get_statistics(self) -> dict:
+        """
+        Retorna estatisticas da evolucao
+
+        Returns:
+            Dicionario com o tamanho da frente final e os historicos
+        """
+        return {
+            'front_size': len(self.front),
+            'front_size_history': self.front_size_history,
+            'ideal_point_history': self.ideal_point_history,
+            'generations_run': len(self.front_size_history)
+        }
@@ -0,0 +1,321 @@
+"""
+Operadores Geneticos Vetorizados para Rotas
+
+Este modulo implementa operadores de permutacao que trabalham diretamente
+sobre arrays NumPy (linhas de uma PopulationMatrix), com custo linear no
+tamanho da rota:
+- Crossover de Ordem (OX) com mascara booleana de genes ja posicionados
+- Crossover Parcialmente Mapeado (PMX)
+- Crossover por Recombinacao de Arestas (ERX)
+- Mutacoes por troca e por inversao aplicadas a varias linhas de uma vez
+
+Todas as rotas seguem a convencao do projeto: o deposito ocupa a primeira
+e a ultima posicao e nunca e alterado pelos operadores.
+"""
+
+import numpy as np
+from typing import Optional, Union
+
+
+def order_crossover(
+    parent1: np.ndarray,
+    parent2: np.ndarray,
+    point1: int,
+    point2: int,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Crossover de Ordem (OX) em O(n)
+
+    Copia o segmento [point1, point2) do primeiro pai e preenche as demais
+    posicoes com os genes do segundo pai, na ordem em que aparecem a partir
+    do segundo corte.
+
+    Args:
+        parent1: Rota do primeiro pai (com depositos)
+        parent2: Rota do segundo pai (com depositos)
+        point1: Inicio do segmento (indice na parte intermediaria)
+        point2: Fim do segmento, exclusivo (indice na parte intermediaria)
+        out: Array de saida opcional (mesmo tamanho dos pais)
+
+    Returns:
+        Rota do filho
+    """
+    if out is None:
+        out = np.empty_like(parent1)
+
+    inner1 = parent1[1:-1]
+    inner2 = parent2[1:-1]
+    size = len(inner1)
+
+    # Mascara de genes ja posicionados, indexada pelo ID do ponto
+    placed = np.zeros(max(inner1.max(), inner2.max()) + 1, dtype=bool)
+    segment = inner1[point1:point2]
+    placed[segment] = True
+
+    # Genes do segundo pai a partir do segundo corte, sem os ja copiados
+    rotated = np.concatenate((inner2[point2:], inner2[:point2]))
+    remaining = rotated[~placed[rotated]]
+
+    child_inner = out[1:-1]
+    child_inner[point1:point2] = segment
+    # Posicoes livres a partir do segundo corte, em ordem circular
+    free = np.arange(point2, point2 + len(remaining)) % size
+    child_inner[free] = remaining
+    out[0] = parent1[0]
+    out[-1] = parent1[-1]
+
+    return out
+
+
+def pmx_crossover(
+    parent1: np.ndarray,
+    parent2: np.ndarray,
+    point1: int,
+    point2: int,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Crossover Parcialmente Mapeado (PMX) em O(n)
+
+    O segmento [point1, point2) vem do primeiro pai; os demais genes vem do
+    segundo pai, resolvendo conflitos pelo mapeamento entre os segmentos.
+
+    Args:
+        parent1: Rota do primeiro pai (com depositos)
+        parent2: Rota do segundo pai (com depositos)
+        point1: Inicio do segmento (indice na parte intermediaria)
+        point2: Fim do segmento, exclusivo (indice na parte intermediaria)
+        out: Array de saida opcional (mesmo tamanho dos pais)
+
+    Returns:
+        Rota do filho
+    """
+    if out is None:
+        out = np.empty_like(parent1)
+
+    inner1 = parent1[1:-1]
+    inner2 = parent2[1:-1]
+
+    # mapping[g] = gene do segundo pai na posicao em que g aparece no
+    # segmento do primeiro pai (-1 se g nao esta no segmento)
+    mapping = np.full(max(inner1.max(), inner2.max()) + 1, -1, dtype=np.int64)
+    mapping[inner1[point1:point2]] = inner2[point1:point2]
+
+    child_inner = out[1:-1]
+    child_inner[:] = inner2
+    child_inner[point1:point2] = inner1[point1:point2]
+
+    # Fora do segmento, genes repetidos seguem o mapeamento ate sair dele.
+    # Cada cadeia e percorrida uma unica vez, portanto o custo e linear.
+    outside = np.concatenate((np.arange(point1), np.arange(point2, len(inner1))))
+    conflicts = outside[mapping[child_inner[outside]] >= 0]
+    for position in conflicts:
+        gene = child_inner[position]
+        while mapping[gene] >= 0:
+            gene = mapping[gene]
+        child_inner[position] = gene
+
+    out[0] = parent1[0]
+    out[-1] = parent1[-1]
+
+    return out
+
+
+def edge_recombination_crossover(
+    parent1: np.ndarray,
+    parent2: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Crossover por Recombinacao de Arestas (ERX)
+
+    Constroi o filho preservando ao maximo as adjacencias dos dois pais:
+    a partir do gene atual, segue para o vizinho (em qualquer pai) com menos
+    vizinhos restantes; sem vizinhos disponiveis, escolhe um gene livre ao
+    acaso.
+
+    Args:
+        parent1: Rota do primeiro pai (com depositos)
+        parent2: Rota do segundo pai (com depositos)
+        rng: Gerador de numeros aleatorios (np.random.Generator; padrao:
+            um gerador novo, sem semente)
+        out: Array de saida opcional (mesmo tamanho dos pais)
+
+    Returns:
+        Rota do filho
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if out is None:
+        out = np.empty_like(parent1)
+
+    inner1 = parent1[1:-1].tolist()
+    inner2 = parent2[1:-1].tolist()
+    size = len(inner1)
+
+    # Tabela de arestas (vizinhos circulares nos dois pais), no maximo 4 por gene
+    edges = {gene: set() for gene in inner1}
+    for inner in (inner1, inner2):
+        for i, gene in enumerate(inner):
+            edges[gene].add(inner[i - 1])
+            edges[gene].add(inner[(i + 1) % size])
+
+    # Genes livres com remocao O(1) (troca com o ultimo)
+    unplaced = list(inner1)
+    slot = {gene: i for i, gene in enumerate(unplaced)}
+
+    child = []
+    current = inner1[0]
+    while True:
+        child.append(current)
+        last = unplaced.pop()
+        if last != current:
+            unplaced[slot[current]] = last
+            slot[last] = slot[current]
+
+        neighbors = edges.pop(current)
+        for neighbor in neighbors:
+            if neighbor in edges:
+                edges[neighbor].discard(current)
+
+        if not unplaced:
+            break
+
+        candidates = [g for g in neighbors if g in edges]
+        if candidates:
+            fewest = min(len(edges[g]) for g in candidates)
+            candidates = [g for g in candidates if len(edges[g]) == fewest]
+            current = candidates[rng.integers(len(candidates))]
+        else:
+            current = unplaced[rng.integers(len(unplaced))]
+
+    out[1:-1] = child
+    out[0] = parent1[0]
+    out[-1] = parent1[-1]
+
+    return out
+
+
+def make_seed_sequence(
+    random_seed: Union[None, int, np.random.SeedSequence, np.random.Generator]
+) -> np.random.SeedSequence:
+    """
+    Normaliza a semente dos algoritmos geneticos em uma SeedSequence
+
+    Aceita None, int, SeedSequence (usada como esta) ou Generator (a
+    entropia e sorteada dele, avancando seu estado).
+    """
+    if isinstance(random_seed, np.random.SeedSequence):
+        return random_seed
+    if isinstance(random_seed, np.random.Generator):
+        return np.random.SeedSequence(random_seed.integers(0, 2**32, size=4).tolist())
+    return np.random.SeedSequence(random_seed)
+
+
+def random_positions(rng: np.random.Generator, count: int, genome_length: int):
+    """
+    Sorteia `count` pares de posicoes distintas na parte intermediaria da rota,
+    em dois sorteios vetorizados
+
+    Returns:
+        (idx1, idx2) arrays de tamanho `count`
+    """
+    idx1 = rng.integers(1, genome_length - 1, count)
+    idx2 = rng.integers(1, genome_length - 2, count)
+    idx2 = idx2 + (idx2 >= idx1)
+    return idx1, idx2
+
+
+def random_subsets(rng: np.random.Generator, count: int, size: int, k: int) -> np.ndarray:
+    """
+    Sorteia `count` subconjuntos de `k` indices distintos em range(size),
+    pelo algoritmo de Floyd vetorizado por coluna (O(count * k^2), sem
+    matriz count x size)
+
+    Returns:
+        Matriz (count, min(k, size)) de indices, sem repeticao em cada linha
+    """
+    k = min(k, size)
+    chosen = np.empty((count, k), dtype=np.int64)
+    for column, upper in enumerate(range(size - k, size)):
+        draw = rng.integers(0, upper + 1, count)
+        taken = (chosen[:, :column] == draw[:, None]).any(axis=1)
+        chosen[:, column] = np.where(taken, upper, draw)
+    return chosen
+
+
+def mutation_swap_batch(
+    genes: np.ndarray,
+    rows: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    positions=None
+) -> np.ndarray:
+    """
+    Mutacao por troca aplicada a varias linhas de uma matriz de genes (in-place)
+
+    Args:
+        genes: Matriz (n, tamanho_rota) de rotas
+        rows: Indices das linhas a mutar
+        rng: Gerador de numeros aleatorios (np.random.Generator)
+        positions: Pares (idx1, idx2) ja sorteados (opcional)
+
+    Returns:
+        A propria matriz `genes`
+    """
+    rows = np.asarray(rows)
+    if len(rows) == 0 or genes.shape[1] <= 3:
+        return genes
+
+    if positions is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        positions = random_positions(rng, len(rows), genes.shape[1])
+    idx1, idx2 = positions
+    genes[rows, idx1], genes[rows, idx2] = genes[rows, idx2], genes[rows, idx1]
+
+    return genes
+
+
+def mutation_inversion_batch(
+    genes: np.ndarray,
+    rows: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    positions=None
+) -> np.ndarray:
+    """
+    Mutacao por inversao aplicada a varias linhas de uma matriz de genes (in-place)
+
+    Cada linha tem seu proprio segmento [inicio, fim) invertido; todas as
+    inversoes sao feitas em uma unica operacao de indexacao.
+
+    Args:
+        genes: Matriz (n, tamanho_rota) de rotas
+        rows: Indices das linhas a mutar
+        rng: Gerador de numeros aleatorios (np.random.Generator)
+        positions: Pares (idx1, idx2) ja sorteados (opcional)
+
+    Returns:
+        A propria matriz `genes`
+    """
+    rows = np.asarray(rows)
+    if len(rows) == 0 or genes.shape[1] <= 3:
+        return genes
+
+    if positions is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        positions = random_positions(rng, len(rows), genes.shape[1])
+    idx1, idx2 = positions
+    start = np.minimum(idx1, idx2)[:, None]
+    end = np.maximum(idx1, idx2)[:, None]
+
+    # Posicao de origem de cada coluna apos a inversao do segmento
+    columns = np.arange(genes.shape[1])
+    inside = (columns >= start) & (columns < end)
+    source = np.where(inside, start + end - 1 - columns, columns)
+
+    genes[rows] = np.take_along_axis(genes[rows], source, axis=1)
+
+    return genes
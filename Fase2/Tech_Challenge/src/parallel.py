@@ -0,0 +1,185 @@
+"""
+Avaliacao Paralela de Fitness
+
+Este modulo implementa um avaliador de fitness em lote que distribui a
+populacao entre processos:
+- A matriz de distancias e os atributos dos pontos sao copiados uma unica
+  vez para blocos de memoria compartilhada (multiprocessing.shared_memory)
+- Cada processo se conecta aos blocos na inicializacao, sem copias por lote
+- A cada chamada, apenas as rotas vao para os processos e apenas os arrays
+  de fitness, distancia e penalidade voltam
+
+O avaliador e um objeto chamavel com a mesma assinatura de
+RouteOptimizer.fitness_function_batch e pode ser passado ao construtor do
+GeneticAlgorithm (parametro `evaluator`).
+
+Os blocos de memoria compartilhada sao liberados por close(), pelo
+gerenciador de contexto ou, na falta deles, quando o avaliador e coletado.
+"""
+
+import os
+import weakref
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+try:
+    from .routing import evaluate_routes_batch
+except ImportError:
+    from routing import evaluate_routes_batch
+
+
+# Estado de cada processo trabalhador (preenchido por _init_worker)
+_WORKER_STATE = {}
+
+
+def _init_worker(specs: Dict[str, Tuple[str, tuple, str]], params: Dict):
+    """Conecta o processo aos blocos de memoria compartilhada"""
+    blocks, arrays = [], {}
+    for name, (shm_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=shm_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    _WORKER_STATE['blocks'] = blocks
+    _WORKER_STATE['arrays'] = arrays
+    _WORKER_STATE['params'] = params
+
+
+def _release(executor: ProcessPoolExecutor, blocks):
+    """Encerra os processos e remove os blocos de memoria compartilhada"""
+    executor.shutdown(wait=True)
+    for block in blocks:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _evaluate_chunk(routes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Avalia um bloco de rotas no processo trabalhador"""
+    return evaluate_routes_batch(routes, **_WORKER_STATE['arrays'], **_WORKER_STATE['params'])
+
+
+class ParallelFitnessEvaluator:
+    """
+    Avaliador de fitness em lote executado em um pool de processos
+
+    Indicado para populacoes grandes ou funcoes de fitness caras; para
+    populacoes pequenas o custo de comunicacao supera o ganho.
+
+    Os dados do otimizador sao copiados na criacao: apos qualquer mudanca
+    nos pontos, nos pesos (optimizer.data_version) ou no veiculo usado o
+    avaliador deve ser recriado (chamadas com dados desatualizados levantam
+    RuntimeError).
+
+    A matriz de distancias em disco (distance_storage='mmap') nao e aceita:
+    copia-la para a memoria compartilhada carregaria a matriz inteira na
+    RAM, que e justamente o que o modo 'mmap' evita.
+
+    Uso:
+        with ParallelFitnessEvaluator(optimizer, n_workers=4) as evaluator:
+            ga = GeneticAlgorithm(evaluator=evaluator)
+            ga.evolve_vectorized(num_points, None)
+    """
+
+    def __init__(
+        self,
+        optimizer,
+        vehicle_id: int = 0,
+        n_workers: Optional[int] = None,
+        chunks_per_worker: int = 1
+    ):
+        """
+        Args:
+            optimizer: RouteOptimizer com os dados do problema
+            vehicle_id: ID do veiculo usado na avaliacao
+            n_workers: Numero de processos (padrao: numero de CPUs)
+            chunks_per_worker: Blocos de rotas por processo em cada chamada
+        """
+        if isinstance(optimizer.distance_matrix, np.memmap):
+            raise ValueError(
+                "ParallelFitnessEvaluator nao suporta distance_storage='mmap': "
+                "a matriz inteira seria copiada para a memoria compartilhada; "
+                "use 'dense' ou 'sparse'"
+            )
+
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+
+        arrays, params = optimizer.get_batch_fitness_inputs(vehicle_id)
+
+        # Referencia ao otimizador e versao dos dados copiados, para detectar
+        # mudancas nos pontos, na matriz, nos pesos ou no veiculo
+        self._optimizer = optimizer
+        self._vehicle_id = vehicle_id
+        self._data_key = self._current_data_key()
+
+        # Copiar cada array para um bloco de memoria compartilhada; estruturas
+        # que nao sao arrays (ex.: SparseDistanceMatrix, ja compacta) seguem
+        # junto com os parametros
+        self._blocks = []
+        specs = {}
+        params = dict(params)
+        for name, array in arrays.items():
+            if not isinstance(array, np.ndarray):
+                params[name] = array
+                continue
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            specs[name] = (block.name, array.shape, array.dtype.str)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(specs, params)
+        )
+        self._finalizer = weakref.finalize(self, _release, self._executor, self._blocks)
+
+    def __call__(self, routes: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Avalia uma matriz de rotas em paralelo
+
+        Args:
+            routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+
+        Returns:
+            (fitness, distancias, penalidades) como arrays de tamanho num_rotas
+        """
+        if self._current_data_key() != self._data_key:
+            raise RuntimeError(
+                "Os dados do otimizador mudaram desde a criacao do avaliador; "
+                "crie um novo ParallelFitnessEvaluator"
+            )
+
+        routes = np.asarray(routes)
+        n_chunks = min(len(routes), self.n_workers * self.chunks_per_worker)
+        if n_chunks == 0:
+            empty = np.empty(0)
+            return empty, empty.copy(), empty.copy()
+
+        results = list(self._executor.map(_evaluate_chunk, np.array_split(routes, n_chunks)))
+
+        fitness, distance, penalty = zip(*results)
+        return np.concatenate(fitness), np.concatenate(distance), np.concatenate(penalty)
+
+    def _current_data_key(self) -> Tuple:
+        """Versao dos dados do otimizador e parametros do veiculo avaliado"""
+        optimizer = self._optimizer
+        vehicles = optimizer.vehicles
+        vehicle = vehicles[self._vehicle_id] if self._vehicle_id < len(vehicles) else vehicles[0]
+        return (optimizer.data_version, vehicle.capacity, vehicle.max_distance, vehicle.avg_speed)
+
+    def close(self):
+        """Encerra os processos e libera a memoria compartilhada"""
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
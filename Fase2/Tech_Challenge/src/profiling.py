@@ -0,0 +1,128 @@
+"""
+Perfil de Tempo por Fase do Algoritmo Genetico
+
+Este modulo implementa uma instrumentacao opcional do laco de geracoes:
+- Tempo de relogio acumulado e numero de chamadas por fase (ordenacao,
+  selecao, crossover, mutacao, avaliacao, busca local, ...)
+- Fases do RouteOptimizer (funcao de fitness individual, em lote e
+  avaliacao incremental), que ficam aninhadas nas fases do AG
+- Rastro por geracao (segundos de cada fase em cada geracao), gravavel
+  em CSV para analise em planilha ou pandas
+
+Sem profiler, o AG e o RouteOptimizer usam um contexto nulo reutilizado,
+de modo que a instrumentacao desligada nao tem custo perceptivel.
+"""
+
+import csv
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Contexto nulo compartilhado para fases sem profiler
+NULL_PHASE = nullcontext()
+
+
+class PhaseProfiler:
+    """
+    Acumula o tempo de relogio de cada fase nomeada
+
+    Uso:
+        profiler = PhaseProfiler()
+        with profiler.phase('selection'):
+            ...
+        profiler.end_generation(0)
+        profiler.to_csv('perfil.csv')
+    """
+
+    def __init__(self):
+        self.total_time = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.trace = []
+        self._generation_time = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Mede o tempo do bloco e o atribui a fase `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.total_time[name] += elapsed
+            self.calls[name] += 1
+            self._generation_time[name] += elapsed
+
+    def end_generation(self, generation: int):
+        """Fecha a linha do rastro da geracao com o tempo de cada fase"""
+        self.trace.append((generation, dict(self._generation_time)))
+        self._generation_time.clear()
+
+    def phases(self) -> List[str]:
+        """Nomes das fases, na ordem em que foram medidas pela primeira vez"""
+        return list(self.total_time)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Tempo total, chamadas e tempo medio de cada fase
+
+        Returns:
+            Dicionario fase -> {'total_time', 'calls', 'mean_time'}
+        """
+        return {
+            name: {
+                'total_time': self.total_time[name],
+                'calls': self.calls[name],
+                'mean_time': self.total_time[name] / self.calls[name]
+            }
+            for name in self.phases()
+        }
+
+    def to_csv(self, path: str):
+        """
+        Grava o rastro por geracao: uma linha por geracao, uma coluna por fase
+
+        Args:
+            path: Arquivo CSV de saida
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        phases = self.phases()
+
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['generation'] + phases)
+            for generation, times in self.trace:
+                writer.writerow([generation] + [times.get(name, 0.0) for name in phases])
+
+    def reset(self):
+        """Descarta todas as medicoes"""
+        self.total_time.clear()
+        self.calls.clear()
+        self.trace.clear()
+        self._generation_time.clear()
+
+
+def timed(profiler: Optional[PhaseProfiler], name: str):
+    """Contexto de medicao da fase `name`, ou contexto nulo sem profiler"""
+    return NULL_PHASE if profiler is None else profiler.phase(name)
+
+
+def profiled(name: str):
+    """
+    Decorador de metodo que mede cada chamada na fase `name`
+
+    Usa o atributo `profiler` da instancia; quando ele e None, o metodo
+    original e chamado diretamente.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiler is None:
+                return method(self, *args, **kwargs)
+            with self.profiler.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
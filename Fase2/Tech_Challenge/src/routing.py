@@ -7,13 +7,26 @@ Este módulo implementa:
 - Veículos com capacidade e autonomia limitadas
 - Cálculo de distâncias
 - Função fitness considerando múltiplas restrições
+- Janelas de tempo: horários de chegada calculados em lote para uma
+  população inteira, com espera na abertura e penalidade por atraso
 """
 
 import numpy as np
-from typing import List, Tuple, Dict, Optional
-from dataclasses import dataclass, field
+from typing import Callable, List, Tuple, Dict, Optional, Union
+from dataclasses import dataclass, field, fields, replace
 from enum import Enum
 
+try:
+    from .distances import load_or_compute_distance_matrix, haversine_block, SparseDistanceMatrix
+    from .split import prins_split, prins_split_batch
+    from .profiling import profiled
+    from .operators import random_subsets
+except ImportError:
+    from distances import load_or_compute_distance_matrix, haversine_block, SparseDistanceMatrix
+    from split import prins_split, prins_split_batch
+    from profiling import profiled
+    from operators import random_subsets
+
 
 class Priority(Enum):
     """Níveis de prioridade para entregas"""
@@ -109,30 +122,265 @@ class Vehicle:
         return f"Vehicle({self.id}: {self.name})"
 
 
+@dataclass
+class DeliveryPointArrays:
+    """
+    Pontos de entrega em formato colunar (um array NumPy por atributo)
+    
+    Usado na carga em lote de milhares de pontos: as colunas do CSV viram
+    arrays sem passar por um DeliveryPoint por linha.
+    
+    Attributes:
+        ids: Identificadores dos pontos
+        names: Nomes dos locais
+        lat, lon: Coordenadas
+        demand: Demanda de cada ponto (kg)
+        priority: Código da prioridade (Priority.value; 1 = CRITICAL)
+        service_time: Tempo de serviço (minutos)
+        window_open, window_close: Janela de tempo (horas)
+    """
+    ids: np.ndarray
+    names: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    demand: np.ndarray
+    priority: np.ndarray
+    service_time: np.ndarray
+    window_open: np.ndarray
+    window_close: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def from_delivery_points(cls, points: List[DeliveryPoint]) -> 'DeliveryPointArrays':
+        """Converte uma lista de DeliveryPoint para o formato colunar"""
+        return cls(
+            ids=np.array([p.id for p in points], dtype=np.int64),
+            names=np.array([p.name for p in points], dtype=object),
+            lat=np.array([p.lat for p in points], dtype=np.float64),
+            lon=np.array([p.lon for p in points], dtype=np.float64),
+            demand=np.array([p.demand for p in points], dtype=np.float64),
+            priority=np.array([p.priority.value for p in points], dtype=np.int8),
+            service_time=np.array([p.service_time for p in points], dtype=np.float64),
+            window_open=np.array([p.time_window[0] for p in points], dtype=np.float64),
+            window_close=np.array([p.time_window[1] for p in points], dtype=np.float64)
+        )
+    
+    def copy(self) -> 'DeliveryPointArrays':
+        """Cópia com arrays próprios"""
+        return DeliveryPointArrays(**{f.name: getattr(self, f.name).copy() for f in fields(self)})
+    
+    def take(self, index: np.ndarray) -> 'DeliveryPointArrays':
+        """Subconjunto das linhas (índices ou máscara booleana)"""
+        return DeliveryPointArrays(**{f.name: getattr(self, f.name)[index] for f in fields(self)})
+    
+    def concatenate(self, other: 'DeliveryPointArrays') -> 'DeliveryPointArrays':
+        """Linhas deste conjunto seguidas das de `other`"""
+        return DeliveryPointArrays(**{
+            f.name: np.concatenate((getattr(self, f.name), getattr(other, f.name)))
+            for f in fields(self)
+        })
+    
+    def to_delivery_points(self) -> List[DeliveryPoint]:
+        """Cria um DeliveryPoint por linha (sem medicamentos associados)"""
+        priorities = {p.value: p for p in Priority}
+        return [
+            DeliveryPoint(
+                id=point_id, name=name, lat=lat, lon=lon, demand=demand,
+                priority=priorities[priority], time_window=(start, end),
+                service_time=service_time
+            )
+            for point_id, name, lat, lon, demand, priority, service_time, start, end in zip(
+                self.ids.tolist(), self.names.tolist(), self.lat.tolist(), self.lon.tolist(),
+                self.demand.tolist(), self.priority.tolist(), self.service_time.tolist(),
+                self.window_open.tolist(), self.window_close.tolist()
+            )
+        ]
+
+
+class _TrackedDeliveryPoint(DeliveryPoint):
+    """
+    DeliveryPoint guardado pelo RouteOptimizer
+    
+    Os arrays do otimizador são a fonte dos dados usados no fitness; cada
+    escrita em demand, priority, service_time, time_window ou name é
+    repassada a eles (e incrementa data_version). Coordenadas e id não
+    podem mudar: use remove_delivery_points e add_delivery_point.
+    """
+    
+    READ_ONLY = ('id', 'lat', 'lon')
+    
+    @classmethod
+    def track(
+        cls,
+        point: DeliveryPoint,
+        index: int,
+        on_change: Callable[[int, str, object], None]
+    ) -> '_TrackedDeliveryPoint':
+        """Cópia de `point` ligada à linha `index` dos arrays do otimizador"""
+        values = {f.name: getattr(point, f.name) for f in fields(DeliveryPoint)}
+        values['medications'] = list(point.medications)
+        tracked = cls(**values)
+        object.__setattr__(tracked, '_index', index)
+        object.__setattr__(tracked, '_on_change', on_change)
+        return tracked
+    
+    def detach(self):
+        """Desliga o ponto dos arrays (ex.: após remove_delivery_points)"""
+        object.__setattr__(self, '_on_change', None)
+    
+    def __setattr__(self, name, value):
+        # Antes de track (no __init__ do dataclass) a escrita é direta
+        on_change = self.__dict__.get('_on_change')
+        if on_change is None:
+            object.__setattr__(self, name, value)
+            return
+        if name in self.READ_ONLY:
+            raise AttributeError(
+                f"{name} de um ponto do otimizador não pode ser alterado; "
+                "use remove_delivery_points e add_delivery_point"
+            )
+        if name == 'priority':
+            value = Priority(value)
+        elif name == 'time_window':
+            value = tuple(value)
+        object.__setattr__(self, name, value)
+        on_change(self._index, name, value)
+    
+    def __eq__(self, other):
+        if not isinstance(other, DeliveryPoint):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(DeliveryPoint))
+    
+    __hash__ = None
+
+
+class _FitnessWeights(dict):
+    """
+    Pesos da função fitness que avisam o otimizador a cada alteração
+    
+    Qualquer escrita incrementa RouteOptimizer.data_version, para que
+    caches e avaliadores criados antes da mudança percebam que estão
+    desatualizados.
+    """
+    
+    def __init__(self, values: Dict[str, float], on_change: Callable[[], None]):
+        super().__init__(values)
+        self._on_change = on_change
+    
+    def __reduce__(self):
+        # Cópias (pickle/deepcopy) recebem os itens no construtor, sem
+        # avisar um otimizador ainda incompleto
+        return type(self), (dict(self), self._on_change)
+    
+    def _changed(self):
+        self._on_change()
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+    
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+    
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+    
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+    
+    def clear(self):
+        super().clear()
+        self._changed()
+
+
 class RouteOptimizer:
     """
     Otimizador de rotas com restrições realistas
+    
+    Armazenamento da matriz de distâncias (`distance_storage`):
+    - 'dense': matriz NxN em memória (padrão)
+    - 'mmap': matriz NxN mapeada a partir do cache em disco; a memória é
+      compartilhada entre processos pelo sistema operacional
+    - 'sparse': apenas os k vizinhos mais próximos de cada ponto, com
+      cálculo sob demanda dos demais pares (SparseDistanceMatrix)
     """
     
+    DISTANCE_STORAGES = ('dense', 'mmap', 'sparse')
+    
     def __init__(
         self,
-        delivery_points: List[DeliveryPoint],
+        delivery_points: Union[List[DeliveryPoint], DeliveryPointArrays],
         vehicles: List[Vehicle],
-        depot_id: int = 0
+        depot_id: int = 0,
+        distance_cache_dir: Optional[str] = None,
+        distance_dtype=np.float64,
+        distance_storage: str = 'dense',
+        distance_neighbors: int = 20
     ):
         """
         Args:
-            delivery_points: Lista de pontos de entrega (incluindo o depósito)
+            delivery_points: Lista de pontos de entrega (incluindo o depósito);
+                o otimizador guarda cópias dos pontos e nunca altera os
+                objetos recebidos. Também aceita DeliveryPointArrays (ver
+                from_arrays), também copiados
             vehicles: Lista de veículos disponíveis
             depot_id: ID do depósito (ponto de partida e chegada)
+            distance_cache_dir: Diretório para cache da matriz de distâncias
+                em disco (None desativa o cache; obrigatório no modo 'mmap')
+            distance_dtype: Tipo numérico da matriz (np.float32 economiza memória)
+            distance_storage: 'dense', 'mmap' ou 'sparse'
+            distance_neighbors: Vizinhos armazenados por ponto no modo 'sparse'
         """
-        self.delivery_points = delivery_points
+        if distance_storage not in self.DISTANCE_STORAGES:
+            raise ValueError(
+                f"distance_storage deve ser um de {self.DISTANCE_STORAGES}, "
+                f"recebido: {distance_storage!r}"
+            )
+        
+        # Com pontos em formato colunar os DeliveryPoint só são criados no
+        # primeiro acesso a delivery_points
+        if isinstance(delivery_points, DeliveryPointArrays):
+            self._delivery_points = None
+            point_arrays = delivery_points.copy()
+        else:
+            self._delivery_points = self._track_points(delivery_points)
+            point_arrays = DeliveryPointArrays.from_delivery_points(self._delivery_points)
         self.vehicles = vehicles
         self.depot_id = depot_id
+        self.distance_cache_dir = distance_cache_dir
+        self.distance_dtype = distance_dtype
+        self.distance_storage = distance_storage
+        self.distance_neighbors = distance_neighbors
+        
+        # Incrementado a cada mudança nos pontos, na matriz de distâncias ou
+        # nos pesos (ver data_version)
+        self._data_version = 0
+        
+        # Atributos dos pontos em arrays, usados por todo o cálculo de fitness
+        self._set_point_arrays(point_arrays)
         
         # Criar matriz de distâncias
         self.distance_matrix = self._calculate_distance_matrix()
         
+        # Horário de saída do depósito (abertura da janela do depósito)
+        self.departure_time = float(self.point_arrays.window_open[depot_id])
+        
         # Pesos para função fitness
         self.weights = {
             'distance': 1.0,
@@ -141,34 +389,160 @@ class RouteOptimizer:
             'autonomy_penalty': 500.0,
             'time_window_penalty': 200.0
         }
+        
+        # Profiler opcional (profiling.PhaseProfiler): mede as chamadas de
+        # fitness_function, fitness_function_batch e evaluate_move
+        self.profiler = None
+        
+        # Máximo de pontos por viagem no split (None = divisão exata); com
+        # um limite K o split custa O(n K) por veículo em vez de O(n^2)
+        self.split_max_trip_stops = None
+    
+    @classmethod
+    def from_arrays(
+        cls,
+        points: DeliveryPointArrays,
+        vehicles: List[Vehicle],
+        depot_id: int = 0,
+        **kwargs
+    ) -> 'RouteOptimizer':
+        """
+        Cria o otimizador a partir de pontos em formato colunar
+        
+        Os arrays dos pontos e a matriz de distâncias saem direto das
+        colunas; a lista de DeliveryPoint só é criada se delivery_points
+        for acessado.
+        
+        Args:
+            points: Pontos carregados por load_arrays_from_csv
+            vehicles: Lista de veículos disponíveis
+            depot_id: ID do ponto que é o depósito
+            **kwargs: Demais parâmetros do construtor
+            
+        Returns:
+            RouteOptimizer com os mesmos pontos, na mesma ordem
+        """
+        return cls(points, vehicles, depot_id, **kwargs)
+    
+    @property
+    def delivery_points(self) -> List[DeliveryPoint]:
+        """
+        Pontos de entrega como objetos (criados a partir dos arrays no primeiro acesso)
+        
+        Os arrays continuam sendo a fonte dos dados: alterar demand,
+        priority, service_time ou time_window de um ponto atualiza os
+        arrays do fitness. Incluir ou remover pontos exige
+        add_delivery_point e remove_delivery_points.
+        """
+        if self._delivery_points is None:
+            self._delivery_points = self._track_points(self.point_arrays.to_delivery_points())
+        return self._delivery_points
+    
+    def _track_points(self, points: List[DeliveryPoint]) -> List[DeliveryPoint]:
+        """Cópias dos pontos ligadas às linhas dos arrays (ver _TrackedDeliveryPoint)"""
+        return [
+            _TrackedDeliveryPoint.track(point, index, self._point_changed)
+            for index, point in enumerate(points)
+        ]
+    
+    def _point_changed(self, index: int, name: str, value):
+        """Repassa a escrita em um atributo de delivery_points aos arrays"""
+        points = self.point_arrays
+        if name == 'name':
+            points.names[index] = value
+            return
+        if name == 'demand':
+            points.demand[index] = value
+            self.point_demand[index] = value
+        elif name == 'priority':
+            points.priority[index] = value.value
+            self.priority_weight[index] = 5 - value.value
+        elif name == 'service_time':
+            points.service_time[index] = value
+            self.service_time_hours[index] = value / 60
+        elif name == 'time_window':
+            points.window_open[index], points.window_close[index] = value
+            self._time_windows = bool(
+                np.any((points.window_open != 0) | (points.window_close != 24))
+            )
+            if index == self.depot_id:
+                self.departure_time = float(value[0])
+        else:
+            return  # medicamentos não entram nos arrays
+        self._data_changed()
+    
+    @property
+    def data_version(self) -> int:
+        """
+        Contador de alterações dos dados do problema
+        
+        Muda sempre que pontos, matriz de distâncias ou pesos são alterados;
+        quem guarda resultados derivados (cache de ótimos locais, avaliador
+        paralelo) compara o valor para detectar dados desatualizados.
+        """
+        return self._data_version
+    
+    def _data_changed(self):
+        """Registra uma alteração nos dados do problema"""
+        self._data_version += 1
+    
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Pesos da função fitness (alterações atualizam data_version)"""
+        return self._weights
+    
+    @weights.setter
+    def weights(self, values: Dict[str, float]):
+        self._weights = _FitnessWeights(values, self._data_changed)
+        self._data_changed()
+    
+    @property
+    def num_points(self) -> int:
+        """Número de pontos, incluindo o depósito (sem criar os DeliveryPoint)"""
+        return len(self.point_arrays)
+    
+    def _set_point_arrays(self, points: DeliveryPointArrays):
+        """
+        Define o armazenamento colunar dos pontos e os arrays derivados
+        
+        - point_arrays: colunas dos pontos (coordenadas, janelas de tempo...)
+        - point_demand: demanda float32
+        - priority_weight: peso de prioridade int8 (CRITICAL=4 ... LOW=1)
+        - service_time_hours: tempo de serviço em horas
+        """
+        self.point_arrays = points
+        self.point_demand = points.demand.astype(np.float32)
+        self.priority_weight = (5 - points.priority).astype(np.int8)
+        self.service_time_hours = points.service_time / 60
+        self._time_windows = bool(
+            np.any((points.window_open != 0) | (points.window_close != 24))
+        )
+        self._data_changed()
     
     def _calculate_distance_matrix(self) -> np.ndarray:
         """
         Calcula matriz de distâncias entre todos os pontos
-        Usa distância euclidiana simplificada
+        Usa a fórmula de haversine, vetorizada, com cache opcional em disco
         
         Returns:
-            Matriz NxN de distâncias (simétrica)
-        """
-        n = len(self.delivery_points)
-        matrix = np.zeros((n, n))
-        
-        # Calcular apenas triângulo superior para garantir simetria
-        for i in range(n):
-            for j in range(i + 1, n):
-                p1 = self.delivery_points[i]
-                p2 = self.delivery_points[j]
-                
-                # Distância euclidiana em coordenadas geográficas
-                # Aproximação: 1 grau ≈ 111 km
-                lat_diff = (p1.lat - p2.lat) * 111
-                lon_diff = (p1.lon - p2.lon) * 111 * np.cos(np.radians(p1.lat))
-                
-                distance = np.sqrt(lat_diff**2 + lon_diff**2)
-                matrix[i][j] = distance
-                matrix[j][i] = distance  # Garantir simetria
-        
-        return matrix
+            Matriz NxN de distâncias (simétrica), ou um objeto com a mesma
+            indexação d[i, j] no modo 'sparse'
+        """
+        lats, lons = self.point_arrays.lat, self.point_arrays.lon
+        
+        if self.distance_storage == 'sparse':
+            return SparseDistanceMatrix(
+                lats, lons,
+                k=self.distance_neighbors,
+                dtype=self.distance_dtype
+            )
+        
+        return load_or_compute_distance_matrix(
+            lats, lons,
+            cache_dir=self.distance_cache_dir,
+            dtype=self.distance_dtype,
+            mmap=self.distance_storage == 'mmap'
+        )
     
     def calculate_route_distance(self, route: List[int]) -> float:
         """
@@ -182,9 +556,9 @@ class RouteOptimizer:
         """
         total_distance = 0.0
         for i in range(len(route) - 1):
-            total_distance += self.distance_matrix[route[i]][route[i+1]]
+            total_distance += self.distance_matrix[route[i], route[i+1]]
         
-        return total_distance
+        return float(total_distance)
     
     def calculate_route_demand(self, route: List[int]) -> float:
         """
@@ -196,11 +570,8 @@ class RouteOptimizer:
         Returns:
             Demanda total em kg
         """
-        total_demand = 0.0
-        for point_id in route[1:-1]:  # Excluir depósito
-            total_demand += self.delivery_points[point_id].demand
-        
-        return total_demand
+        stops = np.asarray(route[1:-1], dtype=np.int64)  # Excluir depósito
+        return float(self.point_demand[stops].sum(dtype=np.float64))
     
     def check_capacity_constraint(
         self,
@@ -253,19 +624,69 @@ class RouteOptimizer:
         Returns:
             Score de prioridade (menor é melhor)
         """
-        score = 0.0
+        # Peso invertido: CRITICAL (1) tem mais peso, não menos (CRITICAL=4 ... LOW=1).
+        # Quanto mais crítica a prioridade e mais tarde na rota, maior a penalidade
+        stops = np.asarray(route[1:-1], dtype=np.int64)
+        position_weight = np.arange(1, len(stops) + 1) / len(route)
+        
+        return float(self.priority_weight[stops] @ position_weight)
+    
+    def has_time_windows(self) -> bool:
+        """
+        Indica se algum ponto tem janela de tempo diferente da padrão (0, 24)
         
-        for position, point_id in enumerate(route[1:-1], start=1):
-            point = self.delivery_points[point_id]
-            # Inverter prioridade: CRITICAL (1) deve ter mais peso, não menos
-            # Quanto mais crítica a prioridade e mais tarde na rota, maior a penalidade
-            priority_weight = 5 - point.priority.value  # CRITICAL=4, HIGH=3, MEDIUM=2, LOW=1
-            position_weight = position / len(route)
+        Sem janelas configuradas, o cálculo de horários é omitido e o
+        fitness é o mesmo de antes da existência das janelas.
+        """
+        return self._time_windows
+    
+    def _get_time_window_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Extrai tempo de serviço (horas) e janelas de tempo em arrays NumPy
+        
+        Returns:
+            Dicionário com service_time, window_open e window_close
+        """
+        return {
+            'service_time': self.service_time_hours,
+            'window_open': self.point_arrays.window_open,
+            'window_close': self.point_arrays.window_close
+        }
+    
+    def calculate_arrival_times(self, route: List[int], vehicle: Vehicle) -> np.ndarray:
+        """
+        Horário de início do atendimento em cada parada da rota
+        
+        Args:
+            route: Lista de IDs dos pontos
+            vehicle: Veículo a ser usado (velocidade média)
             
-            score += priority_weight * position_weight
+        Returns:
+            Horários (h) para route[1:], incluindo o retorno ao depósito
+        """
+        arrays = self._get_time_window_arrays()
+        return compute_arrival_times(
+            np.asarray(route)[None], self.distance_matrix, arrays['service_time'],
+            arrays['window_open'], vehicle.avg_speed, self.departure_time
+        )[0]
+    
+    def calculate_time_window_lateness(self, route: List[int], vehicle: Vehicle) -> float:
+        """
+        Soma dos atrasos (h) em relação ao fechamento das janelas de tempo
         
-        return score
+        Args:
+            route: Lista de IDs dos pontos
+            vehicle: Veículo a ser usado (velocidade média)
+            
+        Returns:
+            Atraso total em horas
+        """
+        return float(time_window_lateness(
+            np.asarray(route)[None], self.distance_matrix, **self._get_time_window_arrays(),
+            avg_speed=vehicle.avg_speed, departure_time=self.departure_time
+        )[0])
     
+    @profiled('optimizer.fitness_function')
     def fitness_function(
         self,
         route: List[int],
@@ -305,11 +726,403 @@ class RouteOptimizer:
         priority_score = self.calculate_priority_score(route)
         penalty += self.weights['priority_penalty'] * priority_score
         
+        # Penalidade por atraso nas janelas de tempo
+        if self.has_time_windows():
+            penalty += self.weights['time_window_penalty'] * self.calculate_time_window_lateness(
+                route, vehicle
+            )
+        
         # Fitness total = distância + penalidades
         fitness = self.weights['distance'] * distance + penalty
         
         return fitness, distance, penalty
     
+    def delta_swap(self, route: List[int], i: int, j: int) -> Tuple[float, float]:
+        """
+        Variação de distância e de score de prioridade ao trocar as posições
+        i e j da rota, em O(1)
+        
+        Args:
+            route: Rota antes da troca
+            i, j: Posições trocadas (excluindo os depósitos)
+            
+        Returns:
+            (delta_distancia, delta_score_prioridade)
+        """
+        if i > j:
+            i, j = j, i
+        if i == j:
+            return 0.0, 0.0
+        
+        d = self.distance_matrix
+        a, b = route[i], route[j]
+        prev_a, next_b = route[i - 1], route[j + 1]
+        
+        if j == i + 1:
+            # Posições adjacentes: a aresta (a, b) apenas muda de sentido
+            removed = d[prev_a, a] + d[a, b] + d[b, next_b]
+            added = d[prev_a, b] + d[b, a] + d[a, next_b]
+        else:
+            next_a, prev_b = route[i + 1], route[j - 1]
+            removed = d[prev_a, a] + d[a, next_a] + d[prev_b, b] + d[b, next_b]
+            added = d[prev_a, b] + d[b, next_a] + d[prev_b, a] + d[a, next_b]
+        
+        weight_a = int(self.priority_weight[a])
+        weight_b = int(self.priority_weight[b])
+        delta_priority = (weight_a - weight_b) * (j - i) / len(route)
+        
+        return float(added - removed), delta_priority
+    
+    def delta_inversion(self, route: List[int], i: int, j: int) -> Tuple[float, float]:
+        """
+        Variação de distância e de score de prioridade ao inverter o segmento
+        route[i:j] (mesma convenção de GeneticAlgorithm.mutation_inversion)
+        
+        A distância muda apenas nas duas arestas das extremidades (O(1),
+        assumindo matriz simétrica); o score de prioridade muda apenas
+        dentro do segmento (O(k)).
+        
+        Args:
+            route: Rota antes da inversão
+            i: Início do segmento
+            j: Fim do segmento (exclusivo)
+            
+        Returns:
+            (delta_distancia, delta_score_prioridade)
+        """
+        if j - i < 2:
+            return 0.0, 0.0
+        
+        d = self.distance_matrix
+        first, last = route[i], route[j - 1]
+        before, after = route[i - 1], route[j]
+        delta_distance = d[before, last] + d[first, after] - d[before, first] - d[last, after]
+        
+        # O gene na posição p passa para a posição i + j - 1 - p
+        weight = self.priority_weight[np.asarray(route[i:j], dtype=np.int64)]
+        shift = i + j - 1 - 2 * np.arange(i, j)
+        delta_priority = float(weight @ shift) / len(route)
+        
+        return float(delta_distance), delta_priority
+    
+    @profiled('optimizer.evaluate_move')
+    def evaluate_move(
+        self,
+        route: List[int],
+        move: str,
+        i: int,
+        j: int,
+        distance: float,
+        penalty: float,
+        vehicle_id: int = 0
+    ) -> Tuple[float, float, float]:
+        """
+        Avaliação incremental de uma rota após uma troca ou inversão
+        
+        Usa a distância e a penalidade já conhecidas da rota original, sem
+        percorrê-la novamente: a demanda não muda com a permutação, então a
+        penalidade de capacidade se mantém; a de autonomia é recalculada a
+        partir da nova distância e a de prioridade recebe o delta do score.
+        
+        Args:
+            route: Rota antes do movimento
+            move: 'swap' ou 'inversion'
+            i, j: Posições do movimento (ver delta_swap / delta_inversion)
+            distance: Distância da rota original
+            penalty: Penalidade da rota original
+            vehicle_id: ID do veículo a ser usado
+            
+        Returns:
+            (fitness_total, distancia, penalidade) da rota após o movimento
+        """
+        vehicle = self.vehicles[vehicle_id] if vehicle_id < len(self.vehicles) else self.vehicles[0]
+        
+        if move == 'swap':
+            delta_distance, delta_priority = self.delta_swap(route, i, j)
+        elif move == 'inversion':
+            delta_distance, delta_priority = self.delta_inversion(route, i, j)
+        else:
+            raise ValueError(f"Movimento desconhecido: {move!r}")
+        
+        new_distance = distance + delta_distance
+        old_excess = max(0, distance - vehicle.max_distance)
+        new_excess = max(0, new_distance - vehicle.max_distance)
+        
+        new_penalty = (
+            penalty
+            + self.weights['autonomy_penalty'] * (new_excess - old_excess)
+            + self.weights['priority_penalty'] * delta_priority
+        )
+        
+        # O atraso depende de todos os horários seguintes ao movimento: é
+        # recalculado em O(n) para as rotas antes e depois do movimento
+        if self.has_time_windows():
+            moved = list(route)
+            if move == 'swap':
+                moved[i], moved[j] = moved[j], moved[i]
+            else:
+                moved[i:j] = moved[i:j][::-1]
+            new_penalty += self.weights['time_window_penalty'] * (
+                self.calculate_time_window_lateness(moved, vehicle)
+                - self.calculate_time_window_lateness(route, vehicle)
+            )
+        
+        fitness = self.weights['distance'] * new_distance + new_penalty
+        
+        return fitness, new_distance, new_penalty
+    
+    def _get_point_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Demanda e peso de prioridade de cada ponto (arrays armazenados)
+        
+        Returns:
+            (demandas, pesos_de_prioridade) indexados pelo ID do ponto
+        """
+        return self.point_demand, self.priority_weight
+    
+    @profiled('optimizer.fitness_function_batch')
+    def fitness_function_batch(
+        self,
+        routes: np.ndarray,
+        vehicle_id: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Versão vetorizada de fitness_function para uma população inteira
+        
+        Args:
+            routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos,
+                    com o depósito na primeira e na última coluna
+            vehicle_id: ID do veículo a ser usado
+            
+        Returns:
+            (fitness, distancias, penalidades) como arrays de tamanho num_rotas
+        """
+        arrays, params = self.get_batch_fitness_inputs(vehicle_id)
+        return evaluate_routes_batch(np.asarray(routes), **arrays, **params)
+    
+    def objectives_batch(
+        self,
+        routes: np.ndarray,
+        vehicle_id: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Objetivos separados de uma população (ver evaluate_objectives_batch)
+        
+        Args:
+            routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+            vehicle_id: ID do veículo a ser usado
+            
+        Returns:
+            (objetivos, violacao), com as colunas de objective_names()
+        """
+        arrays, params = self.get_batch_fitness_inputs(vehicle_id)
+        params.pop('weights')
+        return evaluate_objectives_batch(np.asarray(routes), **arrays, **params)
+    
+    def objective_names(self) -> List[str]:
+        """Nomes das colunas retornadas por objectives_batch"""
+        names = ['distance', 'priority']
+        if self.has_time_windows():
+            names.append('lateness')
+        return names
+    
+    def get_batch_fitness_inputs(self, vehicle_id: int = 0) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """
+        Reúne os dados usados por evaluate_routes_batch
+        
+        Separa os arrays (matriz de distâncias e atributos dos pontos) dos
+        parâmetros escalares, para que os arrays possam ser compartilhados
+        entre processos (ver parallel.ParallelFitnessEvaluator).
+        
+        Args:
+            vehicle_id: ID do veículo a ser usado
+            
+        Returns:
+            (arrays, parametros) a serem passados como argumentos nomeados
+        """
+        vehicle = self.vehicles[vehicle_id] if vehicle_id < len(self.vehicles) else self.vehicles[0]
+        demand, priority_weight = self._get_point_arrays()
+        
+        arrays = {
+            'distance_matrix': self.distance_matrix,
+            'demand': demand,
+            'priority_weight': priority_weight
+        }
+        params = {
+            'capacity': vehicle.capacity,
+            'max_distance': vehicle.max_distance,
+            'weights': dict(self.weights)
+        }
+        if self.has_time_windows():
+            arrays.update(self._get_time_window_arrays())
+            params['avg_speed'] = vehicle.avg_speed
+            params['departure_time'] = self.departure_time
+        return arrays, params
+    
+    def add_delivery_point(self, point: DeliveryPoint) -> int:
+        """
+        Acrescenta um ponto de entrega (ex.: entrega urgente no meio do dia)
+        
+        A matriz de distâncias ganha uma linha e uma coluna, calculadas
+        apenas para o novo ponto. No modo 'mmap' a matriz estendida passa a
+        ficar em memória.
+        
+        Args:
+            point: Novo ponto; o otimizador guarda uma cópia com o `id`
+                ajustado para o próximo índice (o objeto recebido não muda)
+            
+        Returns:
+            ID atribuído ao ponto
+        """
+        point = _TrackedDeliveryPoint.track(
+            replace(point, id=self.num_points), self.num_points, self._point_changed
+        )
+        self.delivery_points.append(point)  # mantém os medicamentos do ponto
+        self._set_point_arrays(
+            self.point_arrays.concatenate(DeliveryPointArrays.from_delivery_points([point]))
+        )
+        
+        if isinstance(self.distance_matrix, SparseDistanceMatrix):
+            self.distance_matrix.add_point(point.lat, point.lon)
+            return point.id
+        
+        lats, lons = self.point_arrays.lat, self.point_arrays.lon
+        row = haversine_block(lats[-1:], lons[-1:], lats, lons, self.distance_matrix.dtype)[0]
+        
+        n = point.id
+        matrix = np.empty((n + 1, n + 1), dtype=self.distance_matrix.dtype)
+        matrix[:n, :n] = self.distance_matrix
+        matrix[n, :] = row
+        matrix[:, n] = row
+        self.distance_matrix = matrix
+        
+        return point.id
+    
+    def remove_delivery_points(self, point_ids: List[int]) -> np.ndarray:
+        """
+        Remove pontos de entrega (ex.: entregas canceladas)
+        
+        Os pontos restantes são renumerados na ordem original (em cópias; os
+        objetos fornecidos pelo chamador não mudam) e a matriz de distâncias
+        perde as linhas e colunas correspondentes.
+        
+        Args:
+            point_ids: IDs dos pontos a remover (o depósito não pode ser removido)
+            
+        Returns:
+            Mapeamento ID antigo -> ID novo (-1 para os removidos), a ser
+            usado em repair_route
+        """
+        if self.depot_id in point_ids:
+            raise ValueError("O depósito não pode ser removido")
+        
+        keep = np.ones(self.num_points, dtype=bool)
+        keep[list(point_ids)] = False
+        mapping = np.where(keep, np.cumsum(keep) - 1, -1)
+        
+        if self._delivery_points is not None:
+            # As linhas mudam de índice: os objetos antigos deixam de
+            # escrever nos arrays e os restantes são copiados e religados
+            for point in self._delivery_points:
+                point.detach()
+            kept_points = [p for p, kept in zip(self._delivery_points, keep) if kept]
+            self._delivery_points = self._track_points(
+                [replace(p, id=new_id) for new_id, p in enumerate(kept_points)]
+            )
+        self.depot_id = int(mapping[self.depot_id])
+        self._set_point_arrays(replace(
+            self.point_arrays.take(keep), ids=np.arange(int(keep.sum()), dtype=np.int64)
+        ))
+        
+        if isinstance(self.distance_matrix, SparseDistanceMatrix):
+            self.distance_matrix.remove_points(keep)
+        else:
+            self.distance_matrix = np.asarray(self.distance_matrix)[np.ix_(keep, keep)]
+        
+        return mapping
+    
+    def cheapest_insertion(self, route: List[int], point_id: int) -> List[int]:
+        """
+        Insere um ponto na posição da rota que menos aumenta a distância
+        
+        Args:
+            route: Rota (depósito no início e no fim)
+            point_id: Ponto a inserir
+            
+        Returns:
+            Nova rota com o ponto inserido
+        """
+        stops = np.asarray(route)
+        d = self.distance_matrix
+        added = d[stops[:-1], point_id] + d[point_id, stops[1:]] - d[stops[:-1], stops[1:]]
+        position = int(np.argmin(added)) + 1
+        
+        return list(route[:position]) + [point_id] + list(route[position:])
+    
+    def repair_route(self, route: List[int], mapping: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Adapta uma rota anterior ao conjunto atual de pontos
+        
+        Renumera os pontos pelo mapeamento de remove_delivery_points, descarta
+        os removidos e insere os pontos ausentes (ex.: adicionados por
+        add_delivery_point) por inserção mais barata.
+        
+        Args:
+            route: Rota calculada antes das mudanças
+            mapping: Mapeamento ID antigo -> ID novo (opcional)
+            
+        Returns:
+            Rota válida para os pontos atuais
+        """
+        stops = [int(p) for p in route[1:-1]]
+        if mapping is not None:
+            stops = [int(mapping[p]) for p in stops if p < len(mapping)]
+        
+        seen = {self.depot_id}
+        kept = []
+        for point_id in stops:
+            if 0 <= point_id < self.num_points and point_id not in seen:
+                seen.add(point_id)
+                kept.append(point_id)
+        
+        repaired = [self.depot_id] + kept + [self.depot_id]
+        for point_id in range(self.num_points):
+            if point_id not in seen:
+                repaired = self.cheapest_insertion(repaired, point_id)
+        
+        return repaired
+    
+    def split_giant_tour(self, route: List[int]) -> Tuple[List[Tuple[int, List[int]]], float, float]:
+        """
+        Particiona uma rota gigante em viagens, uma por veículo (Split de Prins)
+        
+        Mantém a ordem de visita da rota e escolhe os pontos de corte que
+        minimizam a soma dos fitness das viagens, respeitando a capacidade e
+        a autonomia de cada veículo (ver split.prins_split).
+        
+        Args:
+            route: Rota completa (depósito no início e no fim)
+            
+        Returns:
+            (viagens, fitness_total, distancia_total), com viagens como
+            lista de (vehicle_id, sub_rota)
+        """
+        return prins_split(np.asarray(route[1:-1]), **self._split_arguments())
+    
+    def _split_arguments(self) -> Dict:
+        """Argumentos comuns de prins_split e prins_split_batch"""
+        demand, priority_weight = self._get_point_arrays()
+        return {
+            'distance_matrix': self.distance_matrix,
+            'demand': demand,
+            'priority_weight': priority_weight,
+            'depot': self.depot_id,
+            'capacities': np.array([v.capacity for v in self.vehicles], dtype=np.float64),
+            'max_distances': np.array([v.max_distance for v in self.vehicles], dtype=np.float64),
+            'weights': self.weights,
+            'max_trip_stops': self.split_max_trip_stops
+        }
+    
     def split_route_for_multiple_vehicles(
         self,
         route: List[int]
@@ -318,46 +1131,73 @@ class RouteOptimizer:
         Divide uma rota grande em múltiplas rotas menores
         para múltiplos veículos
         
+        Usa a divisão ótima de split_giant_tour; a i-ésima sub-rota é
+        atendida pelo veículo de índice vehicle_id retornado por ela.
+        
         Args:
             route: Rota completa
             
         Returns:
             Lista de sub-rotas
         """
-        # Remover depósitos do início e fim
-        points = route[1:-1]
-        
-        # Ordenar por prioridade
-        points_with_priority = [
-            (p, self.delivery_points[p].priority.value)
-            for p in points
-        ]
-        points_with_priority.sort(key=lambda x: x[1])
+        trips, _, _ = self.split_giant_tour(route)
+        return [sub_route for _, sub_route in trips]
+    
+    def fitness_function_split(self, route: List[int]) -> Tuple[float, float, float]:
+        """
+        Fitness de VRP com capacidade (CVRP) de uma rota gigante
         
-        # Dividir em sub-rotas baseado na capacidade
-        sub_routes = []
-        current_route = [self.depot_id]
-        current_capacity = 0
+        A rota é dividida entre os veículos por split_giant_tour; o fitness
+        é a soma dos fitness das viagens. Com janelas de tempo, o atraso de
+        cada viagem é somado depois da divisão (o split não o considera).
         
-        for point_id, _ in points_with_priority:
-            point = self.delivery_points[point_id]
-            
-            # Se adicionar este ponto exceder a capacidade, iniciar nova rota
-            if current_capacity + point.demand > self.vehicles[0].capacity and len(current_route) > 1:
-                current_route.append(self.depot_id)
-                sub_routes.append(current_route)
-                current_route = [self.depot_id]
-                current_capacity = 0
+        Args:
+            route: Rota completa (depósito no início e no fim)
             
-            current_route.append(point_id)
-            current_capacity += point.demand
+        Returns:
+            (fitness_total, distancia, penalidade)
+        """
+        trips, fitness, distance = self.split_giant_tour(route)
+        if self.has_time_windows():
+            fitness += self.weights['time_window_penalty'] * sum(
+                self.calculate_time_window_lateness(sub_route, self.vehicles[vehicle_idx])
+                for vehicle_idx, sub_route in trips
+            )
+        return fitness, distance, fitness - self.weights['distance'] * distance
+    
+    def fitness_function_split_batch(
+        self,
+        routes: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Versão em lote de fitness_function_split (mesma assinatura de
+        fitness_function_batch, para uso no GeneticAlgorithm)
+        
+        A PD do split é calculada para todas as rotas de uma vez
+        (split.prins_split_batch). Com janelas de tempo as viagens de cada
+        rota são reconstruídas para somar o atraso, como em
+        fitness_function_split.
         
-        # Adicionar última rota
-        if len(current_route) > 1:
-            current_route.append(self.depot_id)
-            sub_routes.append(current_route)
+        Args:
+            routes: Matriz (num_rotas, tamanho_rota) de rotas gigantes
+            
+        Returns:
+            (fitness, distancias, penalidades) como arrays de tamanho num_rotas
+        """
+        tours = np.asarray(routes)[:, 1:-1]
+        if not self.has_time_windows():
+            fitness, distance = prins_split_batch(tours, **self._split_arguments())
+            return fitness, distance, fitness - self.weights['distance'] * distance
         
-        return sub_routes
+        fitness, distance, trips = prins_split_batch(
+            tours, return_trips=True, **self._split_arguments()
+        )
+        fitness = fitness + self.weights['time_window_penalty'] * np.array([
+            sum(self.calculate_time_window_lateness(sub_route, self.vehicles[vehicle_idx])
+                for vehicle_idx, sub_route in route_trips)
+            for route_trips in trips
+        ])
+        return fitness, distance, fitness - self.weights['distance'] * distance
     
     def get_route_info(self, route: List[int], vehicle_id: int = 0) -> Dict:
         """
@@ -378,12 +1218,18 @@ class RouteOptimizer:
         
         # Calcular tempo estimado
         travel_time = distance / vehicle.avg_speed  # horas
-        service_time = sum(
-            self.delivery_points[p].service_time / 60  # converter para horas
-            for p in route[1:-1]
+        service_time = float(
+            self.service_time_hours[np.asarray(route[1:-1], dtype=np.int64)].sum()
         )
         total_time = travel_time + service_time
         
+        # Com janelas de tempo, o tempo total inclui as esperas
+        lateness = 0.0
+        if self.has_time_windows():
+            arrival = self.calculate_arrival_times(route, vehicle)
+            total_time = float(arrival[-1]) - self.departure_time
+            lateness = self.calculate_time_window_lateness(route, vehicle)
+        
         # Calcular custo
         cost = distance * vehicle.cost_per_km
         
@@ -397,6 +1243,7 @@ class RouteOptimizer:
             'travel_time_hours': round(travel_time, 2),
             'service_time_hours': round(service_time, 2),
             'total_time_hours': round(total_time, 2),
+            'time_window_lateness_hours': round(lateness, 2),
             'cost_reais': round(cost, 2),
             'num_deliveries': len(route) - 2,
             'capacity_usage_percent': round((demand / vehicle.capacity) * 100, 1),
@@ -404,6 +1251,200 @@ class RouteOptimizer:
         }
 
 
+def evaluate_routes_batch(
+    routes: np.ndarray,
+    distance_matrix: np.ndarray,
+    demand: np.ndarray,
+    priority_weight: np.ndarray,
+    capacity: float,
+    max_distance: float,
+    weights: Dict[str, float],
+    service_time: Optional[np.ndarray] = None,
+    window_open: Optional[np.ndarray] = None,
+    window_close: Optional[np.ndarray] = None,
+    avg_speed: float = 40.0,
+    departure_time: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula fitness, distância e penalidade de várias rotas de uma só vez
+    
+    Reproduz RouteOptimizer.fitness_function usando indexação avançada
+    em vez de laços Python, para que a população inteira seja avaliada
+    em uma única passada.
+    
+    Args:
+        routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+        distance_matrix: Matriz NxN de distâncias
+        demand: Demanda (kg) de cada ponto
+        priority_weight: Peso de prioridade de cada ponto (CRITICAL=4 ... LOW=1)
+        capacity: Capacidade do veículo (kg)
+        max_distance: Autonomia do veículo (km)
+        weights: Pesos da função fitness (RouteOptimizer.weights)
+        service_time, window_open, window_close: Tempo de serviço (h) e
+            janela de tempo de cada ponto; se omitidos, as janelas de tempo
+            não são avaliadas
+        avg_speed: Velocidade média do veículo (km/h)
+        departure_time: Horário de saída do depósito (h)
+        
+    Returns:
+        (fitness, distancias, penalidades) como arrays de tamanho num_rotas
+    """
+    route_length = routes.shape[1]
+    stops = routes[:, 1:-1]
+    
+    # Distância: soma das arestas consecutivas de cada rota
+    distance = distance_matrix[routes[:, :-1], routes[:, 1:]].sum(axis=1)
+    
+    # Excesso de capacidade e de autonomia
+    excess_capacity = np.maximum(demand[stops].sum(axis=1, dtype=np.float64) - capacity, 0.0)
+    excess_distance = np.maximum(distance - max_distance, 0.0)
+    
+    # Score de prioridade: peso da prioridade x posição relativa na rota
+    position_weight = np.arange(1, route_length - 1) / route_length
+    priority_score = priority_weight[stops] @ position_weight
+    
+    penalty = (
+        weights['capacity_penalty'] * excess_capacity
+        + weights['autonomy_penalty'] * excess_distance
+        + weights['priority_penalty'] * priority_score
+    )
+    if service_time is not None:
+        penalty = penalty + weights['time_window_penalty'] * time_window_lateness(
+            routes, distance_matrix, service_time, window_open, window_close,
+            avg_speed, departure_time
+        )
+    fitness = weights['distance'] * distance + penalty
+    
+    return fitness, distance, penalty
+
+
+def evaluate_objectives_batch(
+    routes: np.ndarray,
+    distance_matrix: np.ndarray,
+    demand: np.ndarray,
+    priority_weight: np.ndarray,
+    capacity: float,
+    max_distance: float,
+    service_time: Optional[np.ndarray] = None,
+    window_open: Optional[np.ndarray] = None,
+    window_close: Optional[np.ndarray] = None,
+    avg_speed: float = 40.0,
+    departure_time: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Objetivos separados de várias rotas, sem agregação por pesos
+    
+    Usado pelo modo multiobjetivo (NSGA-II): em vez de somar distância,
+    prioridades e restrições em um único fitness, cada critério é uma
+    coluna, e as restrições violadas formam um valor à parte.
+    
+    Args:
+        routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+        distance_matrix: Matriz NxN de distâncias
+        demand: Demanda (kg) de cada ponto
+        priority_weight: Peso de prioridade de cada ponto (CRITICAL=4 ... LOW=1)
+        capacity: Capacidade do veículo (kg)
+        max_distance: Autonomia do veículo (km)
+        service_time, window_open, window_close, avg_speed, departure_time:
+            Janelas de tempo (ver evaluate_routes_batch); se informadas, o
+            atraso total vira um terceiro objetivo
+        
+    Returns:
+        (objetivos, violacao): matriz (num_rotas, 2 ou 3) com distância,
+        score de prioridade e atraso, e array com a violação relativa de
+        capacidade e autonomia (0 = rota viável)
+    """
+    route_length = routes.shape[1]
+    stops = routes[:, 1:-1]
+    
+    distance = distance_matrix[routes[:, :-1], routes[:, 1:]].sum(axis=1)
+    position_weight = np.arange(1, route_length - 1) / route_length
+    priority_score = priority_weight[stops] @ position_weight
+    
+    columns = [distance, priority_score]
+    if service_time is not None:
+        columns.append(time_window_lateness(
+            routes, distance_matrix, service_time, window_open, window_close,
+            avg_speed, departure_time
+        ))
+    
+    violation = (
+        np.maximum(demand[stops].sum(axis=1, dtype=np.float64) - capacity, 0.0) / capacity
+        + np.maximum(distance - max_distance, 0.0) / max_distance
+    )
+    
+    return np.column_stack(columns), violation
+
+
+def compute_arrival_times(
+    routes: np.ndarray,
+    distance_matrix: np.ndarray,
+    service_time: np.ndarray,
+    window_open: np.ndarray,
+    avg_speed: float,
+    departure_time: float = 0.0
+) -> np.ndarray:
+    """
+    Horário de início do atendimento em cada parada, para várias rotas
+    
+    Sem espera, o horário é a soma acumulada dos tempos de viagem
+    (distância / velocidade) e de serviço. Chegando antes da abertura, o
+    veículo espera, o que atrasa todas as paradas seguintes; a espera
+    acumulada é o máximo acumulado de (abertura - horário sem espera), de
+    modo que tudo é calculado com cumsum e maximum.accumulate, sem laços.
+    
+    Args:
+        routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+        distance_matrix: Matriz NxN de distâncias (km)
+        service_time: Tempo de serviço (h) de cada ponto
+        window_open: Abertura da janela (h) de cada ponto
+        avg_speed: Velocidade média do veículo (km/h)
+        departure_time: Horário de saída do depósito (h)
+        
+    Returns:
+        Matriz (num_rotas, tamanho_rota - 1) com os horários de routes[:, 1:]
+    """
+    travel = distance_matrix[routes[:, :-1], routes[:, 1:]] / avg_speed
+    
+    # Serviço realizado antes de cada trecho (nenhum no depósito de saída)
+    service = service_time[routes[:, :-1]]
+    service[:, 0] = 0.0
+    
+    arrival = departure_time + np.cumsum(travel + service, axis=1)
+    waiting = np.maximum.accumulate(window_open[routes[:, 1:]] - arrival, axis=1)
+    
+    return arrival + np.maximum(waiting, 0.0)
+
+
+def time_window_lateness(
+    routes: np.ndarray,
+    distance_matrix: np.ndarray,
+    service_time: np.ndarray,
+    window_open: np.ndarray,
+    window_close: np.ndarray,
+    avg_speed: float,
+    departure_time: float = 0.0
+) -> np.ndarray:
+    """
+    Soma dos atrasos (h) de cada rota em relação ao fechamento das janelas
+    
+    Args:
+        routes: Matriz (num_rotas, tamanho_rota) de IDs dos pontos
+        distance_matrix: Matriz NxN de distâncias (km)
+        service_time: Tempo de serviço (h) de cada ponto
+        window_open, window_close: Janela de tempo (h) de cada ponto
+        avg_speed: Velocidade média do veículo (km/h)
+        departure_time: Horário de saída do depósito (h)
+        
+    Returns:
+        Array com o atraso total de cada rota
+    """
+    arrival = compute_arrival_times(
+        routes, distance_matrix, service_time, window_open, avg_speed, departure_time
+    )
+    return np.maximum(arrival - window_close[routes[:, 1:]], 0.0).sum(axis=1)
+
+
 def load_medications_from_csv(medications_file: str = '../data/medicamentos.csv') -> List[Dict]:
     """
     Carrega catálogo de medicamentos do CSV
@@ -417,9 +1458,7 @@ def load_medications_from_csv(medications_file: str = '../data/medicamentos.csv'
     import pandas as pd
     import os
     
-    if not os.path.exists(medications_file):
-        medications_file = os.path.join(os.path.dirname(__file__), medications_file)
-    
+    medications_file = _resolve_data_path(medications_file)
     if not os.path.exists(medications_file):
         return []
     
@@ -427,11 +1466,190 @@ def load_medications_from_csv(medications_file: str = '../data/medicamentos.csv'
     return df.to_dict('records')
 
 
+def _resolve_data_path(path: str) -> str:
+    """Caminho relativo ao diretório atual ou, se não existir, a este módulo"""
+    import os
+    
+    if not os.path.exists(path):
+        path = os.path.join(os.path.dirname(__file__), path)
+    return path
+
+
+def aggregate_medication_lines(
+    num_points: int,
+    point_index: np.ndarray,
+    weight: np.ndarray,
+    priority: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Agrega as linhas de medicamentos por ponto, sem laço em Python
+    
+    Args:
+        num_points: Número de pontos
+        point_index: Índice do ponto de cada linha
+        weight: Peso total (kg) de cada linha
+        priority: Código de prioridade de cada linha (Priority.value)
+        
+    Returns:
+        (demanda, prioridade_mais_alta, tem_linhas) por ponto; pontos sem
+        linhas ficam com demanda 0 e tem_linhas False
+    """
+    point_index = np.asarray(point_index, dtype=np.int64)
+    demand = np.bincount(point_index, weights=weight, minlength=num_points)
+    
+    # Menor código = maior prioridade
+    highest = np.full(num_points, max(p.value for p in Priority), dtype=np.int8)
+    np.minimum.at(highest, point_index, np.asarray(priority, dtype=np.int8))
+    has_lines = np.bincount(point_index, minlength=num_points) > 0
+    
+    return demand, highest, has_lines
+
+
+def random_medication_lines(
+    num_points: int,
+    catalog_size: int,
+    rng: np.random.Generator,
+    skip: Optional[np.ndarray] = None,
+    min_items: int = 2,
+    max_items: int = 5
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorteia de min_items a max_items medicamentos distintos por ponto
+    
+    Args:
+        num_points: Número de pontos
+        catalog_size: Número de medicamentos no catálogo
+        rng: Gerador de números aleatórios
+        skip: Máscara dos pontos sem medicamentos (ex.: o depósito)
+        min_items, max_items: Faixa do número de itens por ponto
+        
+    Returns:
+        (indice_do_ponto, indice_no_catalogo) de cada linha
+    """
+    counts = np.minimum(rng.integers(min_items, max_items + 1, num_points), catalog_size)
+    if skip is not None:
+        counts[skip] = 0
+    
+    # max_items índices distintos por ponto (sem matriz pontos x catálogo);
+    # a ordem do algoritmo de Floyd não é uniforme, então cada linha é
+    # embaralhada antes de manter só os seus primeiros `counts` itens
+    chosen = rng.permuted(random_subsets(rng, num_points, catalog_size, max_items), axis=1)
+    selected = np.arange(chosen.shape[1]) < counts[:, None]
+    
+    return np.nonzero(selected)[0], chosen[selected]
+
+
+def _load_columns(
+    locations_file: str,
+    medications_file: str,
+    medication_lines_file: Optional[str],
+    assign_medications: bool,
+    seed: Optional[int]
+) -> Tuple[DeliveryPointArrays, Optional[Dict[str, np.ndarray]], List[Dict]]:
+    """Leitura colunar compartilhada por load_arrays_from_csv e load_data_from_csv"""
+    import pandas as pd
+    
+    df = pd.read_csv(_resolve_data_path(locations_file))
+    priority_codes = {p.name: p.value for p in Priority}
+    n = len(df)
+    
+    # Janela de tempo opcional (colunas time_window_start/time_window_end)
+    if 'time_window_start' in df.columns:
+        window_open = df['time_window_start'].to_numpy(dtype=np.float64)
+        window_close = df['time_window_end'].to_numpy(dtype=np.float64)
+    else:
+        window_open, window_close = np.zeros(n), np.full(n, 24.0)
+    
+    points = DeliveryPointArrays(
+        ids=df['id'].to_numpy(dtype=np.int64),
+        names=df['name'].to_numpy(dtype=object),
+        lat=df['lat'].to_numpy(dtype=np.float64),
+        lon=df['lon'].to_numpy(dtype=np.float64),
+        demand=df['demand'].to_numpy(dtype=np.float64),
+        priority=df['priority'].map(priority_codes).to_numpy(dtype=np.int8),
+        service_time=df['service_time'].to_numpy(dtype=np.float64),
+        window_open=window_open,
+        window_close=window_close
+    )
+    
+    catalog = load_medications_from_csv(medications_file)
+    if medication_lines_file is not None:
+        # Linhas explícitas: colunas point_id, medication_id, quantity
+        lines_df = pd.read_csv(_resolve_data_path(medication_lines_file))
+        catalog_ids = pd.Index([int(med['id']) for med in catalog])
+        lines = {
+            'point_index': pd.Index(points.ids).get_indexer(lines_df['point_id']),
+            'catalog_index': catalog_ids.get_indexer(lines_df['medication_id']),
+            'quantity': lines_df['quantity'].to_numpy(dtype=np.float64)
+        }
+        if (lines['point_index'] < 0).any() or (lines['catalog_index'] < 0).any():
+            raise ValueError("Linhas de medicamentos com ponto ou medicamento desconhecido")
+    elif assign_medications and catalog:
+        # Associação aleatória (exceto depósito), com quantidade baseada na
+        # demanda típica de cada medicamento
+        rng = np.random.default_rng(seed)
+        typical = np.array([float(med.get('typical_demand', 1.0)) for med in catalog])
+        point_index, catalog_index = random_medication_lines(
+            n, len(catalog), rng, skip=points.ids == 0
+        )
+        lines = {
+            'point_index': point_index,
+            'catalog_index': catalog_index,
+            'quantity': rng.uniform(0.5, 2.0, len(point_index)) * typical[catalog_index]
+        }
+    else:
+        return points, None, catalog
+    
+    # Demanda recalculada a partir dos medicamentos e prioridade igual à
+    # mais alta entre eles (assumindo 1kg por unidade)
+    catalog_priority = np.array([priority_codes[med['priority']] for med in catalog], dtype=np.int8)
+    demand, highest, has_lines = aggregate_medication_lines(
+        n, lines['point_index'], lines['quantity'], catalog_priority[lines['catalog_index']]
+    )
+    points.demand = np.where(has_lines, demand, points.demand)
+    points.priority = np.where(has_lines, highest, points.priority).astype(np.int8)
+    
+    return points, lines, catalog
+
+
+def load_arrays_from_csv(
+    locations_file: str = '../data/locais_entrega.csv',
+    medications_file: str = '../data/medicamentos.csv',
+    medication_lines_file: Optional[str] = None,
+    assign_medications: bool = True,
+    seed: Optional[int] = None
+) -> DeliveryPointArrays:
+    """
+    Carrega os pontos de entrega em formato colunar, sem um objeto por linha
+    
+    Indicado para importações com dezenas de milhares de pontos e linhas de
+    medicamentos; o resultado alimenta RouteOptimizer.from_arrays.
+    
+    Args:
+        locations_file: Caminho para o CSV de locais de entrega
+        medications_file: Caminho para o CSV de medicamentos (catálogo)
+        medication_lines_file: CSV opcional com os medicamentos de cada
+            ponto (colunas point_id, medication_id, quantity)
+        assign_medications: Sem medication_lines_file, sorteia de 2 a 5
+            medicamentos por local
+        seed: Semente do sorteio dos medicamentos
+    
+    Returns:
+        Pontos em formato colunar, com demanda e prioridade agregadas
+    """
+    points, _, _ = _load_columns(
+        locations_file, medications_file, medication_lines_file, assign_medications, seed
+    )
+    return points
+
+
 def load_data_from_csv(
     locations_file: str = '../data/locais_entrega.csv',
     medications_file: str = '../data/medicamentos.csv',
     vehicles_file: str = None,
-    assign_medications: bool = True
+    assign_medications: bool = True,
+    medication_lines_file: Optional[str] = None,
+    seed: Optional[int] = None
 ) -> Tuple[List[DeliveryPoint], List[Vehicle]]:
     """
     Carrega dados de entrega a partir de arquivos CSV
@@ -441,77 +1659,50 @@ def load_data_from_csv(
         medications_file: Caminho para o CSV de medicamentos
         vehicles_file: Caminho para o CSV de veículos (opcional)
         assign_medications: Se True, associa medicamentos aleatórios aos locais
+        medication_lines_file: CSV opcional com os medicamentos de cada ponto
+            (ver load_arrays_from_csv)
+        seed: Semente do sorteio dos medicamentos
     
     Returns:
         (delivery_points, vehicles)
     """
     import pandas as pd
     import os
-    import random
-    
-    # Carregar locais de entrega
-    if not os.path.exists(locations_file):
-        locations_file = os.path.join(os.path.dirname(__file__), locations_file)
-    
-    df_locations = pd.read_csv(locations_file)
-    
-    # Carregar medicamentos
-    medications_catalog = load_medications_from_csv(medications_file)
-    
-    delivery_points = []
-    for _, row in df_locations.iterrows():
-        point = DeliveryPoint(
-            id=int(row['id']),
-            name=row['name'],
-            lat=float(row['lat']),
-            lon=float(row['lon']),
-            demand=float(row['demand']),
-            priority=Priority[row['priority']],
-            service_time=float(row['service_time'])
-        )
-        
-        # Associar medicamentos aos pontos (exceto depósito)
-        if assign_medications and medications_catalog and point.id != 0:
-            # Número aleatório de medicamentos (2 a 5 itens por local)
-            num_items = random.randint(2, 5)
-            selected_meds = random.sample(medications_catalog, min(num_items, len(medications_catalog)))
-            
-            for med_data in selected_meds:
-                # Quantidade aleatória baseada na demanda típica
-                typical_demand = float(med_data.get('typical_demand', 1.0))
-                quantity = random.uniform(0.5, 2.0) * typical_demand
-                
-                medication = Medication(
-                    id=int(med_data['id']),
-                    name=med_data['name'],
-                    type=med_data['type'],
-                    priority=Priority[med_data['priority']],
-                    quantity=quantity,
-                    weight_per_unit=1.0  # Assumindo 1kg por unidade
-                )
-                point.medications.append(medication)
-            
-            # Recalcular demanda baseada nos medicamentos
-            point.demand = point.calculate_demand()
-            # Atualizar prioridade para a mais alta dos medicamentos
-            point.priority = point.get_highest_priority()
-        
-        delivery_points.append(point)
+    
+    points, lines, catalog = _load_columns(
+        locations_file, medications_file, medication_lines_file, assign_medications, seed
+    )
+    delivery_points = points.to_delivery_points()
+    
+    # Medicamentos de cada ponto (a demanda e a prioridade já vêm agregadas)
+    if lines is not None:
+        for index, item, quantity in zip(
+            lines['point_index'].tolist(), lines['catalog_index'].tolist(), lines['quantity'].tolist()
+        ):
+            med_data = catalog[item]
+            delivery_points[index].medications.append(Medication(
+                id=int(med_data['id']),
+                name=med_data['name'],
+                type=med_data['type'],
+                priority=Priority[med_data['priority']],
+                quantity=quantity,
+                weight_per_unit=1.0  # Assumindo 1kg por unidade
+            ))
     
     # Carregar veículos (se arquivo fornecido) ou usar dados padrão
     if vehicles_file and os.path.exists(vehicles_file):
         df_vehicles = pd.read_csv(vehicles_file)
-        vehicles = []
-        for _, row in df_vehicles.iterrows():
-            vehicle = Vehicle(
-                id=int(row['id']),
-                name=row['name'],
-                capacity=float(row['capacity']),
-                max_distance=float(row['max_distance']),
-                avg_speed=float(row['avg_speed']),
-                cost_per_km=float(row['cost_per_km'])
+        vehicles = [
+            Vehicle(
+                id=int(vehicle_id), name=name, capacity=float(capacity),
+                max_distance=float(max_distance), avg_speed=float(avg_speed),
+                cost_per_km=float(cost_per_km)
+            )
+            for vehicle_id, name, capacity, max_distance, avg_speed, cost_per_km in zip(
+                df_vehicles['id'], df_vehicles['name'], df_vehicles['capacity'],
+                df_vehicles['max_distance'], df_vehicles['avg_speed'], df_vehicles['cost_per_km']
             )
-            vehicles.append(vehicle)
+        ]
     else:
         # Veículos padrão
         vehicles = [
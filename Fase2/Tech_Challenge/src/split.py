@@ -0,0 +1,219 @@
+"""
+Divisao Otima de Rotas (Split de Prins)
+
+Este modulo implementa o procedimento Split para o VRP: dada uma rota
+gigante (cromossomo do AG com todos os pontos), encontra por programacao
+dinamica a particao em viagens consecutivas, uma por veiculo, que minimiza
+a soma dos fitness das viagens.
+
+- Frota heterogenea: cada veiculo tem sua capacidade e autonomia; os
+  veiculos sao considerados na ordem da lista e podem ficar sem viagem
+- Distancia, demanda e score de prioridade de qualquer trecho sao obtidos
+  em O(1) por somas de prefixo; cada veiculo e uma camada da PD calculada
+  por tamanho de viagem, com fatias contiguas, para toda a populacao de
+  uma vez (prins_split_batch)
+- Janela limitada: com max_trip_stops = K, cada viagem tem no maximo K
+  pontos e a PD custa O(n K) por veiculo em vez de O(n^2); K nunca fica
+  abaixo de ceil(n / veiculos), de modo que sempre existe uma divisao
+- O custo de cada viagem e exatamente RouteOptimizer.fitness_function da
+  sub-rota [deposito, ..., deposito]; restricoes violadas sao penalizadas,
+  de modo que sempre existe uma solucao
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+def _split_tables(
+    tours: np.ndarray,
+    distance_matrix,
+    demand: np.ndarray,
+    priority_weight: np.ndarray,
+    depot: int,
+    capacities: np.ndarray,
+    max_distances: np.ndarray,
+    weights: Dict[str, float],
+    max_trip_stops: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tabelas da PD para uma matriz (num_rotas, n) de rotas gigantes
+
+    Returns:
+        (cost, start, trip_distance), cada uma com forma
+        (veiculos + 1, num_rotas, n + 1): cost[j, p, i] e o melhor custo
+        atendendo os i primeiros pontos da rota p com os j primeiros
+        veiculos; start[j, p, i] e o inicio da viagem do veiculo j
+        (-1 = sem viagem) e trip_distance[j, p, i] sua distancia
+    """
+    num_routes, n = tours.shape
+    n_vehicles = len(capacities)
+    window = n if max_trip_stops is None else min(n, max(max_trip_stops, -(-n // n_vehicles)))
+
+    d = distance_matrix
+    from_depot = np.asarray(d[np.full(tours.shape, depot), tours], dtype=np.float64)
+    to_depot = np.asarray(d[tours, np.full(tours.shape, depot)], dtype=np.float64)
+
+    # Somas de prefixo por rota: arestas internas, demanda, peso e peso x posicao
+    edges = np.zeros(tours.shape)
+    edges[:, 1:] = d[tours[:, :-1], tours[:, 1:]]
+    edge_sum = np.cumsum(edges, axis=1)
+    zeros = np.zeros((num_routes, 1))
+    demand_sum = np.hstack((zeros, np.cumsum(demand[tours], axis=1, dtype=np.float64)))
+    weight = priority_weight[tours].astype(np.float64)
+    weight_sum = np.hstack((zeros, np.cumsum(weight, axis=1)))
+    weighted_position_sum = np.hstack((zeros, np.cumsum(weight * np.arange(n), axis=1)))
+
+    # Viagem tour[l:i]: distancia = leaving[l] + arriving[i - 1] e score de
+    # prioridade = (score_end[i] + (i - l) * weight_sum[i] + score_start[l]) / (i - l + 2)
+    leaving = from_depot - edge_sum
+    arriving = edge_sum + to_depot
+    position = np.arange(n + 1)
+    score_end = weighted_position_sum - (position - 1) * weight_sum
+    score_start = (position - 1) * weight_sum - weighted_position_sum
+
+    cost = np.full((n_vehicles + 1, num_routes, n + 1), np.inf)
+    cost[0, :, 0] = 0.0
+    start = np.full((n_vehicles + 1, num_routes, n + 1), -1, dtype=np.int64)
+    trip_distance = np.zeros((n_vehicles + 1, num_routes, n + 1))
+
+    for j in range(1, n_vehicles + 1):
+        previous = cost[j - 1]
+        cost[j] = previous
+
+        # Cada camada depende apenas da anterior. Para cada tamanho de
+        # viagem k, as viagens tour[l:l+k] de todas as rotas sao avaliadas
+        # de uma vez com fatias contiguas; k decrescente e comparacao
+        # estrita preferem, no empate, a viagem que comeca mais cedo
+        for k in range(window, 0, -1):
+            head, tail = slice(0, n + 1 - k), slice(k, n + 1)
+
+            distance = leaving[:, :n + 1 - k] + arriving[:, k - 1:]
+            candidate = k * weight_sum[:, tail]
+            candidate += score_end[:, tail]
+            candidate += score_start[:, head]
+            candidate *= weights['priority_penalty'] / (k + 2)
+            candidate += previous[:, head]
+            candidate += weights['distance'] * distance
+
+            excess = demand_sum[:, tail] - demand_sum[:, head]
+            excess -= capacities[j - 1]
+            np.maximum(excess, 0.0, out=excess)
+            excess *= weights['capacity_penalty']
+            candidate += excess
+
+            excess = distance - max_distances[j - 1]
+            np.maximum(excess, 0.0, out=excess)
+            excess *= weights['autonomy_penalty']
+            candidate += excess
+
+            current = cost[j, :, tail]
+            improved = candidate < current
+            np.copyto(current, candidate, where=improved)
+            np.copyto(start[j, :, tail], np.arange(n + 1 - k), where=improved)
+            np.copyto(trip_distance[j, :, tail], distance, where=improved)
+
+    return cost, start, trip_distance
+
+
+def _trips(tour: np.ndarray, start: np.ndarray, depot: int) -> List[Tuple[int, List[int]]]:
+    """Reconstroi as viagens de uma rota a partir da tabela start[j, i]"""
+    trips = []
+    i = len(tour)
+    for j in range(start.shape[0] - 1, 0, -1):
+        l = start[j, i]
+        if l < 0:
+            continue
+        trips.append((j - 1, [depot] + tour[l:i].tolist() + [depot]))
+        i = l
+    trips.reverse()
+    return trips
+
+
+def prins_split_batch(
+    tours: np.ndarray,
+    distance_matrix,
+    demand: np.ndarray,
+    priority_weight: np.ndarray,
+    depot: int,
+    capacities: np.ndarray,
+    max_distances: np.ndarray,
+    weights: Dict[str, float],
+    max_trip_stops: Optional[int] = None,
+    return_trips: bool = False
+):
+    """
+    Melhor divisao de cada rota gigante de uma populacao
+
+    Usado como fitness do AG: a PD e calculada para todas as rotas de uma
+    vez (ver prins_split para os demais argumentos).
+
+    Args:
+        tours: Matriz (num_rotas, n) de rotas gigantes, sem o deposito
+        max_trip_stops: Maximo de pontos por viagem (None = sem limite)
+        return_trips: Tambem reconstroi as viagens de cada rota
+
+    Returns:
+        (fitness, distancias) como arrays de tamanho num_rotas, mais a
+        lista de viagens de cada rota se return_trips
+    """
+    tours = np.atleast_2d(np.asarray(tours, dtype=np.int64))
+    num_routes, n = tours.shape
+    if n == 0:
+        empty = (np.zeros(num_routes), np.zeros(num_routes))
+        return empty + ([[] for _ in range(num_routes)],) if return_trips else empty
+
+    cost, start, trip_distance = _split_tables(
+        tours, distance_matrix, demand, priority_weight, depot,
+        capacities, max_distances, weights, max_trip_stops
+    )
+
+    # Distancia total: percorre as viagens a partir do ultimo veiculo
+    routes = np.arange(num_routes)
+    i = np.full(num_routes, n)
+    total_distance = np.zeros(num_routes)
+    for j in range(len(capacities), 0, -1):
+        l = start[j, routes, i]
+        used = l >= 0
+        total_distance += np.where(used, trip_distance[j, routes, i], 0.0)
+        i = np.where(used, l, i)
+
+    if not return_trips:
+        return cost[-1, :, n], total_distance
+    trips = [_trips(tour, start[:, p], depot) for p, tour in enumerate(tours)]
+    return cost[-1, :, n], total_distance, trips
+
+
+def prins_split(
+    tour: np.ndarray,
+    distance_matrix,
+    demand: np.ndarray,
+    priority_weight: np.ndarray,
+    depot: int,
+    capacities: np.ndarray,
+    max_distances: np.ndarray,
+    weights: Dict[str, float],
+    max_trip_stops: Optional[int] = None
+) -> Tuple[List[Tuple[int, List[int]]], float, float]:
+    """
+    Particiona a rota gigante em viagens, uma por veiculo
+
+    Args:
+        tour: Pontos na ordem de visita, sem o deposito
+        distance_matrix: Matriz NxN de distancias (ou provedor equivalente)
+        demand: Demanda (kg) de cada ponto
+        priority_weight: Peso de prioridade de cada ponto (CRITICAL=4 ... LOW=1)
+        depot: ID do deposito
+        capacities: Capacidade de cada veiculo (kg)
+        max_distances: Autonomia de cada veiculo (km)
+        weights: Pesos da funcao fitness (RouteOptimizer.weights)
+        max_trip_stops: Maximo de pontos por viagem (None = sem limite)
+
+    Returns:
+        (viagens, fitness_total, distancia_total), com viagens como lista de
+        (indice_do_veiculo, sub_rota) na ordem dos veiculos
+    """
+    fitness, distance, trips = prins_split_batch(
+        np.asarray(tour, dtype=np.int64)[None, :], distance_matrix, demand, priority_weight,
+        depot, capacities, max_distances, weights, max_trip_stops, return_trips=True
+    )
+    return trips[0], float(fitness[0]), float(distance[0])
@@ -0,0 +1,124 @@
+"""
+Criterios de Parada para o Algoritmo Genetico
+
+Este modulo implementa uma politica de parada antecipada, verificada ao
+final de cada geracao:
+- Orcamento de tempo (segundos de relogio)
+- Estagnacao: o melhor fitness nao melhora ha N geracoes
+- Fitness alvo atingido
+- Colapso de diversidade: fracao de rotas distintas na populacao abaixo
+  de um limite
+
+O motivo da parada fica disponivel em GeneticAlgorithm.get_statistics().
+"""
+
+import time
+from typing import Callable, List, Optional
+
+try:
+    from .fitness_cache import genome_key
+except ImportError:
+    from fitness_cache import genome_key
+
+
+def population_diversity(genes) -> float:
+    """
+    Fracao de rotas distintas na populacao
+
+    Args:
+        genes: Matriz (n, tamanho_rota) ou lista de rotas
+
+    Returns:
+        Valor entre 1/n (todas iguais) e 1.0 (todas diferentes)
+    """
+    if len(genes) == 0:
+        return 0.0
+    return len({genome_key(route) for route in genes}) / len(genes)
+
+
+class StoppingPolicy:
+    """
+    Politica de parada antecipada
+
+    Parametros principais (None desativa o criterio):
+    - time_limit: Tempo maximo de execucao em segundos
+    - stagnation_generations: Geracoes sem melhora do melhor fitness
+    - target_fitness: Fitness considerado suficiente
+    - min_diversity: Fracao minima de rotas distintas na populacao
+    - stagnation_tolerance: Melhora minima para nao contar como estagnacao
+
+    Motivos reportados: 'time_limit', 'stagnation', 'target_fitness',
+    'diversity_collapse'
+    """
+
+    def __init__(
+        self,
+        time_limit: Optional[float] = None,
+        stagnation_generations: Optional[int] = None,
+        target_fitness: Optional[float] = None,
+        min_diversity: Optional[float] = None,
+        stagnation_tolerance: float = 1e-9
+    ):
+        self.time_limit = time_limit
+        self.stagnation_generations = stagnation_generations
+        self.target_fitness = target_fitness
+        self.min_diversity = min_diversity
+        self.stagnation_tolerance = stagnation_tolerance
+        self.start_time = None
+        self.end_time = None
+
+    def start(self):
+        """Inicia a contagem do orcamento de tempo"""
+        self.start_time = time.time()
+        self.end_time = None
+
+    def stop(self):
+        """Registra o fim da execucao; elapsed() passa a ser fixo"""
+        if self.start_time is not None:
+            self.end_time = time.time()
+
+    def resume(self):
+        """Continua a contagem apos stop() (ex.: nova etapa do modelo de ilhas)"""
+        self.end_time = None
+
+    def elapsed(self) -> float:
+        """Segundos desde start(), ate stop() se a execucao ja terminou"""
+        if self.start_time is None:
+            return 0.0
+        end = self.end_time if self.end_time is not None else time.time()
+        return end - self.start_time
+
+    def check(
+        self,
+        best_fitness_history: List[float],
+        population_genes: Optional[Callable] = None
+    ) -> Optional[str]:
+        """
+        Verifica se a evolucao deve parar
+
+        Args:
+            best_fitness_history: Melhor fitness de cada geracao ate agora
+            population_genes: Funcao sem argumentos que retorna as rotas da
+                populacao; chamada apenas se min_diversity estiver definido
+
+        Returns:
+            Motivo da parada, ou None para continuar
+        """
+        if self.target_fitness is not None and best_fitness_history:
+            if best_fitness_history[-1] <= self.target_fitness:
+                return 'target_fitness'
+
+        window = self.stagnation_generations
+        if window is not None and len(best_fitness_history) > window:
+            improvement = best_fitness_history[-window - 1] - best_fitness_history[-1]
+            if improvement <= self.stagnation_tolerance:
+                return 'stagnation'
+
+        if self.min_diversity is not None and population_genes is not None:
+            if population_diversity(population_genes()) < self.min_diversity:
+                return 'diversity_collapse'
+
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+            return 'time_limit'
+
+        return None
@@ -2,15 +2,46 @@
 Testes para o módulo de Algoritmos Genéticos
 """
 
+import copy
+import csv
+import gc
+import itertools
+import pickle
+import time
 import pytest
 import sys
+import numpy as np
+from multiprocessing import shared_memory
 from pathlib import Path
 
 # Adicionar src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from genetic_algorithm import GeneticAlgorithm, Individual
-from routing import RouteOptimizer, create_sample_data, Priority, DeliveryPoint, Vehicle
+from genetic_algorithm import GeneticAlgorithm, Individual, PopulationMatrix
+from operators import (
+    order_crossover, pmx_crossover, edge_recombination_crossover,
+    mutation_swap_batch, mutation_inversion_batch, random_subsets
+)
+from parallel import ParallelFitnessEvaluator
+from fitness_cache import FitnessCache
+from stopping import StoppingPolicy, population_diversity
+from island_model import IslandModel
+from diversity import edge_entropy, adjacency_distance, duplicate_rows
+from decomposition import SpatialDecomposition, sweep_clusters, kmeans_clusters
+from profiling import PhaseProfiler
+from benchmark import (
+    generate_instance, nearest_neighbor_route, two_opt, route_distance, benchmark_instance
+)
+from nsga2 import NSGA2, non_dominated_sort, crowding_distance, dominance_matrix, pick_solution
+import distances
+from distances import (
+    haversine_distance_matrix, load_or_compute_distance_matrix, SparseDistanceMatrix
+)
+from local_search import LocalSearch, build_neighbor_lists
+from routing import (
+    RouteOptimizer, create_sample_data, Priority, DeliveryPoint, Vehicle, DeliveryPointArrays,
+    aggregate_medication_lines, random_medication_lines, load_arrays_from_csv, load_data_from_csv
+)
 
 
 class TestGeneticAlgorithm:
@@ -67,6 +98,618 @@ class TestGeneticAlgorithm:
         
         # Fitness deve ser resetado
         assert mutated.fitness == float('inf')
+    
+    def test_independent_random_streams(self):
+        """Instâncias com a mesma semente são reprodutíveis, mesmo intercaladas"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        
+        def run(ga):
+            return ga.evolve_vectorized(n, optimizer.fitness_function_batch, verbose=False)
+        
+        reference = run(GeneticAlgorithm(population_size=20, generations=15, random_seed=7))
+        ga1 = GeneticAlgorithm(population_size=20, generations=15, random_seed=7)
+        ga2 = GeneticAlgorithm(population_size=20, generations=15, random_seed=7)
+        ga2.rng.random(1000)  # consumir o fluxo de outra instância não afeta ga1
+        np.random.seed(0)
+        
+        assert run(ga1).genes == reference.genes
+        
+        seeds = ga1.spawn_seeds(2)
+        streams = [GeneticAlgorithm(random_seed=seed).rng.random(5) for seed in seeds]
+        assert not np.allclose(streams[0], streams[1])
+        np.testing.assert_array_equal(
+            GeneticAlgorithm(random_seed=seeds[0]).rng.random(5), streams[0]
+        )
+    
+    def test_vectorized_tournament(self):
+        """Torneios em lote favorecem os melhores e raramente escolhem o pior"""
+        ga = GeneticAlgorithm(tournament_size=3, random_seed=42)
+        fitness = np.arange(20, dtype=float)[::-1]
+        
+        winners = ga._tournament_winners(fitness, 5000)
+        
+        assert winners.shape == (5000,)
+        assert np.mean(winners == 0) < 0.01
+        assert np.mean(winners >= 10) > 0.8
+    
+    def test_vectorized_tournament_without_replacement(self):
+        """Competidores distintos em cada torneio, sorteados uniformemente"""
+        rng = np.random.default_rng(0)
+        subsets = random_subsets(rng, 20000, 10, 4)
+        
+        assert subsets.shape == (20000, 4)
+        assert (np.sort(subsets, axis=1)[:, 1:] != np.sort(subsets, axis=1)[:, :-1]).all()
+        assert np.allclose(np.bincount(subsets.ravel(), minlength=10) / 20000, 0.4, atol=0.02)
+        
+        # Torneio do tamanho da população: sem repetição o melhor sempre vence
+        ga = GeneticAlgorithm(tournament_size=8, random_seed=1)
+        fitness = np.random.default_rng(2).random(8)
+        assert (ga._tournament_winners(fitness, 500) == np.argmin(fitness)).all()
+    
+    @pytest.mark.parametrize('population_size', [21, 30])
+    def test_next_generation_bulk(self, population_size):
+        """Próxima geração em lote: elite copiada e filhos são permutações"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        ga = GeneticAlgorithm(population_size=population_size, elite_size=3, random_seed=42)
+        population = ga.create_population_matrix(n, 0)
+        population.evaluate(optimizer.fitness_function_batch)
+        order = np.argsort(population.fitness, kind='stable')
+        elite = population.genes[order[:3]].copy()
+        
+        ga._next_generation(population, order)
+        
+        assert (population.genes[:3] == elite).all()
+        assert (np.sort(population.genes[:, 1:-1], axis=1) == np.arange(1, n)).all()
+        evaluated = ~np.isinf(population.fitness)
+        fitness, _, _ = optimizer.fitness_function_batch(population.genes[evaluated])
+        np.testing.assert_allclose(population.fitness[evaluated], fitness)
+    
+    def test_evolve_iter(self):
+        """O iterador reproduz evolve_vectorized e pode ser interrompido"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        
+        reference = GeneticAlgorithm(population_size=20, generations=25, random_seed=3)
+        expected = reference.evolve_vectorized(n, optimizer.fitness_function_batch, verbose=False)
+        
+        ga = GeneticAlgorithm(population_size=20, generations=25, random_seed=3)
+        snapshots = []
+        for snapshot in ga.evolve_iter(n, optimizer.fitness_function_batch):
+            snapshots.append((snapshot.generation, snapshot.best_fitness, snapshot.best_genes.copy()))
+            assert snapshot.elapsed_time >= 0
+        
+        assert [g for g, _, _ in snapshots] == list(range(25))
+        assert [f for _, f, _ in snapshots] == reference.best_fitness_history
+        assert ga.best_individual.genes == expected.genes
+        _, best_fitness, best_genes = snapshots[-1]
+        assert optimizer.fitness_function(best_genes.tolist())[0] == pytest.approx(best_fitness)
+        
+        ga = GeneticAlgorithm(population_size=20, generations=25, random_seed=3)
+        for snapshot in ga.evolve_iter(n, optimizer.fitness_function_batch):
+            if snapshot.generation == 4:
+                break
+        assert len(ga.best_fitness_history) == 5
+        assert ga.best_individual.fitness == snapshots[4][1]
+    
+    def test_create_population_matrix(self):
+        """Testa criação da população em matriz"""
+        ga = GeneticAlgorithm(population_size=30, random_seed=42)
+        population = ga.create_population_matrix(num_points=11, depot=0)
+        
+        assert population.genes.shape == (30, 12)
+        assert population.genes.dtype == np.int32
+        assert (population.genes[:, 0] == 0).all()
+        assert (population.genes[:, -1] == 0).all()
+        # Cada linha é uma permutação dos pontos de entrega
+        assert (np.sort(population.genes[:, 1:-1], axis=1) == np.arange(1, 11)).all()
+        assert np.isinf(population.fitness).all()
+    
+    def test_population_matrix_swap(self):
+        """Testa troca de buffers sem realocação"""
+        population = PopulationMatrix(size=4, genome_length=5)
+        current, following = population.genes, population.next_genes
+        
+        population.swap()
+        
+        assert population.genes is following
+        assert population.next_genes is current
+
+    
+    @pytest.mark.parametrize('method', ['order', 'pmx', 'edge'])
+    def test_crossover_methods(self, method):
+        """Testa os operadores de cruzamento configuráveis"""
+        ga = GeneticAlgorithm(random_seed=42, crossover_method=method)
+        
+        parent1 = Individual(genes=[0] + list(range(1, 21)) + [0])
+        parent2 = Individual(genes=[0] + list(range(20, 0, -1)) + [0])
+        
+        for child in ga.crossover(parent1, parent2):
+            assert child.genes[0] == 0 and child.genes[-1] == 0
+            assert sorted(child.genes[1:-1]) == list(range(1, 21))
+    
+    def test_invalid_crossover_method(self):
+        """Testa rejeição de operador desconhecido"""
+        with pytest.raises(ValueError):
+            GeneticAlgorithm(crossover_method='cycle')
+
+
+class TestOperators:
+    """Testes para os operadores vetorizados"""
+    
+    def test_order_crossover_keeps_segment(self):
+        """OX copia o segmento do primeiro pai e mantém a ordem do segundo"""
+        parent1 = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 0])
+        parent2 = np.array([0, 8, 7, 6, 5, 4, 3, 2, 1, 0])
+        
+        child = order_crossover(parent1, parent2, 2, 5)
+        
+        assert list(child) == [0, 7, 6, 3, 4, 5, 2, 1, 8, 0]
+    
+    def test_pmx_crossover(self):
+        """PMX resolve conflitos pelo mapeamento entre segmentos"""
+        parent1 = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 0])
+        parent2 = np.array([0, 3, 7, 5, 1, 6, 8, 2, 4, 0])
+        
+        child = pmx_crossover(parent1, parent2, 3, 6)
+        
+        assert list(child) == [0, 3, 7, 8, 4, 5, 6, 2, 1, 0]
+    
+    def test_edge_recombination_preserves_common_tour(self):
+        """ERX entre pais iguais reproduz o ciclo dos pais"""
+        parent = np.array([0, 4, 2, 7, 1, 3, 6, 5, 0])
+        
+        # O ciclo pode ser percorrido em qualquer sentido a partir do primeiro gene
+        reverse = [0, 4] + list(parent[2:-1][::-1]) + [0]
+        for seed in range(5):
+            child = edge_recombination_crossover(parent, parent.copy(), rng=np.random.default_rng(seed))
+            assert list(child) in (list(parent), reverse)
+    
+    @pytest.mark.parametrize('mutation', [mutation_swap_batch, mutation_inversion_batch])
+    def test_batch_mutations(self, mutation):
+        """Mutações em lote alteram só as linhas escolhidas e mantêm permutações"""
+        rng = np.random.default_rng(1)
+        genes = np.array([[0] + list(rng.permutation(np.arange(1, 15))) + [0] for _ in range(8)])
+        original = genes.copy()
+        rows = np.array([1, 4, 6])
+        
+        mutation(genes, rows, rng=rng)
+        
+        untouched = np.setdiff1d(np.arange(8), rows)
+        assert (genes[untouched] == original[untouched]).all()
+        assert (genes[rows] != original[rows]).any(axis=1).all()
+        assert (genes[:, 0] == 0).all() and (genes[:, -1] == 0).all()
+        assert (np.sort(genes[:, 1:-1], axis=1) == np.arange(1, 15)).all()
+
+
+
+class TestFitnessCache:
+    """Testes para o cache LRU de fitness"""
+    
+    def test_lru_eviction_and_counters(self):
+        """Rotas repetidas não chamam a função; a menos usada é descartada"""
+        calls = []
+        def fitness(route):
+            calls.append(list(route))
+            return float(sum(route)), 0.0, 0.0
+        
+        cache = FitnessCache(maxsize=2)
+        cache.evaluate([0, 1, 2, 0], fitness)
+        cache.evaluate([0, 2, 1, 0], fitness)
+        assert cache.evaluate([0, 1, 2, 0], fitness) == (3.0, 0.0, 0.0)
+        cache.evaluate([0, 3, 1, 0], fitness)      # descarta [0, 2, 1, 0]
+        cache.evaluate([0, 2, 1, 0], fitness)
+        
+        assert len(calls) == 4
+        assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+    
+    def test_batch_deduplicates(self):
+        """Rotas repetidas no lote e no cache são avaliadas uma única vez"""
+        optimizer = RouteOptimizer(*create_sample_data())
+        routes = np.array([[0, 1, 2, 3, 0], [0, 3, 2, 1, 0], [0, 1, 2, 3, 0]])
+        evaluated = []
+        def batch(rows):
+            evaluated.append(len(rows))
+            return optimizer.fitness_function_batch(rows)
+        
+        cache = FitnessCache()
+        first = cache.evaluate_batch(routes, batch)
+        second = cache.evaluate_batch(routes[::-1], batch)
+        
+        assert evaluated == [2]
+        assert np.allclose(first[0], optimizer.fitness_function_batch(routes)[0])
+        assert np.allclose(second[0], first[0][::-1])
+        assert (cache.hits, cache.misses) == (4, 2)
+    
+    def test_entries_separated_by_function_and_run(self):
+        """Funções diferentes não compartilham entradas; cada evolução começa vazia"""
+        cache = FitnessCache()
+        assert cache.evaluate([0, 1, 2, 0], lambda route: (1.0, 0.0, 0.0))[0] == 1.0
+        assert cache.evaluate([0, 1, 2, 0], lambda route: (2.0, 0.0, 0.0))[0] == 2.0
+        
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        ga = GeneticAlgorithm(population_size=20, generations=5, random_seed=1, fitness_cache_size=1000)
+        ga.evolve_vectorized(n, optimizer.fitness_function_batch, verbose=False)
+        
+        # Mesmo otimizador (mesma função), pesos diferentes
+        optimizer.weights['priority_penalty'] = 0.0
+        best = ga.evolve_vectorized(n, optimizer.fitness_function_batch, verbose=False)
+        assert best.fitness == pytest.approx(optimizer.fitness_function(best.genes)[0])
+        assert ga.get_statistics()['fitness_cache_misses'] <= 20 * 6
+
+
+class TestStoppingPolicy:
+    """Testes para os critérios de parada antecipada"""
+    
+    def test_criteria(self):
+        """Cada critério reporta seu motivo"""
+        assert StoppingPolicy(target_fitness=10).check([12, 9]) == 'target_fitness'
+        assert StoppingPolicy(stagnation_generations=2).check([5, 4, 4, 4]) == 'stagnation'
+        assert StoppingPolicy(stagnation_generations=2).check([5, 4, 3, 3]) is None
+        
+        genes = np.array([[0, 1, 2, 0]] * 9 + [[0, 2, 1, 0]])
+        assert population_diversity(genes) == pytest.approx(0.2)
+        policy = StoppingPolicy(min_diversity=0.5)
+        assert policy.check([1.0], lambda: genes) == 'diversity_collapse'
+        
+        policy = StoppingPolicy(time_limit=0)
+        policy.start()
+        assert policy.check([1.0]) == 'time_limit'
+    
+    @pytest.mark.parametrize('vectorized', [False, True])
+    def test_early_stop_in_evolve(self, vectorized):
+        """A evolução para antes do limite de gerações e informa o motivo"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        ga = GeneticAlgorithm(
+            population_size=20, generations=500, random_seed=42,
+            stopping=StoppingPolicy(stagnation_generations=15)
+        )
+        
+        if vectorized:
+            ga.evolve_vectorized(len(delivery_points), optimizer.fitness_function_batch, verbose=False)
+        else:
+            ga.evolve(len(delivery_points), optimizer.fitness_function, verbose=False)
+        stats = ga.get_statistics()
+        
+        assert stats['stop_reason'] == 'stagnation'
+        assert stats['generations'] < 500
+        assert stats['elapsed_time'] > 0
+        
+        # O tempo reportado é o da execução, não o de quando é consultado
+        time.sleep(0.05)
+        assert ga.get_statistics()['elapsed_time'] == stats['elapsed_time']
+
+
+class TestDiversity:
+    """Testes para as métricas de diversidade e a eliminação de duplicatas"""
+    
+    def test_metrics_extremes(self):
+        """Rotas iguais (ou invertidas) têm diversidade zero; aleatórias, alta"""
+        route = np.array([0, 3, 1, 4, 2, 5, 0])
+        same = np.array([route, route, route[::-1], route])
+        assert edge_entropy(same) == pytest.approx(0.0)
+        assert adjacency_distance(same, rng=np.random.default_rng(0)) == pytest.approx(0.0)
+        
+        rng = np.random.default_rng(1)
+        random_routes = np.array([
+            [0] + list(rng.permutation(np.arange(1, 60))) + [0] for _ in range(30)
+        ])
+        assert edge_entropy(random_routes) > 0.7
+        assert adjacency_distance(random_routes, rng=rng) > 0.9
+    
+    def test_duplicate_rows(self):
+        """Somente as repetições posteriores à primeira ocorrência são marcadas"""
+        genes = np.array([[0, 1, 2, 3, 0], [0, 2, 1, 3, 0], [0, 1, 2, 3, 0], [0, 1, 2, 3, 0]])
+        assert duplicate_rows(genes).tolist() == [False, False, True, True]
+    
+    def test_ga_tracks_diversity_and_removes_duplicates(self):
+        """Histórico de diversidade por geração e população sem repetições"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        ga = GeneticAlgorithm(
+            population_size=30, random_seed=42, track_diversity=True, eliminate_duplicates=True
+        )
+        population = ga.create_population_matrix(n, 0)
+        population.evaluate(optimizer.fitness_function_batch)
+        
+        ga.run_generations(population, 60, optimizer.fitness_function_batch)
+        stats = ga.get_statistics()
+        
+        assert len(ga.entropy_history) == len(ga.adjacency_distance_history) == 60
+        assert not duplicate_rows(population.genes).any()
+        assert stats['immigrants_injected'] > 0
+        assert 0.0 <= stats['edge_entropy_final'] <= 1.0
+        
+        ga = GeneticAlgorithm(
+            population_size=30, generations=20, random_seed=42,
+            track_diversity=True, eliminate_duplicates=True
+        )
+        ga.evolve(n, optimizer.fitness_function, verbose=False)
+        assert len(ga.entropy_history) == 20
+
+
+class TestProfiling:
+    """Testes para a instrumentação de tempo por fase"""
+    
+    def test_phase_profiler(self, tmp_path):
+        """Tempo e chamadas acumulados, com uma linha de rastro por geração"""
+        profiler = PhaseProfiler()
+        for generation in range(3):
+            with profiler.phase('selection'):
+                pass
+            with profiler.phase('selection'):
+                pass
+            profiler.end_generation(generation)
+        
+        summary = profiler.summary()
+        assert summary['selection']['calls'] == 6
+        assert summary['selection']['total_time'] >= 0
+        assert len(profiler.trace) == 3
+        
+        path = tmp_path / 'perfil.csv'
+        profiler.to_csv(path)
+        rows = list(csv.reader(open(path)))
+        assert rows[0] == ['generation', 'selection']
+        assert [row[0] for row in rows[1:]] == ['0', '1', '2']
+    
+    @pytest.mark.parametrize('vectorized', [True, False])
+    def test_ga_profile(self, tmp_path, vectorized):
+        """Fases do AG e do RouteOptimizer aparecem em get_statistics e no CSV"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        n = len(delivery_points)
+        ga = GeneticAlgorithm(population_size=20, generations=10, random_seed=42, profile=True)
+        
+        if vectorized:
+            ga.evolve_vectorized(n, optimizer.fitness_function_batch, verbose=False)
+            evaluation = 'optimizer.fitness_function_batch'
+        else:
+            ga.evolve(n, optimizer.fitness_function, verbose=False)
+            evaluation = 'optimizer.fitness_function'
+        
+        profile = ga.get_statistics()['profile']
+        for name in ('sort', 'statistics', 'selection', 'crossover', 'evaluation', evaluation):
+            assert profile[name]['calls'] > 0
+        
+        path = tmp_path / 'perfil.csv'
+        ga.save_profile(path)
+        rows = list(csv.DictReader(open(path)))
+        assert len(rows) == 10
+        assert all(float(row['sort']) >= 0 for row in rows)
+        
+        assert GeneticAlgorithm(random_seed=42).get_statistics()['profile'] is None
+    
+    def test_ga_profile_keeps_existing_profiler(self):
+        """Um profiler já ligado ao otimizador não é trocado pelo do AG"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        own = PhaseProfiler()
+        optimizer.profiler = own
+        ga = GeneticAlgorithm(population_size=20, generations=3, random_seed=42, profile=True)
+        ga.evolve_vectorized(len(delivery_points), optimizer.fitness_function_batch, verbose=False)
+        
+        assert optimizer.profiler is own
+        assert 'optimizer.fitness_function_batch' not in ga.get_statistics()['profile']
+    
+    def test_profile_evolve_iter_closed_early(self):
+        """Interromper evolve_iter fecha a linha do perfil da geração corrente"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        ga = GeneticAlgorithm(population_size=20, generations=10, random_seed=42, profile=True)
+        
+        steps = ga.evolve_iter(len(delivery_points), optimizer.fitness_function_batch)
+        for _ in range(3):
+            next(steps)
+        steps.close()
+        
+        assert [generation for generation, _ in ga.profiler.trace] == [0, 1, 2]
+        assert 'statistics' in ga.profiler.trace[-1][1]
+        assert not ga.profiler._generation_time
+
+
+class TestBenchmark:
+    """Testes para o gerador de instâncias e a linha de base do benchmark"""
+    
+    @pytest.mark.parametrize('layout', ['uniform', 'clustered'])
+    def test_generate_instance(self, layout):
+        """Instâncias reprodutíveis, com prioridades mistas e veículo viável"""
+        points, vehicles = generate_instance(300, layout, seed=7)
+        again, _ = generate_instance(300, layout, seed=7)
+        
+        assert len(points) == 301
+        assert [(p.lat, p.lon, p.demand) for p in points] == [(p.lat, p.lon, p.demand) for p in again]
+        assert len({p.priority for p in points[1:]}) == len(Priority)
+        assert vehicles[0].capacity == pytest.approx(sum(p.demand for p in points))
+        
+        with pytest.raises(ValueError):
+            generate_instance(10, 'ring')
+    
+    def test_baseline_route(self):
+        """Vizinho mais próximo gera uma rota válida que o 2-opt não piora"""
+        points, vehicles = generate_instance(200, 'clustered', seed=3)
+        optimizer = RouteOptimizer(points, vehicles, depot_id=0)
+        
+        route = nearest_neighbor_route(optimizer.distance_matrix)
+        assert route[0] == route[-1] == 0
+        assert sorted(route[1:-1]) == list(range(1, 201))
+        
+        improved, distance = two_opt(route, optimizer.distance_matrix)
+        assert sorted(improved[1:-1]) == list(range(1, 201))
+        assert distance == pytest.approx(route_distance(improved, optimizer.distance_matrix))
+        assert distance < route_distance(route, optimizer.distance_matrix)
+    
+    def test_benchmark_instance(self):
+        """Uma linha de resultados com as métricas de desempenho e qualidade"""
+        result = benchmark_instance(60, 'uniform', seed=1, population_size=20, generations=5)
+        
+        assert result['generations'] == 5
+        assert result['generations_per_second'] > 0
+        assert result['evaluations_per_second'] > 0
+        assert result['peak_memory_mb'] > 0
+        assert result['quality_ratio'] == pytest.approx(result['ga_fitness'] / result['baseline_fitness'])
+
+
+class TestLocalSearch:
+    """Testes para a busca local do modo memético"""
+    
+    @pytest.fixture
+    def optimizer(self):
+        """Otimizador sem restrições ativas, para isolar a distância"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        optimizer.weights['priority_penalty'] = 0.0
+        return optimizer
+    
+    def test_build_neighbor_lists(self, optimizer):
+        """Vizinhos ordenados por distância e sem o próprio ponto"""
+        neighbors = build_neighbor_lists(optimizer.distance_matrix, k=5)
+        
+        assert neighbors.shape == (len(optimizer.delivery_points), 5)
+        for point, row in enumerate(neighbors):
+            assert point not in row
+            distances = optimizer.distance_matrix[point, row]
+            assert (np.diff(distances) >= 0).all()
+            assert distances[-1] == pytest.approx(np.sort(optimizer.distance_matrix[point])[5])
+    
+    def test_improve_route(self, optimizer):
+        """A busca local melhora a rota e mantém o fitness consistente"""
+        delta_evaluator = lambda *move: optimizer.evaluate_move(*move, vehicle_id=0)
+        local_search = LocalSearch(optimizer.distance_matrix, delta_evaluator, neighbors=8)
+        
+        n = len(optimizer.delivery_points)
+        route = [0] + [int(g) for g in np.random.default_rng(5).permutation(np.arange(1, n))] + [0]
+        fitness, distance, penalty = optimizer.fitness_function(route)
+        
+        improved, new_fitness, new_distance, new_penalty = local_search.improve(
+            route, fitness, distance, penalty
+        )
+        
+        assert improved[0] == 0 and improved[-1] == 0
+        assert sorted(improved[1:-1]) == list(range(1, n))
+        assert new_fitness < fitness
+        assert new_fitness == pytest.approx(optimizer.fitness_function(improved)[0])
+        assert new_distance == pytest.approx(optimizer.calculate_route_distance(improved))
+        
+        # Ótimo local: nova busca não altera a rota
+        again = local_search.improve(improved, new_fitness, new_distance, new_penalty)
+        assert again[0] == improved
+    
+    def test_cache_follows_optimizer_changes(self, optimizer):
+        """Ótimos locais em cache são descartados quando pesos ou pontos mudam"""
+        local_search = LocalSearch(optimizer.distance_matrix, optimizer.evaluate_move, neighbors=8)
+        n = len(optimizer.delivery_points)
+        for seed in range(2):
+            route = [0] + [int(g) for g in np.random.default_rng(seed).permutation(np.arange(1, n))] + [0]
+            improved = local_search.improve(route, *optimizer.fitness_function(route))[0]
+        assert len(local_search._local_optima) == 2
+        
+        optimizer.weights['priority_penalty'] = 1000.0
+        local_search.improve(improved, *optimizer.fitness_function(improved))
+        assert local_search._local_optima == {tuple(improved)}
+        
+        # Ponto novo: matriz e vizinhos acompanham o otimizador
+        new_id = optimizer.add_delivery_point(DeliveryPoint(0, "Nova", -23.56, -46.64, 1))
+        route = improved[:-1] + [new_id, 0]
+        result, fitness, _, _ = local_search.improve(route, *optimizer.fitness_function(route))
+        assert local_search.distance_matrix is optimizer.distance_matrix
+        assert len(local_search.neighbor_lists) == n + 1
+        assert fitness == pytest.approx(optimizer.fitness_function(result)[0])
+
+
+class TestDistances:
+    """Testes para o cálculo vetorizado de distâncias"""
+    
+    def test_haversine_known_distance(self):
+        """Um grau de latitude corresponde a ~111,2 km"""
+        matrix = haversine_distance_matrix(np.array([0.0, 1.0]), np.array([0.0, 0.0]))
+        
+        assert matrix[0, 1] == pytest.approx(111.195, abs=1e-3)
+        assert matrix[0, 0] == 0
+        assert (matrix == matrix.T).all()
+    
+    def test_float32_matrix(self):
+        """A matriz pode ser gerada em float32"""
+        rng = np.random.default_rng(0)
+        lats, lons = -23.5 + rng.random(50), -46.6 + rng.random(50)
+        
+        matrix32 = haversine_distance_matrix(lats, lons, dtype=np.float32)
+        matrix64 = haversine_distance_matrix(lats, lons)
+        
+        assert matrix32.dtype == np.float32
+        assert np.allclose(matrix32, matrix64, rtol=1e-4, atol=1e-3)
+    
+    def test_distance_cache(self, tmp_path, monkeypatch):
+        """A segunda carga com as mesmas coordenadas vem do cache em disco"""
+        lats, lons = np.array([-23.55, -23.58, -23.60]), np.array([-46.63, -46.64, -46.70])
+        
+        first = load_or_compute_distance_matrix(lats, lons, cache_dir=str(tmp_path))
+        assert len(list(tmp_path.glob('*.npy'))) == 1
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("matriz recalculada apesar do cache")
+        monkeypatch.setattr(distances, 'haversine_distance_matrix', fail)
+        
+        second = load_or_compute_distance_matrix(lats, lons, cache_dir=str(tmp_path))
+        assert (first == second).all()
+        
+        # Outras coordenadas geram outra entrada
+        monkeypatch.undo()
+        load_or_compute_distance_matrix(lats + 0.01, lons, cache_dir=str(tmp_path))
+        assert len(list(tmp_path.glob('*.npy'))) == 2
+    
+    def test_memory_mapped_matrix(self, tmp_path):
+        """O modo mmap calcula em blocos direto no arquivo e o reabre mapeado"""
+        rng = np.random.default_rng(1)
+        lats, lons = -23.5 + rng.random(40), -46.6 + rng.random(40)
+        
+        matrix = load_or_compute_distance_matrix(
+            lats, lons, cache_dir=str(tmp_path), dtype=np.float32, mmap=True, block_size=7
+        )
+        
+        assert isinstance(matrix, np.memmap)
+        assert (matrix == haversine_distance_matrix(lats, lons, dtype=np.float32)).all()
+        with pytest.raises(ValueError):
+            load_or_compute_distance_matrix(lats, lons, mmap=True)
+    
+    def test_sparse_matrix_matches_dense(self):
+        """Vizinhos armazenados e pares calculados sob demanda coincidem com a matriz densa"""
+        rng = np.random.default_rng(2)
+        lats, lons = -23.5 + rng.random(60), -46.6 + rng.random(60)
+        dense = haversine_distance_matrix(lats, lons)
+        sparse = SparseDistanceMatrix(lats, lons, k=5, dtype=np.float64, block_size=16)
+        
+        assert sparse.shape == dense.shape
+        assert (sparse.neighbors == build_neighbor_lists(dense, 5)).all()
+        
+        rows, cols = rng.integers(0, 60, (2, 8, 30))
+        assert np.allclose(sparse[rows, cols], dense[rows, cols])
+        assert sparse[3, 3] == 0
+        assert sparse[4, 9] == sparse[9, 4] == pytest.approx(dense[4, 9])
+    
+    def test_sparse_matrix_chunked_lookup(self, monkeypatch):
+        """Consultas em blocos pelo índice de pares, inclusive após add_point"""
+        rng = np.random.default_rng(4)
+        lats, lons = -23.5 + rng.random(80), -46.6 + rng.random(80)
+        sparse = SparseDistanceMatrix(lats, lons, k=6, dtype=np.float64)
+        sparse.add_point(-23.0, -46.1)
+        dense = haversine_distance_matrix(np.append(lats, -23.0), np.append(lons, -46.1))
+        monkeypatch.setattr(SparseDistanceMatrix, 'QUERY_CHUNK', 37)
+        
+        rows = np.repeat(np.arange(81), 6).reshape(9, 54)
+        near = sparse.neighbors.reshape(9, 54)
+        assert np.allclose(sparse[rows, near], dense[rows, near])
+        
+        rows, cols = rng.integers(0, 81, (2, 5, 40))
+        assert sparse[rows, cols].shape == (5, 40)
+        assert np.allclose(sparse[rows, cols], dense[rows, cols])
 
 
 class TestRouteOptimizer:
@@ -93,6 +736,100 @@ class TestRouteOptimizer:
         # Matriz deve ser simétrica
         assert (optimizer.distance_matrix == optimizer.distance_matrix.T).all()
     
+    @pytest.mark.parametrize('storage', ['mmap', 'sparse'])
+    def test_distance_storage(self, sample_data, storage, tmp_path):
+        """Armazenamentos alternativos mantêm o fitness da matriz densa"""
+        delivery_points, vehicles = sample_data
+        dense = RouteOptimizer(delivery_points, vehicles)
+        optimizer = RouteOptimizer(
+            delivery_points, vehicles,
+            distance_cache_dir=str(tmp_path),
+            distance_storage=storage,
+            distance_neighbors=3
+        )
+        
+        routes = np.array([
+            [0] + list(np.random.permutation(range(1, len(delivery_points)))) + [0]
+            for _ in range(5)
+        ])
+        expected = dense.fitness_function_batch(routes)[0]
+        
+        assert np.allclose(optimizer.fitness_function_batch(routes)[0], expected)
+        assert optimizer.fitness_function(list(routes[0]))[0] == pytest.approx(expected[0])
+    
+    def test_invalid_distance_storage(self, sample_data):
+        """Armazenamento desconhecido deve gerar erro"""
+        delivery_points, vehicles = sample_data
+        with pytest.raises(ValueError):
+            RouteOptimizer(delivery_points, vehicles, distance_storage='disk')
+    
+    @pytest.mark.parametrize('storage', ['dense', 'sparse'])
+    def test_add_and_remove_delivery_points(self, sample_data, storage):
+        """Adicionar/remover pontos equivale a recalcular a matriz do zero"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(list(delivery_points), vehicles,
+                                   distance_storage=storage, distance_neighbors=4)
+        
+        new_id = optimizer.add_delivery_point(
+            DeliveryPoint(0, "Entrega urgente", -23.56, -46.64, 5, Priority.CRITICAL)
+        )
+        mapping = optimizer.remove_delivery_points([2, 5])
+        fresh = RouteOptimizer(optimizer.delivery_points, vehicles,
+                               distance_storage=storage, distance_neighbors=4)
+        
+        n = len(optimizer.delivery_points)
+        assert n == len(delivery_points) - 1
+        assert mapping[new_id] == n - 1 and mapping[2] == mapping[5] == -1
+        rows, cols = np.meshgrid(np.arange(n), np.arange(n))
+        assert np.allclose(optimizer.distance_matrix[rows, cols], fresh.distance_matrix[rows, cols])
+    
+    def test_add_and_remove_keep_caller_points(self, sample_data):
+        """O otimizador trabalha numa cópia: a lista e os IDs do chamador não mudam"""
+        delivery_points, vehicles = sample_data
+        ids = [p.id for p in delivery_points]
+        optimizer = RouteOptimizer(delivery_points, vehicles)
+        
+        urgent = DeliveryPoint(99, "Urgente", -23.56, -46.64, 2, Priority.CRITICAL)
+        new_id = optimizer.add_delivery_point(urgent)
+        optimizer.remove_delivery_points([1])
+        
+        assert urgent.id == 99 and new_id == len(delivery_points)
+        assert len(delivery_points) == len(ids)
+        assert [p.id for p in delivery_points] == ids
+        assert [p.id for p in optimizer.delivery_points] == list(range(len(ids)))
+    
+    def test_warm_start_with_fitness_cache(self, sample_data):
+        """Após mudar os pontos, o cache não devolve fitness do problema anterior"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles)
+        ga = GeneticAlgorithm(population_size=20, generations=5, random_seed=1,
+                              fitness_cache_size=1000)
+        previous = ga.evolve_vectorized(len(optimizer.delivery_points),
+                                        optimizer.fitness_function_batch, verbose=False)
+        
+        optimizer.add_delivery_point(DeliveryPoint(0, "Urgente", -23.56, -46.64, 2, Priority.CRITICAL))
+        seed = optimizer.repair_route(previous.genes)
+        best = ga.evolve_vectorized(len(optimizer.delivery_points),
+                                    optimizer.fitness_function_batch, verbose=False,
+                                    initial_routes=[seed])
+        
+        assert best.fitness == pytest.approx(optimizer.fitness_function(best.genes)[0])
+    
+    def test_repair_route(self, sample_data):
+        """Rotas antigas são renumeradas e recebem os pontos novos por inserção mais barata"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(list(delivery_points), vehicles)
+        old_route = [0] + list(range(1, len(delivery_points))) + [0]
+        
+        new_id = optimizer.add_delivery_point(DeliveryPoint(0, "Nova", -23.55, -46.63, 1))
+        mapping = optimizer.remove_delivery_points([1])
+        route = optimizer.repair_route(old_route, mapping)
+        
+        assert route[0] == route[-1] == 0
+        assert sorted(route[1:-1]) == list(range(1, len(optimizer.delivery_points)))
+        # Pontos antigos mantêm a ordem relativa
+        assert [p for p in route[1:-1] if p != mapping[new_id]] == list(range(1, len(delivery_points) - 1))
+    
     def test_calculate_route_distance(self, sample_data):
         """Testa cálculo de distância de rota"""
         delivery_points, vehicles = sample_data
@@ -112,8 +849,9 @@ class TestRouteOptimizer:
         route = [0, 1, 2, 0]
         demand = optimizer.calculate_route_demand(route)
         
+        # Demanda armazenada em float32
         expected_demand = delivery_points[1].demand + delivery_points[2].demand
-        assert demand == expected_demand
+        assert demand == pytest.approx(expected_demand, rel=1e-6)
     
     def test_fitness_function(self, sample_data):
         """Testa função fitness"""
@@ -128,6 +866,108 @@ class TestRouteOptimizer:
         assert penalty >= 0
         assert fitness >= distance  # Fitness inclui distância + penalidades
     
+    def test_fitness_function_batch(self, sample_data):
+        """Testa que a avaliação vetorizada coincide com a individual"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        rng = np.random.default_rng(0)
+        n = len(delivery_points)
+        routes = np.array([
+            [0] + list(rng.permutation(np.arange(1, n))) + [0]
+            for _ in range(10)
+        ])
+        
+        fitness, distance, penalty = optimizer.fitness_function_batch(routes, vehicle_id=2)
+        
+        for i, route in enumerate(routes):
+            expected = optimizer.fitness_function(list(route), vehicle_id=2)
+            assert fitness[i] == pytest.approx(expected[0])
+            assert distance[i] == pytest.approx(expected[1])
+            assert penalty[i] == pytest.approx(expected[2])
+    
+    @pytest.mark.parametrize('move', ['swap', 'inversion'])
+    def test_evaluate_move_matches_full_evaluation(self, sample_data, move):
+        """Testa que a avaliação incremental coincide com a completa"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        rng = np.random.default_rng(3)
+        n = len(delivery_points)
+        for _ in range(30):
+            route = [0] + [int(g) for g in rng.permutation(np.arange(1, n))] + [0]
+            i, j = sorted(rng.choice(np.arange(1, n), 2, replace=False))
+            _, distance, penalty = optimizer.fitness_function(route, vehicle_id=2)
+            
+            fitness, new_distance, new_penalty = optimizer.evaluate_move(
+                route, move, i, j, distance, penalty, vehicle_id=2
+            )
+            
+            moved = route.copy()
+            if move == 'swap':
+                moved[i], moved[j] = moved[j], moved[i]
+            else:
+                moved[i:j] = reversed(moved[i:j])
+            expected = optimizer.fitness_function(moved, vehicle_id=2)
+            assert fitness == pytest.approx(expected[0])
+            assert new_distance == pytest.approx(expected[1])
+            assert new_penalty == pytest.approx(expected[2])
+    
+    @pytest.fixture
+    def time_window_data(self, sample_data):
+        """Dados de exemplo com janelas de tempo apertadas"""
+        delivery_points, vehicles = sample_data
+        rng = np.random.default_rng(7)
+        delivery_points[0].time_window = (8, 20)
+        for point in delivery_points[1:]:
+            start = float(rng.uniform(8, 10))
+            point.time_window = (start, start + float(rng.uniform(0.2, 1.0)))
+        return delivery_points, vehicles
+    
+    def test_arrival_times_with_waiting(self, time_window_data):
+        """Horários vetorizados coincidem com a simulação parada a parada"""
+        delivery_points, vehicles = time_window_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        route = list(range(len(delivery_points))) + [0]
+        vehicle = vehicles[0]
+        
+        expected, lateness, clock = [], 0.0, 8.0
+        for a, b in zip(route[:-1], route[1:]):
+            if a != 0:
+                clock += delivery_points[a].service_time / 60
+            clock += optimizer.distance_matrix[a, b] / vehicle.avg_speed
+            clock = max(clock, delivery_points[b].time_window[0])
+            expected.append(clock)
+            lateness += max(clock - delivery_points[b].time_window[1], 0.0)
+        
+        assert optimizer.has_time_windows()
+        np.testing.assert_allclose(optimizer.calculate_arrival_times(route, vehicle), expected)
+        assert optimizer.calculate_time_window_lateness(route, vehicle) == pytest.approx(lateness)
+        assert lateness > 0
+    
+    def test_time_window_batch_and_move(self, time_window_data):
+        """Lote e avaliação incremental incluem a penalidade de atraso"""
+        delivery_points, vehicles = time_window_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        rng = np.random.default_rng(1)
+        n = len(delivery_points)
+        routes = np.array([
+            [0] + list(rng.permutation(np.arange(1, n))) + [0]
+            for _ in range(10)
+        ])
+        fitness, _, penalty = optimizer.fitness_function_batch(routes, vehicle_id=1)
+        for i, route in enumerate(routes):
+            expected = optimizer.fitness_function(list(route), vehicle_id=1)
+            assert fitness[i] == pytest.approx(expected[0])
+            assert penalty[i] == pytest.approx(expected[2])
+        
+        route = [int(g) for g in routes[0]]
+        _, distance, penalty = optimizer.fitness_function(route, vehicle_id=1)
+        fitness, _, _ = optimizer.evaluate_move(route, 'inversion', 2, 6, distance, penalty, vehicle_id=1)
+        route[2:6] = reversed(route[2:6])
+        assert fitness == pytest.approx(optimizer.fitness_function(route, vehicle_id=1)[0])
+    
     def test_check_capacity_constraint(self, sample_data):
         """Testa verificação de restrição de capacidade"""
         delivery_points, vehicles = sample_data
@@ -156,6 +996,396 @@ class TestRouteOptimizer:
             assert sub_route[0] == 0
             assert sub_route[-1] == 0
 
+    
+    def test_split_giant_tour_is_optimal(self, sample_data):
+        """O split coincide com a melhor divisão por força bruta e respeita a ordem da rota"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        tour = list(range(1, 9))
+        
+        trips, fitness, distance = optimizer.split_giant_tour([0] + tour + [0])
+        
+        best = np.inf
+        for cuts in itertools.combinations_with_replacement(range(len(tour) + 1), len(vehicles) - 1):
+            bounds = (0,) + cuts + (len(tour),)
+            cost = sum(
+                optimizer.fitness_function([0] + tour[bounds[k]:bounds[k + 1]] + [0], k)[0]
+                for k in range(len(vehicles)) if bounds[k + 1] > bounds[k]
+            )
+            best = min(best, cost)
+        
+        assert fitness == pytest.approx(best)
+        assert [p for _, route in trips for p in route[1:-1]] == tour
+        assert fitness == pytest.approx(sum(optimizer.fitness_function(r, v)[0] for v, r in trips))
+        assert distance == pytest.approx(sum(optimizer.calculate_route_distance(r) for _, r in trips))
+    
+    def test_split_fitness_batch(self, sample_data):
+        """O fitness CVRP em lote coincide com o individual"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        routes = np.array([
+            [0] + list(np.random.permutation(range(1, len(delivery_points)))) + [0]
+            for _ in range(4)
+        ])
+        
+        fitness, distance, penalty = optimizer.fitness_function_split_batch(routes)
+        
+        for k, route in enumerate(routes):
+            expected = optimizer.fitness_function_split(list(route))
+            assert (fitness[k], distance[k], penalty[k]) == pytest.approx(expected)
+        assert (fitness <= optimizer.fitness_function_batch(routes)[0] + 1e-6).all()
+
+    def test_split_with_trip_limit(self, sample_data):
+        """Com limite de pontos por viagem o split é ótimo entre as divisões permitidas"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        optimizer.split_max_trip_stops = 3
+        tour = list(range(1, 9))
+        window = max(3, -(-len(tour) // len(vehicles)))
+        
+        trips, fitness, _ = optimizer.split_giant_tour([0] + tour + [0])
+        
+        best = np.inf
+        for cuts in itertools.combinations_with_replacement(range(len(tour) + 1), len(vehicles) - 1):
+            bounds = (0,) + cuts + (len(tour),)
+            if max(np.diff(bounds)) > window:
+                continue
+            best = min(best, sum(
+                optimizer.fitness_function([0] + tour[bounds[k]:bounds[k + 1]] + [0], k)[0]
+                for k in range(len(vehicles)) if bounds[k + 1] > bounds[k]
+            ))
+        
+        assert fitness == pytest.approx(best)
+        assert all(len(route) - 2 <= window for _, route in trips)
+    
+    def test_split_fitness_batch_time_windows(self, time_window_data):
+        """Com janelas de tempo o fitness CVRP em lote soma o atraso de cada viagem"""
+        delivery_points, vehicles = time_window_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        rng = np.random.default_rng(3)
+        routes = np.array([
+            [0] + list(rng.permutation(range(1, len(delivery_points)))) + [0]
+            for _ in range(4)
+        ])
+        
+        fitness, distance, penalty = optimizer.fitness_function_split_batch(routes)
+        
+        for k, route in enumerate(routes):
+            expected = optimizer.fitness_function_split(list(route))
+            assert (fitness[k], distance[k], penalty[k]) == pytest.approx(expected)
+    
+    def test_point_arrays_in_sync(self, sample_data):
+        """Arrays dos pontos compactos e sincronizados com inclusões e remoções"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        assert optimizer.point_demand.dtype == np.float32
+        assert optimizer.priority_weight.dtype == np.int8
+        
+        new_id = optimizer.add_delivery_point(
+            DeliveryPoint(0, "Entrega urgente", -23.56, -46.64, 7.5, Priority.CRITICAL, service_time=30)
+        )
+        assert optimizer.point_demand[new_id] == 7.5
+        assert optimizer.priority_weight[new_id] == 4
+        assert optimizer.service_time_hours[new_id] == 0.5
+        
+        optimizer.remove_delivery_points([1, 2])
+        assert len(optimizer.point_arrays) == len(optimizer.delivery_points)
+        assert optimizer.point_arrays.ids.tolist() == list(range(len(optimizer.delivery_points)))
+        np.testing.assert_allclose(
+            optimizer.point_demand, [p.demand for p in optimizer.delivery_points], rtol=1e-6
+        )
+        assert optimizer.priority_weight.tolist() == [
+            5 - p.priority.value for p in optimizer.delivery_points
+        ]
+        
+        # Alterações diretas nos objetos chegam aos arrays
+        optimizer.delivery_points[3].time_window = (8, 9)
+        assert optimizer.has_time_windows()
+        route = list(range(len(optimizer.delivery_points))) + [0]
+        fitness, _, _ = optimizer.fitness_function_batch(np.array([route]))
+        assert optimizer.fitness_function(route)[0] == pytest.approx(fitness[0])
+    
+    @pytest.mark.parametrize('clone', [copy.deepcopy, lambda o: pickle.loads(pickle.dumps(o))])
+    def test_copied_optimizer_tracks_its_own_data(self, sample_data, clone):
+        """Cópias do otimizador acompanham as próprias alterações, não as do original"""
+        delivery_points, vehicles = sample_data
+        optimizer = RouteOptimizer(delivery_points, vehicles)
+        copied = clone(optimizer)
+        version = optimizer.data_version
+        
+        copied.weights['distance'] = 3.0
+        copied.delivery_points[1].demand = 999.0
+        assert copied.data_version > version
+        assert copied.point_demand[1] == 999.0
+        assert optimizer.data_version == version
+        assert optimizer.weights['distance'] == 1.0
+        assert optimizer.point_demand[1] != 999.0
+    
+    @pytest.mark.parametrize('from_arrays', [False, True])
+    def test_point_attributes_write_through(self, sample_data, from_arrays):
+        """Os arrays são a fonte dos dados: escrever num ponto muda o fitness"""
+        delivery_points, vehicles = sample_data
+        if from_arrays:
+            points = DeliveryPointArrays.from_delivery_points(delivery_points)
+            optimizer = RouteOptimizer.from_arrays(points, vehicles)
+        else:
+            optimizer = RouteOptimizer(delivery_points, vehicles)
+        route = list(range(len(delivery_points))) + [0]
+        demand = optimizer.calculate_route_demand(route)
+        fitness = optimizer.fitness_function(route)[0]
+        version = optimizer.data_version
+        
+        optimizer.delivery_points[1].demand += 1000
+        assert optimizer.calculate_route_demand(route) == pytest.approx(demand + 1000)
+        assert optimizer.fitness_function(route)[0] > fitness
+        assert optimizer.data_version > version
+        
+        optimizer.delivery_points[2].priority = Priority.LOW
+        optimizer.delivery_points[2].service_time = 90
+        assert optimizer.priority_weight[2] == 1
+        assert optimizer.service_time_hours[2] == 1.5
+        optimizer.delivery_points[0].time_window = (7, 20)
+        assert optimizer.departure_time == 7
+        batch, _, _ = optimizer.fitness_function_batch(np.array([route]))
+        assert optimizer.fitness_function(route)[0] == pytest.approx(batch[0])
+        
+        with pytest.raises(AttributeError):
+            optimizer.delivery_points[1].lat = 0.0
+        
+        # O chamador não é afetado e pontos removidos deixam de escrever
+        assert delivery_points[1].demand < 1000
+        if from_arrays:
+            assert points.demand[1] < 1000
+        stale = optimizer.delivery_points[3]
+        optimizer.remove_delivery_points([1])
+        stale.demand = 500.0
+        assert optimizer.point_demand.max() < 500
+
+
+class TestBulkLoading:
+    """Testes para a carga colunar dos CSVs"""
+    
+    DATA = Path(__file__).parent.parent / 'data'
+    
+    def test_aggregate_medication_lines(self):
+        """Demanda somada e prioridade mais alta por ponto"""
+        demand, highest, has_lines = aggregate_medication_lines(
+            4, np.array([1, 1, 3, 1]), np.array([2.0, 3.0, 4.0, 0.5]), np.array([3, 2, 4, 4])
+        )
+        np.testing.assert_allclose(demand, [0.0, 5.5, 0.0, 4.0])
+        assert highest[[1, 3]].tolist() == [2, 4]
+        assert has_lines.tolist() == [False, True, False, True]
+    
+    def test_random_medication_lines(self):
+        """Itens distintos por ponto, na faixa pedida e espalhados pelo catálogo"""
+        skip = np.zeros(2000, dtype=bool)
+        skip[0] = True
+        point_index, catalog_index = random_medication_lines(
+            2000, 10, np.random.default_rng(0), skip=skip
+        )
+        counts = np.bincount(point_index, minlength=2000)
+        assert counts[0] == 0
+        assert counts[1:].min() >= 2 and counts.max() <= 5
+        pairs = point_index * 10 + catalog_index
+        assert len(np.unique(pairs)) == len(pairs)
+        # Sem viés para os índices baixos ao truncar cada ponto
+        frequency = np.bincount(catalog_index, minlength=10) / len(catalog_index)
+        np.testing.assert_allclose(frequency, 0.1, atol=0.02)
+        
+        _, small = random_medication_lines(50, 3, np.random.default_rng(1))
+        assert small.max() < 3
+    
+    def test_load_data_matches_medications(self):
+        """Demanda e prioridade agregadas coincidem com as dos medicamentos"""
+        locations = str(self.DATA / 'locais_entrega.csv')
+        medications = str(self.DATA / 'medicamentos.csv')
+        delivery_points, _ = load_data_from_csv(locations, medications, seed=5)
+        points = load_arrays_from_csv(locations, medications, seed=5)
+        
+        assert not delivery_points[0].medications
+        for point in delivery_points[1:]:
+            assert 2 <= len(point.medications) <= 5
+            assert len({med.id for med in point.medications}) == len(point.medications)
+            assert point.demand == pytest.approx(point.calculate_demand())
+            assert point.priority == point.get_highest_priority()
+        
+        np.testing.assert_allclose(points.demand, [p.demand for p in delivery_points])
+        assert points.priority.tolist() == [p.priority.value for p in delivery_points]
+    
+    def test_medication_lines_file(self, tmp_path):
+        """Linhas explícitas de medicamentos substituem o sorteio"""
+        lines = tmp_path / 'linhas.csv'
+        lines.write_text("point_id,medication_id,quantity\n1,1,2.0\n1,3,4.0\n2,3,1.5\n")
+        points = load_arrays_from_csv(
+            str(self.DATA / 'locais_entrega.csv'), str(self.DATA / 'medicamentos.csv'),
+            medication_lines_file=str(lines)
+        )
+        
+        assert points.demand[1:3].tolist() == [6.0, 1.5]
+        assert points.priority[1] == Priority.CRITICAL.value
+        assert points.priority[2] == Priority.MEDIUM.value
+        assert points.demand[3] == 12.0
+    
+    def test_optimizer_from_arrays(self):
+        """O otimizador criado dos arrays equivale ao criado dos objetos"""
+        delivery_points, vehicles = create_sample_data()
+        points = DeliveryPointArrays.from_delivery_points(delivery_points)
+        optimizer = RouteOptimizer.from_arrays(points, vehicles, depot_id=0)
+        reference = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        np.testing.assert_allclose(optimizer.distance_matrix, reference.distance_matrix)
+        route = list(range(len(delivery_points))) + [0]
+        assert optimizer.fitness_function(route) == pytest.approx(reference.fitness_function(route))
+        
+        # Os DeliveryPoint só são criados quando delivery_points é acessado
+        routes = np.array([route, route[::-1]])
+        optimizer.fitness_function_batch(routes)
+        mapping = optimizer.remove_delivery_points([3])
+        assert optimizer._delivery_points is None
+        assert optimizer.num_points == len(delivery_points) - 1
+        
+        names = [p.name for p in delivery_points]
+        assert [p.name for p in optimizer.delivery_points] == names[:3] + names[4:]
+        assert [p.id for p in optimizer.delivery_points] == list(range(optimizer.num_points))
+        assert mapping[4] == 3
+
+
+class TestDecomposition:
+    """Testes para a decomposição espacial"""
+    
+    def test_sweep_clusters_respect_capacity(self):
+        """Grupos da varredura cobrem todos os pontos dentro da capacidade"""
+        rng = np.random.default_rng(0)
+        lats = -23.55 + rng.normal(0, 0.05, 200)
+        lons = -46.63 + rng.normal(0, 0.05, 200)
+        demand = rng.uniform(1, 10, 200)
+        demand[0] = 0
+        
+        clusters = sweep_clusters(lats, lons, 0, demand, capacity=60, max_cluster_size=8)
+        
+        assert sorted(np.concatenate(clusters).tolist()) == list(range(1, 200))
+        assert all(len(cluster) <= 8 for cluster in clusters)
+        assert all(demand[cluster].sum() <= 60 for cluster in clusters)
+    
+    def test_kmeans_repairs_empty_clusters(self):
+        """Grupos vazios são preenchidos sem esvaziar outro grupo"""
+        # Pontos repetidos empatam no mesmo centroide e deixam grupos vazios
+        lats = np.array([-23.55] + [-23.50] * 6 + [-23.60, -23.61])
+        lons = np.array([-46.63] + [-46.60] * 6 + [-46.70, -46.71])
+        
+        for seed in range(20):
+            # Um grupo vazio durante as iterações geraria centroide NaN
+            with np.errstate(invalid='raise', divide='raise'):
+                clusters = kmeans_clusters(lats, lons, 0, n_clusters=5, random_seed=seed)
+            
+            assert len(clusters) == 5
+            assert all(len(cluster) > 0 for cluster in clusters)
+            assert sorted(np.concatenate(clusters).tolist()) == list(range(1, 9))
+    
+    def test_decomposition_accepts_seed_sequence_and_generator(self):
+        """A semente é normalizada como no GeneticAlgorithm"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        def run(seed):
+            return SpatialDecomposition(
+                optimizer, method='kmeans', max_cluster_size=5, n_workers=1,
+                random_seed=seed, population_size=10, generations=5
+            ).run()
+        
+        assert run(np.random.SeedSequence(42)) == run(42)
+        assert run(np.random.default_rng(3)) == run(np.random.default_rng(3))
+    
+    @pytest.mark.parametrize('method', ['sweep', 'kmeans'])
+    def test_decomposition_covers_all_points(self, method):
+        """Cada ponto é atendido uma vez e o reparo não piora o fitness"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        decomposition = SpatialDecomposition(
+            optimizer, method=method, max_cluster_size=5, n_workers=1,
+            random_seed=42, population_size=20, generations=20
+        )
+        
+        routes = decomposition.run()
+        stats = decomposition.get_statistics()
+        
+        stops = sorted(p for route in routes for p in route[1:-1])
+        assert stops == list(range(1, len(delivery_points)))
+        assert all(route[0] == route[-1] == 0 for route in routes)
+        assert stats['n_clusters'] == len(routes) > 1
+        assert stats['fitness'] <= stats['fitness_before_repair'] + 1e-9
+
+
+class TestNSGA2:
+    """Testes para o modo multiobjetivo"""
+    
+    def test_non_dominated_sort_matches_brute_force(self):
+        """Ranks e restrições coincidem com a definição por força bruta"""
+        rng = np.random.default_rng(0)
+        objectives = rng.integers(0, 6, (60, 2)).astype(float)
+        violation = np.where(rng.random(60) < 0.3, rng.integers(1, 3, 60), 0).astype(float)
+        
+        ranks = non_dominated_sort(objectives, violation)
+        
+        def dominates(i, j):
+            if violation[i] != violation[j]:
+                return violation[i] < violation[j]
+            return (objectives[i] <= objectives[j]).all() and (objectives[i] < objectives[j]).any()
+        
+        for j in range(60):
+            dominators = [i for i in range(60) if dominates(i, j)]
+            expected = 0 if not dominators else max(ranks[i] for i in dominators) + 1
+            assert ranks[j] == expected
+        
+        crowding = crowding_distance(objectives, ranks)
+        front = np.flatnonzero(ranks == 0)
+        assert np.isinf(crowding[front[np.argmin(objectives[front, 0])]])
+    
+    def test_nsga2_returns_pareto_front(self):
+        """A frente contém rotas válidas, distintas e mutuamente não dominadas"""
+        delivery_points, _ = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, [Vehicle(0, 'Grande', 10000, 10000)])
+        n = len(delivery_points)
+        
+        nsga = NSGA2(population_size=40, generations=40, random_seed=42)
+        front = nsga.evolve(n, optimizer.objectives_batch, verbose=False)
+        
+        objectives = np.array([solution.objectives for solution in front])
+        assert objectives.shape[1] == len(optimizer.objective_names()) == 2
+        assert not dominance_matrix(objectives).any()
+        assert len({tuple(solution.genes) for solution in front}) == len(front)
+        for solution in front:
+            assert sorted(solution.genes[1:-1]) == list(range(1, n))
+            assert solution.violation == 0
+        
+        shortest = pick_solution(front, [1, 0])
+        assert shortest.objectives[0] == objectives[:, 0].min()
+        assert pick_solution(front, [0, 1]).objectives[1] == objectives[:, 1].min()
+        assert nsga.get_statistics()['front_size'] == len(front)
+    
+    def test_nsga2_tournament_without_replacement(self):
+        """Torneio do tamanho da população: sem repetição o melhor sempre vence"""
+        nsga = NSGA2(population_size=8, tournament_size=8, crossover_rate=0.0,
+                     mutation_rate=0.0, random_seed=1)
+        genes = nsga._initial_population(10, 0)
+        selection_key = np.random.default_rng(2).permutation(8)
+        
+        children = nsga._offspring(genes, selection_key)
+        
+        assert (children == genes[np.argmin(selection_key)]).all()
+    
+    def test_nsga2_accepts_seed_sequence_and_generator(self):
+        """NSGA2 normaliza a semente como o GeneticAlgorithm"""
+        seed = GeneticAlgorithm(random_seed=5).spawn_seeds(1)[0]
+        
+        nsga = NSGA2(random_seed=seed)
+        assert nsga.seed_sequence is seed
+        np.testing.assert_array_equal(
+            nsga.rng.random(5), GeneticAlgorithm(random_seed=seed).rng.random(5)
+        )
+        
+        streams = [NSGA2(random_seed=np.random.default_rng(3)).rng.random(5) for _ in range(2)]
+        np.testing.assert_array_equal(streams[0], streams[1])
+
 
 class TestIntegration:
     """Testes de integração"""
@@ -192,6 +1422,244 @@ class TestIntegration:
         
         # Verificar que melhorou ao longo das gerações
         assert ga.best_fitness_history[0] > ga.best_fitness_history[-1]
+    
+    def test_full_optimization_batch(self):
+        """Testa otimização completa com avaliação vetorizada"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        ga = GeneticAlgorithm(population_size=20, generations=10, random_seed=42)
+        
+        best_solution = ga.evolve(
+            num_points=len(delivery_points),
+            fitness_function=lambda route: optimizer.fitness_function(route),
+            depot=0,
+            verbose=False,
+            batch_fitness_function=optimizer.fitness_function_batch
+        )
+        
+        expected_fitness, _, _ = optimizer.fitness_function(best_solution.genes)
+        assert best_solution.fitness == pytest.approx(expected_fitness)
+        assert ga.best_fitness_history[0] >= ga.best_fitness_history[-1]
+    
+    def test_full_optimization_delta(self):
+        """Testa que a avaliação incremental mantém fitness consistentes"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        delta_evaluator = lambda *move: optimizer.evaluate_move(*move, vehicle_id=0)
+        
+        for vectorized in (False, True):
+            ga = GeneticAlgorithm(population_size=20, generations=15,
+                                  crossover_rate=0.3, mutation_rate=0.9, random_seed=7)
+            if vectorized:
+                best_solution = ga.evolve_vectorized(
+                    len(delivery_points), optimizer.fitness_function_batch,
+                    verbose=False, delta_evaluator=delta_evaluator
+                )
+            else:
+                best_solution = ga.evolve(
+                    len(delivery_points), optimizer.fitness_function,
+                    verbose=False, delta_evaluator=delta_evaluator
+                )
+            
+            expected_fitness, _, _ = optimizer.fitness_function(best_solution.genes)
+            assert best_solution.fitness == pytest.approx(expected_fitness)
+    
+    @pytest.mark.parametrize('target', ['elite', 'offspring'])
+    def test_full_optimization_memetic(self, target):
+        """Testa o modo memético nos dois laços de evolução"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        delta_evaluator = lambda *move: optimizer.evaluate_move(*move, vehicle_id=0)
+        local_search = LocalSearch(optimizer.distance_matrix, delta_evaluator, neighbors=6)
+        
+        ga = GeneticAlgorithm(population_size=10, generations=5, random_seed=42,
+                              local_search=local_search, local_search_target=target,
+                              local_search_rate=0.3)
+        best_solution = ga.evolve(len(delivery_points), optimizer.fitness_function, verbose=False)
+        assert best_solution.fitness == pytest.approx(optimizer.fitness_function(best_solution.genes)[0])
+        
+        ga = GeneticAlgorithm(population_size=10, generations=5, random_seed=42,
+                              local_search=local_search, local_search_target=target,
+                              local_search_rate=0.3)
+        best_solution = ga.evolve_vectorized(len(delivery_points), optimizer.fitness_function_batch,
+                                             verbose=False)
+        assert best_solution.fitness == pytest.approx(optimizer.fitness_function(best_solution.genes)[0])
+    
+    def test_parallel_evaluator(self):
+        """Testa a avaliação em processos com memória compartilhada"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        with ParallelFitnessEvaluator(optimizer, vehicle_id=0, n_workers=2) as evaluator:
+            ga = GeneticAlgorithm(population_size=12, generations=3, random_seed=42,
+                                  evaluator=evaluator)
+            population = ga.create_population_matrix(len(delivery_points))
+            
+            fitness, distance, penalty = evaluator(population.genes)
+            expected = optimizer.fitness_function_batch(population.genes)
+            assert np.allclose(fitness, expected[0])
+            assert np.allclose(distance, expected[1])
+            assert np.allclose(penalty, expected[2])
+            
+            best_solution = ga.evolve_vectorized(len(delivery_points), None, verbose=False)
+            assert best_solution.fitness == pytest.approx(
+                optimizer.fitness_function(best_solution.genes)[0]
+            )
+    
+    def test_parallel_evaluator_cleanup_and_stale_data(self):
+        """Memória compartilhada liberada sem close() e dados desatualizados detectados"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        evaluator = ParallelFitnessEvaluator(optimizer, n_workers=1)
+        names = [block.name for block in evaluator._blocks]
+        del evaluator
+        gc.collect()
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+        
+        routes = np.array([list(range(len(delivery_points))) + [0]])
+        changes = [
+            lambda: optimizer.weights.update(priority_penalty=1.0),
+            lambda: setattr(optimizer.vehicles[0], 'capacity', 1.0),
+            lambda: optimizer.add_delivery_point(DeliveryPoint(0, "Nova", -23.56, -46.64, 3.0))
+        ]
+        for change in changes:
+            with ParallelFitnessEvaluator(optimizer, n_workers=1) as evaluator:
+                evaluator(routes)
+                change()
+                with pytest.raises(RuntimeError):
+                    evaluator(routes)
+    
+    def test_parallel_evaluator_rejects_mmap(self, tmp_path):
+        """A matriz em disco não é copiada inteira para a memória compartilhada"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, distance_storage='mmap',
+                                   distance_cache_dir=str(tmp_path))
+        with pytest.raises(ValueError):
+            ParallelFitnessEvaluator(optimizer, n_workers=1)
+    
+    @pytest.mark.parametrize('vectorized', [False, True])
+    def test_checkpoint_resume(self, vectorized, tmp_path):
+        """Retomar de um checkpoint reproduz a execução sem interrupção"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        checkpoint = tmp_path / 'ga.npz'
+        params = dict(population_size=20, mutation_rate=0.3, random_seed=7,
+                      eliminate_duplicates=True)
+        
+        def run(ga):
+            if vectorized:
+                return ga.evolve_vectorized(
+                    len(delivery_points), optimizer.fitness_function_batch, verbose=False
+                )
+            return ga.evolve(len(delivery_points), optimizer.fitness_function, verbose=False)
+        
+        full = GeneticAlgorithm(generations=20, **params)
+        expected = run(full)
+        
+        # Execução "interrompida" após 10 gerações, retomada por outra instância
+        run(GeneticAlgorithm(generations=10, checkpoint_path=str(checkpoint),
+                             checkpoint_interval=10, **params))
+        resumed = GeneticAlgorithm(generations=20, **params)
+        if vectorized:
+            best = resumed.resume(str(checkpoint), batch_fitness_function=optimizer.fitness_function_batch,
+                                  verbose=False)
+        else:
+            best = resumed.resume(str(checkpoint), fitness_function=optimizer.fitness_function,
+                                  verbose=False)
+        
+        assert best.genes == expected.genes
+        assert best.fitness == expected.fitness
+        assert resumed.best_fitness_history == full.best_fitness_history
+        assert resumed.immigrants_injected == full.immigrants_injected > 0
+    
+    def test_warm_start(self):
+        """A população semeada contém a rota anterior ajustada e não piora em relação a ela"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        ga = GeneticAlgorithm(population_size=30, generations=30, random_seed=42)
+        previous = ga.evolve_vectorized(len(delivery_points), optimizer.fitness_function_batch,
+                                        verbose=False)
+        
+        optimizer.add_delivery_point(DeliveryPoint(0, "Urgente", -23.56, -46.64, 2, Priority.CRITICAL))
+        seed = optimizer.repair_route(previous.genes)
+        
+        warm = GeneticAlgorithm(population_size=30, generations=5, random_seed=1)
+        population = warm.create_population_matrix(len(optimizer.delivery_points), 0, [seed])
+        assert population.genes[0].tolist() == seed
+        
+        best = warm.evolve_vectorized(len(optimizer.delivery_points), optimizer.fitness_function_batch,
+                                      verbose=False, initial_routes=[seed])
+        assert best.fitness <= optimizer.fitness_function(seed)[0] + 1e-9
+        with pytest.raises(ValueError):
+            warm.create_population_matrix(len(optimizer.delivery_points), 0, [previous.genes])
+    
+    def test_fitness_cache_statistics(self):
+        """O cache reduz as avaliações e reporta acertos e falhas"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        calls = []
+        def batch(routes):
+            calls.append(len(routes))
+            return optimizer.fitness_function_batch(routes)
+        
+        ga = GeneticAlgorithm(
+            population_size=30, generations=20, mutation_rate=0.1,
+            crossover_rate=0.5, random_seed=42, fitness_cache_size=1000
+        )
+        best = ga.evolve_vectorized(len(delivery_points), batch, verbose=False)
+        stats = ga.get_statistics()
+        
+        assert stats['fitness_cache_hits'] > 0
+        assert stats['fitness_cache_misses'] == sum(calls)
+        assert best.fitness == pytest.approx(optimizer.fitness_function(best.genes)[0])
+    
+    @pytest.mark.parametrize('topology', ['ring', 'random'])
+    def test_island_model(self, topology):
+        """Testa o modelo de ilhas com migração entre processos"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        model = IslandModel(optimizer, n_islands=3, topology=topology,
+                            migration_interval=4, migration_size=2, generations=12,
+                            random_seed=42, population_size=16)
+        best_solution = model.run()
+        stats = model.get_statistics()
+        
+        assert len(stats['islands']) == 3
+        assert all(island['generations'] == 12 for island in stats['islands'])
+        assert sum(island['migrants_received'] for island in stats['islands']) > 0
+        assert best_solution.fitness == min(island['best_fitness'] for island in stats['islands'])
+        assert best_solution.fitness == pytest.approx(
+            optimizer.fitness_function(best_solution.genes)[0]
+        )
+    
+    def test_full_optimization_vectorized(self):
+        """Testa otimização completa com a população em matriz"""
+        delivery_points, vehicles = create_sample_data()
+        optimizer = RouteOptimizer(delivery_points, vehicles, depot_id=0)
+        
+        ga = GeneticAlgorithm(population_size=21, generations=10, random_seed=42)
+        
+        best_solution = ga.evolve_vectorized(
+            num_points=len(delivery_points),
+            batch_fitness_function=optimizer.fitness_function_batch,
+            depot=0,
+            verbose=False
+        )
+        
+        assert best_solution.genes[0] == 0 and best_solution.genes[-1] == 0
+        assert sorted(best_solution.genes[1:-1]) == list(range(1, len(delivery_points)))
+        expected_fitness, _, _ = optimizer.fitness_function(best_solution.genes)
+        assert best_solution.fitness == pytest.approx(expected_fitness)
+        # Elitismo garante que o melhor nunca piora
+        assert all(
+            later <= earlier
+            for earlier, later in zip(ga.best_fitness_history, ga.best_fitness_history[1:])
+        )
 
 
 if __name__ == '__main__':